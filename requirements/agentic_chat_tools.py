@@ -2,10 +2,14 @@
 
 Defines TOOL_DEFINITIONS (JSON schemas for /api/chat) and TOOL_DISPATCH
 (mapping tool names to the actual functions in tools_reference.py).
+use_tool_profile() swaps TOOL_DISPATCH for simulated services (see tool_profiles.py).
+schema_variant() derives smaller encodings of TOOL_DEFINITIONS for schema A/B runs.
 """
 
+import copy
 import json
 import os
+import re
 import sys
 
 # Ensure tools_reference is importable
@@ -21,6 +25,7 @@ from tools_reference import (
     send_notification,
     log_operation,
 )
+from tool_profiles import PROFILES, ToolSimulator, TransientToolError
 
 
 # OpenAI-compatible tool definitions for Ollama /api/chat
@@ -222,6 +227,61 @@ TOOL_DEFINITIONS = [
     },
 ]
 
+# Smaller encodings of TOOL_DEFINITIONS, all derived from it so they never drift:
+#   full         the definitions as written
+#   no-examples  "(e.g. ...)" examples removed from descriptions
+#   minified     examples and "(default: ...)" notes removed, descriptions cut to their first sentence
+#   compact      minified tool descriptions, no parameter descriptions (types, enums and required kept)
+SCHEMA_VARIANTS = ("full", "no-examples", "minified", "compact")
+
+_EXAMPLE_NOTE = re.compile(r"\s*\(e\.g\.[^)]*\)")
+_DEFAULT_NOTE = re.compile(r"\s*\(default:[^)]*\)")
+
+
+def _minify(text: str) -> str:
+    text = _DEFAULT_NOTE.sub("", _EXAMPLE_NOTE.sub("", text)).strip()
+    match = re.match(r"(.+?)\.(\s|$)", text)
+    return match.group(1) if match else text.rstrip(".")
+
+
+def _strip_descriptions(schema, transform, drop: bool = False):
+    """Copy of a JSON schema with every "description" transformed (or dropped)."""
+    if isinstance(schema, list):
+        return [_strip_descriptions(item, transform, drop) for item in schema]
+    if not isinstance(schema, dict):
+        return schema
+    out = {}
+    for key, value in schema.items():
+        if key == "description" and isinstance(value, str):
+            if not drop:
+                out[key] = transform(value)
+        elif key == "properties" and isinstance(value, dict):
+            out[key] = {name: _strip_descriptions(prop, transform, drop) for name, prop in value.items()}
+        else:
+            out[key] = _strip_descriptions(value, transform, drop)
+    return out
+
+
+def schema_variant(name: str = "full") -> list[dict]:
+    """TOOL_DEFINITIONS encoded as one of SCHEMA_VARIANTS."""
+    if name not in SCHEMA_VARIANTS:
+        raise ValueError(f"Unknown schema variant: {name} (choose from {', '.join(SCHEMA_VARIANTS)})")
+    if name == "full":
+        return copy.deepcopy(TOOL_DEFINITIONS)
+    variant = []
+    for tool in TOOL_DEFINITIONS:
+        fn = tool["function"]
+        if name == "no-examples":
+            description = _EXAMPLE_NOTE.sub("", fn["description"])
+            parameters = _strip_descriptions(fn["parameters"], lambda d: _EXAMPLE_NOTE.sub("", d))
+        else:
+            description = _minify(fn["description"])
+            parameters = _strip_descriptions(fn["parameters"], _minify, drop=(name == "compact"))
+        variant.append({"type": tool["type"],
+                        "function": {"name": fn["name"], "description": description, "parameters": parameters}})
+    return variant
+
+
 # Map tool names to actual functions
 TOOL_DISPATCH = {
     "get_stock_prices": get_stock_prices,
@@ -233,6 +293,22 @@ TOOL_DISPATCH = {
     "send_notification": send_notification,
     "log_operation": log_operation,
 }
+_REFERENCE_DISPATCH = dict(TOOL_DISPATCH)
+
+
+def use_tool_profile(profile: str = "none", seed: int = 0) -> ToolSimulator:
+    """Route TOOL_DISPATCH through a latency/failure profile from tool_profiles.PROFILES.
+
+    Always wraps the reference functions (never a previous profile), so each call
+    starts with fresh rate-limit buckets and counters. Returns the simulator, whose
+    stats() describe what was injected.
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown tool profile: {profile} (choose from {', '.join(PROFILES)})")
+    simulator = ToolSimulator(PROFILES[profile], seed=seed)
+    for name, fn in _REFERENCE_DISPATCH.items():
+        TOOL_DISPATCH[name] = fn if profile == "none" else simulator.wrap(name, fn)
+    return simulator
 
 
 def dispatch_tool_call(name: str, arguments: dict | str) -> dict | str:
@@ -269,6 +345,8 @@ def dispatch_tool_call(name: str, arguments: dict | str) -> dict | str:
         if result is None:
             return {"status": "ok"}
         return result
+    except TransientToolError as e:
+        return {"error": str(e), "retryable": True}
     except (ValueError, TypeError, KeyError) as e:
         return {"error": str(e)}
 
@@ -0,0 +1,200 @@
+"""Seeded portfolio workloads for the agentic-chat task.
+
+The stock scenario is three portfolios of 3-4 holdings over eight symbols (the data in
+tools_reference.py). generate_scenario() builds larger ones, N portfolios x M holdings
+over a pool of symbols. It creates the tool data, the user message and the evaluator
+expectations together:
+  - tool data: portfolios, prices and volatilities, installed into the tools_reference
+    dicts by use_scenario() so TOOL_DISPATCH serves them unchanged
+  - user message: the agentic-chat prompt with the portfolio list swapped out
+  - expectations: required portfolios and, per portfolio, the total value, volatility
+    score and risk outcome, computed with the reference tools themselves
+
+Portfolios draw their holdings from a window of the volatility-ranked symbol pool, so
+some are calm and some are risky. Values spread across the min/max bounds, so every risk
+level shows up. The same (portfolios, holdings, symbols, seed) always gives the same scenario.
+"""
+
+import copy
+import json
+import math
+import random
+import re
+import string
+from dataclasses import dataclass
+
+import tools_reference
+
+# The risk configuration stated in requirements/agentic-chat.md
+DEFAULT_RISK_CONFIG = {"max_volatility": 35.0, "min_value": 50000.0, "max_value": 2000000.0}
+
+_REFERENCE_DATA = (
+    copy.deepcopy(tools_reference.PORTFOLIO_DATA),
+    dict(tools_reference.STOCK_PRICES),
+    dict(tools_reference.STOCK_VOLATILITIES),
+)
+
+_FIRST_NAMES = ("Sarah", "Mike", "Jennifer", "David", "Priya", "Carlos", "Emma", "Kenji", "Olivia", "Ahmed")
+_LAST_NAMES = ("Chen", "Wilson", "Park", "Garcia", "Patel", "Novak", "Okafor", "Larsen", "Rossi", "Kim")
+_CLIENT_KINDS = ("Pension Fund", "Family Trust", "Endowment", "Growth Fund LLC", "Retirement Plan", "Foundation")
+_CLIENT_NAMES = ("Acme", "Harbor", "Summit", "Northwind", "Cedar", "Bluewater", "Granite", "Meridian", "Oakridge",
+                 "Pinecrest", "Silverline", "Westfield")
+
+
+@dataclass
+class Scenario:
+    name: str
+    seed: int | None
+    portfolio_data: dict[str, dict]
+    stock_prices: dict[str, float]
+    stock_volatilities: dict[str, float]
+    risk_config: dict[str, float]
+    expected: dict[str, dict]   # portfolio_id -> total_value, volatility_score, risk_level, is_high_risk
+
+    @property
+    def required_portfolios(self) -> list[str]:
+        return list(self.portfolio_data)
+
+    @property
+    def holdings_per_portfolio(self) -> int:
+        return max((len(p["holdings"]) for p in self.portfolio_data.values()), default=0)
+
+    def user_message(self, base_user_msg: str) -> str:
+        """The agentic-chat user message with this scenario's portfolios and risk config."""
+        msg = re.sub(r"(Analyze the following portfolios: )[^\n]*",
+                     lambda m: m.group(1) + ", ".join(self.required_portfolios) + ".", base_user_msg, count=1)
+        for key, value in self.risk_config.items():
+            msg = re.sub(rf"({key}\s*=\s*)[\d.]+", lambda m: m.group(1) + f"{value:.10g}", msg, count=1)
+        return msg
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "seed": self.seed,
+            "portfolios": len(self.portfolio_data),
+            "holdings_per_portfolio": self.holdings_per_portfolio,
+            "symbols": len(self.stock_prices),
+            "required_portfolios": self.required_portfolios,
+            "risk_config": self.risk_config,
+            "expected": self.expected,
+            "portfolio_data": self.portfolio_data,
+            "stock_prices": self.stock_prices,
+            "stock_volatilities": self.stock_volatilities,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Scenario":
+        return cls(data["name"], data.get("seed"), data["portfolio_data"], data["stock_prices"],
+                   data["stock_volatilities"], data["risk_config"], data["expected"])
+
+
+def use_scenario(scenario: Scenario | None):
+    """Serve scenario's data from the reference tools (None restores the stock data).
+
+    The tools_reference dicts are updated in place, since the tool functions read
+    them as module globals.
+    """
+    if scenario is None:
+        portfolios, prices, vols = copy.deepcopy(_REFERENCE_DATA)
+    else:
+        portfolios, prices, vols = scenario.portfolio_data, scenario.stock_prices, scenario.stock_volatilities
+    for target, source in ((tools_reference.PORTFOLIO_DATA, portfolios),
+                           (tools_reference.STOCK_PRICES, prices),
+                           (tools_reference.STOCK_VOLATILITIES, vols)):
+        target.clear()
+        target.update(copy.deepcopy(source))
+
+
+def expected_outcomes(portfolio_data: dict, prices: dict, vols: dict, risk_config: dict) -> dict[str, dict]:
+    """What a correct agent gets per portfolio, computed with the reference tool functions."""
+    saved = (dict(tools_reference.STOCK_PRICES), dict(tools_reference.STOCK_VOLATILITIES))
+    tools_reference.STOCK_PRICES.clear()
+    tools_reference.STOCK_PRICES.update(prices)
+    tools_reference.STOCK_VOLATILITIES.clear()
+    tools_reference.STOCK_VOLATILITIES.update(vols)
+    try:
+        expected = {}
+        for pid, portfolio in portfolio_data.items():
+            symbols = [h["symbol"] for h in portfolio["holdings"]]
+            value = tools_reference.calculate_portfolio_value(portfolio["holdings"],
+                                                              tools_reference.get_stock_prices(symbols))
+            volatility = tools_reference.calculate_volatility_score(symbols, 30)
+            risk = tools_reference.check_risk_threshold(value["total_value"], volatility, risk_config)
+            expected[pid] = {
+                "total_value": round(value["total_value"], 2),
+                "volatility_score": volatility,
+                "risk_level": risk["risk_level"],
+                "is_high_risk": risk["is_high_risk"],
+            }
+        return expected
+    finally:
+        for target, source in zip((tools_reference.STOCK_PRICES, tools_reference.STOCK_VOLATILITIES), saved):
+            target.clear()
+            target.update(source)
+
+
+def reference_scenario() -> Scenario:
+    """The stock three-portfolio scenario, with its expectations."""
+    portfolios, prices, vols = copy.deepcopy(_REFERENCE_DATA)
+    return Scenario("reference", None, portfolios, prices, vols, dict(DEFAULT_RISK_CONFIG),
+                    expected_outcomes(portfolios, prices, vols, DEFAULT_RISK_CONFIG))
+
+
+def _tickers(count: int, rng: random.Random) -> list[str]:
+    tickers = set()
+    while len(tickers) < count:
+        tickers.add("".join(rng.choices(string.ascii_uppercase, k=rng.choice((3, 4)))))
+    return sorted(tickers)
+
+
+def generate_scenario(portfolios: int, holdings: int, symbols: int | None = None, seed: int = 42) -> Scenario:
+    """N portfolios x M holdings over a pool of symbols (default: enough for some overlap)."""
+    if portfolios < 1 or holdings < 1:
+        raise ValueError("portfolios and holdings must be at least 1")
+    symbols = symbols or max(holdings * 2, min(portfolios * holdings // 2, 1000))
+    if symbols < holdings:
+        raise ValueError(f"need at least {holdings} symbols for {holdings} holdings per portfolio")
+    rng = random.Random(seed)
+
+    pool = _tickers(symbols, rng)
+    prices = {s: round(rng.lognormvariate(math.log(120), 0.9), 2) for s in pool}
+    vols = {s: round(rng.uniform(8.0, 65.0), 1) for s in pool}
+    by_volatility = sorted(pool, key=vols.get)
+
+    portfolio_data = {}
+    width = max(3, len(str(portfolios)))
+    for i in range(1, portfolios + 1):
+        pid = f"PORT-{i:0{width}d}"
+        # A window of the volatility ranking gives each portfolio its own risk profile
+        window = min(len(pool), max(holdings * 3, len(pool) // 4))
+        start = rng.randrange(len(pool) - window + 1)
+        picked = rng.sample(by_volatility[start:start + window], holdings)
+        # Target value is spread around the [min_value, max_value] band, including outside it
+        target = rng.lognormvariate(math.log(400000), 1.2)
+        weights = [rng.random() + 0.2 for _ in picked]
+        rows = []
+        for symbol, weight in zip(picked, weights):
+            shares = max(1, round(target * weight / sum(weights) / prices[symbol]))
+            rows.append({"symbol": symbol, "shares": shares,
+                         "purchase_price": round(prices[symbol] * rng.uniform(0.6, 1.3), 2)})
+        first, last = rng.choice(_FIRST_NAMES), rng.choice(_LAST_NAMES)
+        portfolio_data[pid] = {
+            "portfolio_id": pid,
+            "client_name": f"{rng.choice(_CLIENT_NAMES)} {rng.choice(_CLIENT_KINDS)}",
+            "manager_email": f"{first.lower()}.{last.lower()}@firm.com",
+            "holdings": rows,
+        }
+
+    risk_config = dict(DEFAULT_RISK_CONFIG)
+    return Scenario(f"{portfolios}x{holdings}", seed, portfolio_data, prices, vols, risk_config,
+                    expected_outcomes(portfolio_data, prices, vols, risk_config))
+
+
+def save_scenario(path: str, scenario: Scenario):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(scenario.to_dict(), f, indent=2)
+
+
+def load_scenario(path: str) -> Scenario:
+    with open(path, "r", encoding="utf-8") as f:
+        return Scenario.from_dict(json.load(f))
@@ -0,0 +1,193 @@
+"""Latency and failure profiles for the agentic-chat tools.
+
+The reference tools in tools_reference.py answer from in-memory dicts in microseconds,
+so tool time in a chat run is ~0 and end-to-end latency is model time alone. A profile
+puts a simulated service in front of each TOOL_DISPATCH function:
+  - latency: fixed or lognormal (median + sigma), plus rare tail spikes
+  - rate limit: a token bucket per tool (sustained calls/s + burst); a call over the
+    limit fails at once with a 429-style error
+  - transient errors: a share of calls fail with a 503/timeout-style error after the latency
+
+Injected failures raise TransientToolError. dispatch_tool_call turns them into an
+{"error": ..., "retryable": true} tool result, so the model sees them like any other
+tool error and has to retry or carry on.
+
+Random draws are seeded per tool (profile seed + tool name), so a serial run with the
+same tool calls gets the same delays and failures.
+"""
+
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+
+
+class TransientToolError(RuntimeError):
+    """A simulated failure (rate limit, timeout, 5xx) that a retry may get past."""
+
+
+@dataclass(frozen=True)
+class Latency:
+    kind: str = "fixed"       # "fixed" or "lognormal"
+    ms: float = 0.0           # fixed delay, or the median for lognormal
+    sigma: float = 0.0        # lognormal shape (0.5 ~ p99 at 3x the median)
+    spike_prob: float = 0.0   # chance of a tail spike on top of the draw
+    spike_ms: float = 0.0     # extra delay of a spike
+
+    def sample(self, rng: random.Random) -> float:
+        """One delay in seconds."""
+        if self.kind == "lognormal" and self.ms > 0:
+            ms = rng.lognormvariate(math.log(self.ms), self.sigma)
+        else:
+            ms = self.ms
+        if self.spike_prob and rng.random() < self.spike_prob:
+            ms += self.spike_ms
+        return ms / 1000
+
+
+@dataclass(frozen=True)
+class ToolBehavior:
+    latency: Latency = Latency()
+    error_rate: float = 0.0           # share of calls failing transiently
+    rate_limit: float | None = None   # sustained calls per second (None = unlimited)
+    burst: int = 1                    # calls allowed back to back before the limit applies
+
+
+@dataclass(frozen=True)
+class ToolProfile:
+    name: str
+    description: str
+    default: ToolBehavior = ToolBehavior()
+    overrides: dict[str, ToolBehavior] = field(default_factory=dict)
+
+    def behavior(self, tool_name: str) -> ToolBehavior:
+        return self.overrides.get(tool_name, self.default)
+
+
+_CALCULATIONS = ("calculate_portfolio_value", "calculate_volatility_score", "check_risk_threshold", "generate_report")
+
+PROFILES = {
+    "none": ToolProfile("none", "Reference tools as they are (no added latency or failures)"),
+    "local": ToolProfile(
+        "local", "Same-host services: a few ms per call, no failures",
+        default=ToolBehavior(Latency("lognormal", ms=5, sigma=0.3)),
+    ),
+    "internal-api": ToolProfile(
+        "internal-api", "Services in the same data center: tens of ms, 1% errors, occasional 0.5 s spikes",
+        default=ToolBehavior(Latency("lognormal", ms=60, sigma=0.5, spike_prob=0.02, spike_ms=500), error_rate=0.01),
+        overrides={
+            **{name: ToolBehavior(Latency("lognormal", ms=20, sigma=0.4)) for name in _CALCULATIONS},
+            "get_stock_prices": ToolBehavior(Latency("lognormal", ms=120, sigma=0.5, spike_prob=0.02, spike_ms=800),
+                                             error_rate=0.01),
+            "send_notification": ToolBehavior(Latency("lognormal", ms=200, sigma=0.5, spike_prob=0.02, spike_ms=1000),
+                                              error_rate=0.01),
+        },
+    ),
+    "flaky-external": ToolProfile(
+        "flaky-external", "Third-party APIs: hundreds of ms, multi-second spikes, rate limits, 5-10% errors",
+        default=ToolBehavior(Latency("lognormal", ms=150, sigma=0.6, spike_prob=0.03, spike_ms=2000), error_rate=0.05),
+        overrides={
+            **{name: ToolBehavior(Latency("lognormal", ms=40, sigma=0.5)) for name in _CALCULATIONS},
+            "get_stock_prices": ToolBehavior(Latency("lognormal", ms=350, sigma=0.8, spike_prob=0.05, spike_ms=3000),
+                                             error_rate=0.10, rate_limit=2.0, burst=3),
+            "get_portfolio_holdings": ToolBehavior(Latency("lognormal", ms=200, sigma=0.6, spike_prob=0.03,
+                                                           spike_ms=2000), error_rate=0.05),
+            "send_notification": ToolBehavior(Latency("lognormal", ms=600, sigma=0.7, spike_prob=0.05, spike_ms=4000),
+                                              error_rate=0.10, rate_limit=1.0, burst=1),
+        },
+    ),
+}
+
+_TRANSIENT_ERRORS = (
+    "503 Service Unavailable: {tool} is temporarily unavailable, retry the call",
+    "504 Gateway Timeout: {tool} did not respond in time, retry the call",
+    "Connection reset while calling {tool}, retry the call",
+)
+
+
+class _TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """0 if a token was taken, else seconds until one is available."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class ToolSimulator:
+    """Applies one profile to tool functions and counts what it injected.
+
+    Thread-safe, so it works with parallel tool dispatch: draws and bucket updates
+    happen under a lock, the sleep does not.
+    """
+
+    def __init__(self, profile: ToolProfile, seed: int = 0):
+        self.profile = profile
+        self.seed = seed
+        self._lock = threading.Lock()
+        self._rngs: dict[str, random.Random] = {}
+        self._buckets: dict[str, _TokenBucket] = {}
+        self._stats: dict[str, dict] = {}
+
+    def _tool_state(self, name: str) -> tuple[random.Random, _TokenBucket | None, dict]:
+        if name not in self._rngs:
+            behavior = self.profile.behavior(name)
+            self._rngs[name] = random.Random(f"{self.seed}:{name}")
+            if behavior.rate_limit:
+                self._buckets[name] = _TokenBucket(behavior.rate_limit, behavior.burst)
+            self._stats[name] = {"calls": 0, "injected_errors": 0, "rate_limited": 0, "simulated_latency_s": 0.0}
+        return self._rngs[name], self._buckets.get(name), self._stats[name]
+
+    def wrap(self, name: str, fn):
+        behavior = self.profile.behavior(name)
+
+        def simulated(*args, **kwargs):
+            with self._lock:
+                rng, bucket, stats = self._tool_state(name)
+                stats["calls"] += 1
+                retry_after = bucket.take() if bucket else 0.0
+                if retry_after:
+                    stats["rate_limited"] += 1
+                else:
+                    delay = behavior.latency.sample(rng)
+                    failure = rng.choice(_TRANSIENT_ERRORS) if rng.random() < behavior.error_rate else None
+                    stats["simulated_latency_s"] += delay
+                    if failure:
+                        stats["injected_errors"] += 1
+            if retry_after:
+                raise TransientToolError(f"429 Too Many Requests: rate limit for {name} exceeded, "
+                                         f"retry after {retry_after:.1f}s")
+            if delay:
+                time.sleep(delay)
+            if failure:
+                raise TransientToolError(failure.format(tool=name))
+            return fn(*args, **kwargs)
+
+        simulated.__name__ = getattr(fn, "__name__", name)
+        simulated.__doc__ = fn.__doc__
+        return simulated
+
+    def stats(self) -> dict:
+        """Profile name, seed, totals and per-tool counters, for metrics.json."""
+        with self._lock:
+            per_tool = {name: {**s, "simulated_latency_s": round(s["simulated_latency_s"], 3)}
+                        for name, s in sorted(self._stats.items())}
+        return {
+            "name": self.profile.name,
+            "seed": self.seed,
+            "calls": sum(s["calls"] for s in per_tool.values()),
+            "injected_errors": sum(s["injected_errors"] for s in per_tool.values()),
+            "rate_limited": sum(s["rate_limited"] for s in per_tool.values()),
+            "simulated_latency_s": round(sum(s["simulated_latency_s"] for s in per_tool.values()), 3),
+            "tools": per_tool,
+        }
@@ -0,0 +1,278 @@
+"""Efficiency analysis: join evaluator scores with run metrics and find Pareto-optimal models.
+
+For every task and hardware profile this computes, per (model, context size):
+  - quality        evaluator total (0-10) from evaluation.json, when an evaluator has been run
+  - tok/s          effective generation speed (server-reported, or estimated for cloud runs)
+  - peak VRAM      from the GPU monitor
+  - tok/s per GB   generation speed per GB of model size
+  - quality / s    quality points per second of wall clock
+
+and marks the Pareto frontier over (quality up, tok/s up, peak VRAM down): the
+configurations no other configuration beats on all three at once. Results go to
+reports/{mode}/efficiency.md with one SVG scatter plot per task/hardware group.
+
+Usage:
+    python scripts/evaluate_agentic_chat.py --mode gpu      # writes evaluation.json per run
+    python scripts/analyze_efficiency.py --mode gpu
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from datetime import datetime
+from xml.sax.saxutils import escape
+
+# Allow running from any directory
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from config import EVALUATION_FILENAME, REPORTS_DIR, TASKS
+from generate_report import collect_results, format_value, render_table
+
+
+def load_quality(run_dir: str) -> float | None:
+    """Evaluator total for a run, or None if it hasn't been evaluated."""
+    path = os.path.join(run_dir, EVALUATION_FILENAME)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("total")
+    except (json.JSONDecodeError, OSError):
+        return None
+
+
+def build_efficiency_frame(mode: str) -> pd.DataFrame:
+    """One row per (task, hardware, model, ctx) with quality, speed, VRAM and derived ratios.
+
+    Repeated runs of the same configuration are averaged.
+    """
+    runs = collect_results(mode)
+    if runs.empty:
+        return runs
+
+    runs = runs.assign(
+        quality=runs["run_dir"].map(load_quality).astype(float),
+        vram_gb=(runs["gpu.peak_vram_mb"] if "gpu.peak_vram_mb" in runs else 0) / 1024,
+        wall_s=runs["wall_clock_s"] if "wall_clock_s" in runs else np.nan,
+    )
+    if "error" in runs:
+        runs = runs[runs["error"].isna()]
+
+    keys = ["task", "hardware", "model", "ctx"]
+    frame = (runs.groupby(keys, dropna=False, sort=False)
+             .agg(tier=("tier", "first"), size_gb=("size_gb", "first"), runs=("model", "size"),
+                  quality=("quality", "mean"), tps=("eff_tps", "mean"),
+                  tps_estimated=("eff_tps_estimated", "any"),
+                  vram_gb=("vram_gb", "mean"), wall_s=("wall_s", "mean"))
+             .reset_index())
+
+    size = frame["size_gb"].where(frame["size_gb"] > 0)
+    frame["tps_per_gb"] = frame["tps"] / size
+    frame["quality_per_s"] = frame["quality"] / frame["wall_s"].where(frame["wall_s"] > 0)
+    return frame
+
+
+def pareto_mask(values: np.ndarray) -> np.ndarray:
+    """Boolean mask of non-dominated rows, all objectives to be maximized.
+
+    Row i is dominated if some row j is >= on every objective and > on at least one.
+    Vectorized as an n x n comparison; fine for the few hundred configurations per group.
+    """
+    if len(values) == 0:
+        return np.zeros(0, dtype=bool)
+    ge = (values[:, None, :] >= values[None, :, :]).all(axis=2)
+    gt = (values[:, None, :] > values[None, :, :]).any(axis=2)
+    dominated = (ge & gt).any(axis=0)
+    return ~dominated
+
+
+def mark_frontier(group: pd.DataFrame) -> pd.DataFrame:
+    """Add `objectives` and `pareto` columns for one task/hardware group.
+
+    Quality is only an objective when the group has evaluator scores; configurations
+    without a score are then left off the frontier.
+    """
+    objectives = ["tps", "vram_gb"]
+    if group["quality"].notna().any():
+        objectives.insert(0, "quality")
+
+    candidates = group[objectives].notna().all(axis=1) & (group["tps"] > 0)
+    values = group.loc[candidates, objectives].to_numpy(dtype=float)
+    values[:, objectives.index("vram_gb")] *= -1  # lower VRAM is better
+
+    group = group.assign(pareto=False, objectives=", ".join(objectives))
+    group.loc[candidates, "pareto"] = pareto_mask(values)
+    return group
+
+
+def group_label(task: str, hardware: str) -> str:
+    return f"{task} @ {hardware}" if hardware else task
+
+
+def slugify(text: str) -> str:
+    return re.sub(r"[^A-Za-z0-9.-]+", "-", text).strip("-").lower()
+
+
+def nice_ticks(lo: float, hi: float, count: int = 5) -> list[float]:
+    """Round tick values spanning [lo, hi]."""
+    if hi <= lo:
+        hi = lo + 1
+    raw = (hi - lo) / count
+    magnitude = 10 ** np.floor(np.log10(raw))
+    step = min((m * magnitude for m in (1, 2, 2.5, 5, 10) if m * magnitude >= raw), default=raw)
+    start = np.floor(lo / step) * step
+    return [round(start + i * step, 10) for i in range(int(np.ceil((hi - start) / step)) + 1)]
+
+
+def scatter_svg(group: pd.DataFrame, title: str) -> str:
+    """Static SVG scatter: tok/s on x, quality on y (or peak VRAM when unscored).
+
+    Point area scales with peak VRAM; Pareto-optimal configurations are filled and labelled.
+    """
+    width, height = 760, 480
+    left, right, top, bottom = 70, 200, 50, 60
+    plot_w, plot_h = width - left - right, height - top - bottom
+
+    points = group[group["tps"].notna() & (group["tps"] > 0)]
+    y_col, y_label = ("quality", "Quality (0-10)") if points["quality"].notna().any() else ("vram_gb", "Peak VRAM (GB)")
+    points = points[points[y_col].notna()]
+
+    x_ticks = nice_ticks(0, float(points["tps"].max()) if len(points) else 1)
+    if y_col == "quality":
+        y_ticks = [0, 2, 4, 6, 8, 10]
+    else:
+        y_ticks = nice_ticks(0, float(points["vram_gb"].max()) if len(points) else 1)
+    x_max, y_max = x_ticks[-1] or 1, y_ticks[-1] or 1
+
+    def sx(v):
+        return left + plot_w * v / x_max
+
+    def sy(v):
+        return top + plot_h * (1 - v / y_max)
+
+    max_vram = float(points["vram_gb"].max()) if len(points) and points["vram_gb"].max() > 0 else 1
+
+    out = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" font-family="sans-serif" font-size="11">',
+        f'<rect width="{width}" height="{height}" fill="white"/>',
+        f'<text x="{left}" y="24" font-size="15" font-weight="bold">{escape(title)}</text>',
+    ]
+    for t in x_ticks:
+        x = sx(t)
+        out.append(f'<line x1="{x:.1f}" y1="{top}" x2="{x:.1f}" y2="{top + plot_h}" stroke="#eee"/>')
+        out.append(f'<text x="{x:.1f}" y="{top + plot_h + 16}" text-anchor="middle">{t:g}</text>')
+    for t in y_ticks:
+        y = sy(t)
+        out.append(f'<line x1="{left}" y1="{y:.1f}" x2="{left + plot_w}" y2="{y:.1f}" stroke="#eee"/>')
+        out.append(f'<text x="{left - 8}" y="{y + 4:.1f}" text-anchor="end">{t:g}</text>')
+    out.append(f'<rect x="{left}" y="{top}" width="{plot_w}" height="{plot_h}" fill="none" stroke="#444"/>')
+    out.append(f'<text x="{left + plot_w / 2}" y="{height - 18}" text-anchor="middle">Generation speed (tok/s)</text>')
+    out.append(f'<text transform="translate(18 {top + plot_h / 2}) rotate(-90)" text-anchor="middle">{escape(y_label)}</text>')
+
+    # Dominated points first so the frontier draws on top
+    for row in points.sort_values("pareto").itertuples(index=False):
+        radius = 4 + 10 * (row.vram_gb / max_vram if row.vram_gb > 0 else 0)
+        fill, stroke = ("#1f77b4", "#0b3c5d") if row.pareto else ("#ccc", "#999")
+        name = row.model + (f" ctx-{row.ctx}" if pd.notna(row.ctx) else "")
+        x, y = sx(row.tps), sy(getattr(row, y_col))
+        out.append(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="{radius:.1f}" fill="{fill}" fill-opacity="0.7" '
+                   f'stroke="{stroke}"><title>{escape(name)}</title></circle>')
+        if row.pareto:
+            out.append(f'<text x="{x + radius + 3:.1f}" y="{y + 4:.1f}">{escape(name)}</text>')
+
+    legend_x = left + plot_w + 20
+    out.append(f'<circle cx="{legend_x}" cy="{top + 10}" r="6" fill="#1f77b4" fill-opacity="0.7" stroke="#0b3c5d"/>')
+    out.append(f'<text x="{legend_x + 12}" y="{top + 14}">Pareto-optimal</text>')
+    out.append(f'<circle cx="{legend_x}" cy="{top + 30}" r="6" fill="#ccc" fill-opacity="0.7" stroke="#999"/>')
+    out.append(f'<text x="{legend_x + 12}" y="{top + 34}">Dominated</text>')
+    out.append(f'<text x="{legend_x - 6}" y="{top + 56}">Point size = peak VRAM</text>')
+    out.append("</svg>")
+    return "\n".join(out)
+
+
+def build_group_table(group: pd.DataFrame) -> list[str]:
+    """Markdown table for one task/hardware group, frontier first."""
+    ordered = group.sort_values(["pareto", "quality", "tps"], ascending=[False, False, False])
+    tps = ordered["tps"].map(format_value)
+    tps = tps.mask(ordered["tps_estimated"] & ordered["tps"].notna(), "~" + tps)
+    table = pd.DataFrame({
+        "ctx": ordered["ctx"].map(format_value).values,
+        "Quality": ordered["quality"].map(format_value).values,
+        "tok/s": tps.values,
+        "Peak VRAM (GB)": ordered["vram_gb"].map(format_value).values,
+        "tok/s per GB": ordered["tps_per_gb"].map(format_value).values,
+        "Quality / s": ordered["quality_per_s"].map(lambda v: f"{v:.4f}" if pd.notna(v) else "-").values,
+        "Runs": ordered["runs"].values,
+        "Pareto": ordered["pareto"].map(lambda p: "**yes**" if p else "").values,
+    }, index=ordered["model"].values)
+    return render_table(table)
+
+
+def generate_efficiency_report(mode: str, tasks: list[str] | None = None):
+    """Write reports/{mode}/efficiency.md and per-group SVG plots."""
+    frame = build_efficiency_frame(mode)
+    if frame.empty:
+        print(f"No results found for mode '{mode}'. Run benchmarks first.")
+        return
+    if tasks:
+        frame = frame[frame["task"].isin(tasks)]
+
+    report_dir = os.path.join(REPORTS_DIR, mode)
+    plot_dir = os.path.join(report_dir, "efficiency")
+    os.makedirs(plot_dir, exist_ok=True)
+
+    scored = frame["quality"].notna().sum()
+    lines = [
+        f"# Efficiency & Pareto Analysis ({mode.upper()} Mode)",
+        "",
+        f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        "",
+        f"Configurations: {len(frame)} ({scored} with evaluator scores)",
+        "",
+        "*Pareto = no other configuration has higher-or-equal quality, higher-or-equal tok/s and "
+        "lower-or-equal peak VRAM with at least one strictly better. tok/s per GB uses model size; "
+        "quality / s uses wall clock. ~ = estimated tok/s (cloud).*",
+        "",
+    ]
+
+    frame = frame.assign(task_order=frame["task"].map(TASKS.index))
+    for (_, task, hardware), group in frame.groupby(["task_order", "task", "hardware"], sort=True):
+        group = mark_frontier(group)
+        label = group_label(task, hardware)
+        svg_name = f"{slugify(label)}.svg"
+        with open(os.path.join(plot_dir, svg_name), "w", encoding="utf-8") as f:
+            f.write(scatter_svg(group, f"{label}: Pareto frontier ({group['objectives'].iloc[0]})"))
+
+        frontier = group[group["pareto"]]
+        lines.append(f"## {label}")
+        lines.append("")
+        lines.append(f"Objectives: {group['objectives'].iloc[0]}. "
+                     f"Frontier: {', '.join(f'`{m}`' for m in frontier['model'].unique()) or 'none'}")
+        lines.append("")
+        lines.append(f"![{label}](efficiency/{svg_name})")
+        lines.append("")
+        lines.extend(build_group_table(group))
+        lines.append("")
+
+    report_path = os.path.join(report_dir, "efficiency.md")
+    with open(report_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+
+    print(f"Efficiency report: {report_path}")
+    print(f"Plots:             {plot_dir}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Efficiency metrics and Pareto frontier across quality, speed and VRAM")
+    parser.add_argument("--mode", type=str, required=True, choices=["cloud", "cpu", "gpu"],
+                        help="Execution mode to analyze")
+    parser.add_argument("--tasks", type=str, default=None,
+                        help="Comma-separated list of tasks to include (default: all with results)")
+    args = parser.parse_args()
+    generate_efficiency_report(args.mode, tasks=args.tasks.split(",") if args.tasks else None)
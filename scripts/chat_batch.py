@@ -0,0 +1,246 @@
+"""Batch agentic-chat: K independent conversations per model, run concurrently.
+
+One conversation per model says little about an agent's reliability, which varies from
+sample to sample. --conversations K runs K conversations against the same loaded model
+from a thread pool, so they share the server's parallel slots (OLLAMA_NUM_PARALLEL)
+instead of running one after another. The conversations vary as follows:
+  - seed: each gets its own Ollama sampling seed (base seed + index)
+  - temperature: optionally cycled from a list
+  - scenario: optionally its own N portfolios x M holdings. One seeded scenario of K*N
+    portfolios is generated and each conversation gets a disjoint slice of N, so all K
+    share one tool data set (the reference tools read module globals) and still check
+    different portfolios.
+
+Each conversation is saved and evaluated like a standard run. The batch records the
+completion rate, the distribution of classify_chat_result outcomes, evaluator scores,
+and latency percentiles: conversation wall time, turn latency and time to first action.
+It also records the batch wall time against the summed conversation time, which shows
+how much the server's parallel slots actually overlapped.
+"""
+
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+
+from chat_scaling import MIN_TURNS, TURNS_PER_PORTFOLIO
+from config import REQUIREMENTS_DIR
+
+sys.path.insert(0, REQUIREMENTS_DIR)
+from agentic_scenarios import Scenario, generate_scenario
+
+
+def split_scenario(scenario: Scenario, parts: int) -> list[Scenario]:
+    """Cut a scenario into `parts` disjoint portfolio slices that share its price/volatility data."""
+    pids = scenario.required_portfolios
+    size = len(pids) // parts
+    slices = []
+    for i in range(parts):
+        chunk = pids[i * size:(i + 1) * size]
+        slices.append(Scenario(f"{scenario.name}-c{i:02d}", scenario.seed,
+                               {pid: scenario.portfolio_data[pid] for pid in chunk},
+                               scenario.stock_prices, scenario.stock_volatilities, scenario.risk_config,
+                               {pid: scenario.expected[pid] for pid in chunk}))
+    return slices
+
+
+def plan_conversations(count: int, base_seed: int = 0, temperatures: list[float] | None = None,
+                       size: tuple[int, int] | None = None) -> tuple[list[dict], Scenario | None]:
+    """Per-conversation seed, temperature (None = the model default) and scenario slice.
+
+    Returns (plans, combined scenario to install for the whole batch, or None for the
+    reference task).
+    """
+    combined = None
+    slices = [None] * count
+    if size:
+        portfolios, holdings = size
+        combined = generate_scenario(portfolios * count, holdings, seed=base_seed)
+        combined.name = f"{portfolios}x{holdings}"
+        slices = split_scenario(combined, count)
+    plans = []
+    for i in range(count):
+        plans.append({
+            "name": f"c{i:02d}",
+            "seed": base_seed + i,
+            "temperature": temperatures[i % len(temperatures)] if temperatures else None,
+            "scenario": slices[i],
+        })
+    return plans, combined
+
+
+def _percentiles(values: list[float]) -> dict:
+    if not values:
+        return {"p50": None, "p90": None, "p99": None, "max": None}
+    arr = np.asarray(values, dtype=float)
+    return {
+        "p50": round(float(np.percentile(arr, 50)), 3),
+        "p90": round(float(np.percentile(arr, 90)), 3),
+        "p99": round(float(np.percentile(arr, 99)), 3),
+        "max": round(float(arr.max()), 3),
+    }
+
+
+def run_chat_batch(
+    model: str,
+    base_user_msg: str,
+    plans: list[dict],
+    run_chat,
+    save_run,
+    results_dir: str,
+    concurrency: int,
+    timeout: int = 600,
+) -> dict:
+    """Run the planned conversations `concurrency` at a time and return points plus analysis.
+
+    `run_chat(plan, user_msg, max_turns=..., timeout_total=...)` runs one conversation
+    with the plan's seed and temperature. `save_run(chat_result, run_dir)` saves it and
+    returns the agentic-chat evaluator's result. Saving and evaluating happen on the
+    calling thread as conversations finish.
+    """
+    jobs = {}
+    batch_start = time.time()
+    points = []
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="chat") as pool:
+        for plan in plans:
+            scenario = plan["scenario"]
+            user_msg = scenario.user_message(base_user_msg) if scenario else base_user_msg
+            portfolios = len(scenario.portfolio_data) if scenario else 3
+            max_turns = max(MIN_TURNS, TURNS_PER_PORTFOLIO * portfolios)
+            timeout_s = int(timeout * max(1.0, portfolios / 3))
+
+            def job(plan=plan, user_msg=user_msg, max_turns=max_turns, timeout_s=timeout_s):
+                start = time.time()
+                return run_chat(plan, user_msg, max_turns=max_turns, timeout_total=timeout_s), time.time() - start
+
+            jobs[pool.submit(job)] = plan
+
+        for future in as_completed(jobs):
+            plan = jobs[future]
+            run_dir = os.path.join(results_dir, plan["name"])
+            os.makedirs(run_dir, exist_ok=True)
+            try:
+                chat_result, wall_s = future.result()
+                if plan["scenario"]:
+                    with open(os.path.join(run_dir, "scenario.json"), "w", encoding="utf-8") as f:
+                        json.dump(plan["scenario"].to_dict(), f, indent=2)
+                evaluation = save_run(chat_result, run_dir)
+            except Exception as e:  # one broken conversation (run, save or evaluation) shouldn't lose the batch
+                point = {"name": plan["name"], "seed": plan["seed"], "temperature": plan["temperature"],
+                         "error": f"{type(e).__name__}: {e}", "completed": False, "classification": "error"}
+                points.append(point)
+                print(f"  {plan['name']}: ERROR {point['error']}")
+                continue
+            point = summarize_conversation(plan, chat_result, evaluation, wall_s)
+            points.append(point)
+            print(f"  {point['name']} (seed {point['seed']}, temp {point['temperature']}): {point['classification']} "
+                  f"| {point['turns']} turns, {point['tool_calls']} calls | {point['wall_clock_s']}s "
+                  f"| score {point['score']}")
+
+    batch_wall = time.time() - batch_start
+    points.sort(key=lambda p: p["name"])
+    return {
+        "model": model,
+        "run_timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "conversations": len(plans),
+        "concurrency": concurrency,
+        "points": points,
+        "analysis": analyze_batch(points, batch_wall),
+    }
+
+
+def summarize_conversation(plan: dict, chat_result: dict, evaluation: dict, wall_s: float) -> dict:
+    turns = [t for t in chat_result["turn_metrics"] if "error" not in t]
+    classification = evaluation.get("classification", {})
+    return {
+        "name": plan["name"],
+        "seed": plan["seed"],
+        "temperature": chat_result.get("temperature"),
+        "portfolios": len(plan["scenario"].portfolio_data) if plan["scenario"] else 3,
+        "turns": chat_result["total_turns"],
+        "tool_calls": len(chat_result["tool_calls_log"]),
+        "completed": chat_result["completed"],
+        "classification": classification.get("classification", "unknown"),
+        "score": evaluation.get("scores", {}).get("total"),
+        "wall_clock_s": round(wall_s, 2),
+        "turn_latencies_s": [t.get("duration_s", 0) for t in turns],
+        "time_to_action_s": [t["time_to_action_s"] for t in turns if t.get("time_to_action_s") is not None],
+    }
+
+
+def analyze_batch(points: list[dict], batch_wall_s: float) -> dict:
+    """Completion rate, outcome distribution, score spread and latency percentiles over the batch."""
+    ran = [p for p in points if "error" not in p]
+    scores = [p["score"] for p in ran if p.get("score") is not None]
+    conversation_s = [p["wall_clock_s"] for p in ran]
+    return {
+        "completion_rate": round(sum(1 for p in points if p["completed"]) / len(points), 3) if points else 0,
+        "classifications": dict(Counter(p["classification"] for p in points).most_common()),
+        "score_mean": round(sum(scores) / len(scores), 2) if scores else None,
+        "score_min": min(scores) if scores else None,
+        "score_max": max(scores) if scores else None,
+        "conversation_s": _percentiles(conversation_s),
+        "turn_latency_s": _percentiles([s for p in ran for s in p["turn_latencies_s"]]),
+        "time_to_action_s": _percentiles([s for p in ran for s in p["time_to_action_s"]]),
+        "batch_wall_s": round(batch_wall_s, 2),
+        "summed_conversation_s": round(sum(conversation_s), 2),
+        "overlap": round(sum(conversation_s) / batch_wall_s, 2) if batch_wall_s > 0 else None,
+    }
+
+
+def save_chat_batch(results_dir: str, batch: dict) -> str:
+    """Write chat_batch.json into results_dir and return its path."""
+    os.makedirs(results_dir, exist_ok=True)
+    path = os.path.join(results_dir, "chat_batch.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(batch, f, indent=2)
+    return path
+
+
+def format_chat_batch_summary(batches: list[dict]) -> str:
+    """Markdown summary (one row per model) plus per-conversation detail tables."""
+    lines = [
+        "*Overlap = summed conversation time / batch wall time (1.0 = no parallelism from the server's slots). "
+        "Latencies are p50 / p90 / p99 seconds.*",
+        "",
+        "| Model | ctx | Conversations | Completed | Outcomes | Score mean (min-max) | Conversation s "
+        "| Turn s | Time to action s | Batch wall s | Overlap |",
+        "|-------|-----|---------------|-----------|----------|----------------------|----------------"
+        "|--------|------------------|--------------|---------|",
+    ]
+
+    def pct(d):
+        return f"{d['p50']} / {d['p90']} / {d['p99']}" if d["p50"] is not None else "-"
+
+    for b in batches:
+        a = b["analysis"]
+        outcomes = ", ".join(f"{k} {v}" for k, v in a["classifications"].items())
+        score = f"{a['score_mean']} ({a['score_min']}-{a['score_max']})" if a["score_mean"] is not None else "-"
+        lines.append(
+            f"| `{b['model']}` | {b.get('num_ctx', '-')} | {b['conversations']} x {b['scenario']} "
+            f"(x{b['concurrency']} parallel) | {a['completion_rate']:.0%} | {outcomes} | {score} "
+            f"| {pct(a['conversation_s'])} | {pct(a['turn_latency_s'])} | {pct(a['time_to_action_s'])} "
+            f"| {a['batch_wall_s']} | {a['overlap'] if a['overlap'] is not None else '-'} |"
+        )
+
+    for b in batches:
+        lines += [
+            "",
+            f"## `{b['model']}` (ctx {b.get('num_ctx', '-')})",
+            "",
+            "| Conversation | Seed | Temp | Turns | Tool calls | Wall s | Score | Result |",
+            "|--------------|------|------|-------|------------|--------|-------|--------|",
+        ]
+        for p in b["points"]:
+            if "error" in p:
+                lines.append(f"| {p['name']} | {p['seed']} | {p['temperature']} | - | - | - | - | error: {p['error']} |")
+                continue
+            lines.append(
+                f"| {p['name']} | {p['seed']} | {p['temperature']} | {p['turns']} | {p['tool_calls']} "
+                f"| {p['wall_clock_s']} | {p['score'] if p['score'] is not None else '-'} | {p['classification']} |"
+            )
+    return "\n".join(lines)
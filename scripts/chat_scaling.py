@@ -0,0 +1,229 @@
+"""Agentic-chat workload scaling: the workload size at which a model/context combination falls over.
+
+Runs the agentic-chat loop on seeded scenarios of growing size (N portfolios x M holdings,
+see requirements/agentic_scenarios.py). For each size it records turns, tool calls, total
+and peak prompt tokens, peak context pressure, wall time, and how many portfolios reached
+the expected risk outcome. A size holds when the chat completes and every portfolio's risk
+check matches the expectation. The first size that doesn't is the breaking point, and
+its cause is recorded: turn budget, timeout, full context, spinning, missed portfolios
+or wrong outcomes.
+
+The turn budget and timeout grow with the number of portfolios. So a failure reflects the
+model and its context window, not a cap sized for the three-portfolio task.
+"""
+
+import json
+import os
+import sys
+import time
+
+from config import REQUIREMENTS_DIR
+
+sys.path.insert(0, REQUIREMENTS_DIR)
+from agentic_scenarios import generate_scenario, save_scenario, use_scenario
+
+TURNS_PER_PORTFOLIO = 10    # up to 8 tool calls per portfolio, plus slack for retries and nudges
+MIN_TURNS = 30              # the fixed task's budget
+FULL_CONTEXT_PCT = 95.0     # peak prompt at this share of num_ctx counts as a full context
+DEFAULT_HOLDINGS = 4
+
+
+def parse_sizes(spec: str) -> list[tuple[int, int]]:
+    """"3x4,10x4,30x6" -> [(3, 4), (10, 4), (30, 6)]; a bare N uses DEFAULT_HOLDINGS holdings."""
+    sizes = []
+    for part in spec.split(","):
+        part = part.strip().lower()
+        if not part:
+            continue
+        portfolios, _, holdings = part.partition("x")
+        sizes.append((int(portfolios), int(holdings) if holdings else DEFAULT_HOLDINGS))
+    return sorted(set(sizes), key=lambda s: (s[0] * s[1], s))
+
+
+def portfolio_outcomes(tool_calls_log: list[dict]) -> dict[str, dict]:
+    """Last successful check_risk_threshold result per portfolio.
+
+    Calls belong to the portfolio of the most recent get_portfolio_holdings call, the
+    same grouping the agentic-chat evaluator uses.
+    """
+    outcomes = {}
+    current = None
+    for tc in tool_calls_log:
+        args = tc.get("arguments") if isinstance(tc.get("arguments"), dict) else {}
+        if tc["tool"] == "get_portfolio_holdings" and args.get("portfolio_id"):
+            current = args["portfolio_id"]
+        elif tc["tool"] == "check_risk_threshold" and current and tc.get("success"):
+            try:
+                outcomes[current] = json.loads(tc["result_preview"])
+            except json.JSONDecodeError:
+                pass
+    return outcomes
+
+
+def _failure_reason(point: dict) -> str | None:
+    if point.get("error"):
+        return "request error"
+    if not point["completed"]:
+        if point["spin_detected"]:
+            return "spinning"
+        if point["peak_context_pressure_pct"] >= FULL_CONTEXT_PCT:
+            return "context full"
+        if point["turns"] >= point["max_turns"]:
+            return "turn budget"
+        if point["wall_clock_s"] >= point["timeout_s"]:
+            return "timeout"
+        return "no final response"
+    if point["portfolios_checked"] < point["portfolios"]:
+        return "missed portfolios"
+    if point["outcomes_correct"] < point["portfolios"]:
+        return "wrong outcomes"
+    return None
+
+
+def run_chat_scaling(
+    model: str,
+    base_user_msg: str,
+    run_chat,
+    sizes: list[tuple[int, int]],
+    results_dir: str,
+    save_run,
+    timeout: int = 600,
+    seed: int = 42,
+    keep_going: bool = False,
+) -> dict:
+    """Run one model across workload sizes and return the points plus analysis.
+
+    `run_chat(user_msg, max_turns=..., timeout_total=...)` runs one conversation
+    (run_chat_benchmark with the model's options bound). `save_run(chat_result, run_dir)`
+    writes its transcript and metrics and returns the agentic-chat evaluator's score
+    (or None). Each size's scenario is served by the reference tools while it runs, and
+    saved as scenario.json next to the transcript so the evaluator checks the right
+    portfolios. The sweep stops at the first failing size unless keep_going.
+    """
+    points = []
+    for portfolios, holdings in sizes:
+        scenario = generate_scenario(portfolios, holdings, seed=seed)
+        max_turns = max(MIN_TURNS, TURNS_PER_PORTFOLIO * portfolios)
+        timeout_s = int(timeout * max(1.0, portfolios / 3))
+        print(f"  {scenario.name:>8} ({len(scenario.stock_prices)} symbols, max {max_turns} turns): running...")
+
+        use_scenario(scenario)
+        start = time.time()
+        try:
+            chat_result = run_chat(scenario.user_message(base_user_msg), max_turns=max_turns, timeout_total=timeout_s)
+        finally:
+            use_scenario(None)
+        elapsed = time.time() - start
+
+        run_dir = os.path.join(results_dir, scenario.name)
+        os.makedirs(run_dir, exist_ok=True)
+        save_scenario(os.path.join(run_dir, "scenario.json"), scenario)
+        score = save_run(chat_result, run_dir)
+
+        turns = chat_result["turn_metrics"]
+        outcomes = portfolio_outcomes(chat_result["tool_calls_log"])
+        correct = sum(1 for pid, expected in scenario.expected.items()
+                      if outcomes.get(pid, {}).get("risk_level") == expected["risk_level"]
+                      and outcomes.get(pid, {}).get("is_high_risk") == expected["is_high_risk"])
+        point = {
+            "size": scenario.name,
+            "portfolios": portfolios,
+            "holdings": holdings,
+            "symbols": len(scenario.stock_prices),
+            "turns": chat_result["total_turns"],
+            "max_turns": max_turns,
+            "tool_calls": len(chat_result["tool_calls_log"]),
+            "total_prompt_tokens": sum(t.get("prompt_eval_count", 0) for t in turns),
+            "total_eval_tokens": sum(t.get("eval_count", 0) for t in turns),
+            "peak_prompt_tokens": max((t.get("prompt_eval_count", 0) for t in turns), default=0),
+            "peak_context_pressure_pct": max((t.get("context_pressure_pct", 0) for t in turns), default=0),
+            "wall_clock_s": round(elapsed, 2),
+            "timeout_s": timeout_s,
+            "completed": chat_result["completed"],
+            "spin_detected": bool(chat_result.get("spin_detected")),
+            "portfolios_checked": len(set(outcomes) & set(scenario.expected)),
+            "outcomes_correct": correct,
+            "score": score,
+        }
+        errors = [t["error"] for t in turns if "error" in t]
+        if errors:
+            point["error"] = errors[-1]
+        point["failure"] = _failure_reason(point)
+        points.append(point)
+
+        status = f"FAILED ({point['failure']})" if point["failure"] else "ok"
+        print(f"  {scenario.name:>8}: {status} | {point['turns']} turns, {point['tool_calls']} calls, "
+              f"{point['portfolios_checked']}/{portfolios} checked, {correct} correct | "
+              f"{point['total_prompt_tokens']} prompt tokens, peak {point['peak_context_pressure_pct']}% ctx | "
+              f"{point['wall_clock_s']}s")
+        if point["failure"] and not keep_going:
+            break
+
+    return {
+        "model": model,
+        "run_timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "seed": seed,
+        "points": points,
+        "analysis": analyze_scaling(points),
+    }
+
+
+def analyze_scaling(points: list[dict]) -> dict:
+    """Largest size that held before the first failure, and that failure."""
+    if not points:
+        return {"error": "no sizes run"}
+    held = None
+    for point in points:
+        if point["failure"]:
+            return {
+                "largest_passing_size": held["size"] if held else None,
+                "breaking_size": point["size"],
+                "breaking_reason": point["failure"],
+            }
+        held = point
+    return {"largest_passing_size": held["size"], "breaking_size": None, "breaking_reason": None}
+
+
+def save_scaling(results_dir: str, scaling: dict) -> str:
+    """Write chat_scaling.json into results_dir and return its path."""
+    os.makedirs(results_dir, exist_ok=True)
+    path = os.path.join(results_dir, "chat_scaling.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(scaling, f, indent=2)
+    return path
+
+
+def format_scaling_summary(scalings: list[dict]) -> str:
+    """Markdown summary (breaking point per model) plus per-size detail tables."""
+    lines = [
+        "*A size passes when the chat completes and every portfolio's risk check matches the expected outcome.*",
+        "",
+        "| Model | ctx | Largest passing size | Breaks at | Reason |",
+        "|-------|-----|----------------------|-----------|--------|",
+    ]
+    for s in scalings:
+        a = s["analysis"]
+        if "error" in a:
+            lines.append(f"| `{s['model']}` | {s.get('num_ctx', '-')} | - | - | {a['error']} |")
+            continue
+        lines.append(f"| `{s['model']}` | {s.get('num_ctx', '-')} | {a['largest_passing_size'] or '-'} "
+                     f"| {a['breaking_size'] or 'did not break'} | {a['breaking_reason'] or '-'} |")
+
+    for s in scalings:
+        lines += [
+            "",
+            f"## `{s['model']}` (ctx {s.get('num_ctx', '-')})",
+            "",
+            "| Size | Symbols | Turns | Tool calls | Prompt tokens (total) | Peak ctx % | Wall s "
+            "| Checked | Correct | Score | Result |",
+            "|------|---------|-------|------------|-----------------------|------------|--------"
+            "|---------|---------|-------|--------|",
+        ]
+        for p in s["points"]:
+            lines.append(
+                f"| {p['size']} | {p['symbols']} | {p['turns']}/{p['max_turns']} | {p['tool_calls']} "
+                f"| {p['total_prompt_tokens']} | {p['peak_context_pressure_pct']} | {p['wall_clock_s']} "
+                f"| {p['portfolios_checked']}/{p['portfolios']} | {p['outcomes_correct']} "
+                f"| {p['score'] if p['score'] is not None else '-'} | {p['failure'] or 'ok'} |"
+            )
+    return "\n".join(lines)
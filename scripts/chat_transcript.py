@@ -0,0 +1,124 @@
+"""Append-only, per-turn checkpoints of an agentic-chat conversation (transcript.jsonl).
+
+save_chat_results writes output.md, metrics.json and transcript.json once the conversation
+is over, so a crash, a timeout kill or Ctrl-C late in an hour-long CPU run used to lose
+every turn. run_chat_benchmark now appends one JSON line per completed turn to
+transcript.jsonl in the results directory, and flushes and fsyncs each line:
+
+  {"type": "start", "model": ..., "messages": [system, user], "started_at": ...}
+  {"type": "turn", "turn": 3, "messages": [...], "metrics": {...}, "tool_calls": [...],
+   "state": {...}, "elapsed_s": ...}
+  {"type": "end", "completed": true, "final_response": ..., "spin_detected": null}
+
+A turn record holds the messages added since the previous record (assistant message,
+tool results, any nudges), that turn's metrics and tool-call log entries, and the loop
+state needed to carry on. read_transcript() rebuilds the conversation. A torn last line
+from a crash mid-write is ignored, so every record it returns is a complete turn. The
+final files are derived from that rebuild, and `--resume` continues a conversation from
+its last complete turn.
+"""
+
+import json
+import os
+import time
+
+from results_io import convert_file, find_result_file, open_text, remove_other_variants
+
+TRANSCRIPT_LOG = "transcript.jsonl"
+
+
+class TranscriptLog:
+    """Appends start/turn/end records to a transcript.jsonl, durable after each write."""
+
+    def __init__(self, path: str, resume: bool = False):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        results_dir, name = os.path.split(path)
+        if resume and find_result_file(results_dir, name):
+            convert_file(results_dir, name, "plain")  # appends need the plain file
+            _truncate_torn_tail(path)
+        self._file = open(path, "a" if resume else "w", encoding="utf-8")
+        remove_other_variants(results_dir, name, keep=path)
+
+    def _write(self, record: dict):
+        self._file.write(json.dumps(record, default=str) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def start(self, model: str, messages: list[dict], **meta):
+        self._write({"type": "start", "model": model, "messages": messages,
+                     "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"), **meta})
+
+    def resumed(self, from_turn: int):
+        self._write({"type": "resume", "from_turn": from_turn, "at": time.strftime("%Y-%m-%dT%H:%M:%S")})
+
+    def turn(self, turn: int, messages: list[dict], metrics: dict, tool_calls: list[dict], state: dict,
+             elapsed_s: float):
+        self._write({"type": "turn", "turn": turn, "messages": messages, "metrics": metrics,
+                     "tool_calls": tool_calls, "state": state, "elapsed_s": round(elapsed_s, 2)})
+
+    def end(self, completed: bool, final_response: str, spin_detected: dict | None):
+        self._write({"type": "end", "completed": completed, "final_response": final_response,
+                     "spin_detected": spin_detected})
+
+    def close(self):
+        self._file.close()
+
+
+def _truncate_torn_tail(path: str):
+    """Drop a partial last line (a crash mid-write) so appended records start on a fresh line."""
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+
+def read_transcript(path: str) -> dict | None:
+    """Rebuild a conversation from transcript.jsonl (None if there is no start record).
+
+    Returns messages, turn_metrics, tool_calls_log, state (of the last turn), elapsed_s,
+    ended/completed/final_response/spin_detected, and the start record's metadata.
+    A turn that ended in a request error is kept until a resume record follows it;
+    the resumed run redoes that turn.
+    """
+    stored = find_result_file(*os.path.split(path))  # plain, or compressed by --storage
+    if stored is None:
+        return None
+    records = []
+    with open_text(stored) as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                break  # torn write: everything before it is intact
+    if not records or records[0].get("type") != "start":
+        return None
+
+    start = records[0]
+    rebuilt = {
+        "start": {k: v for k, v in start.items() if k not in ("type", "messages")},
+        "messages": list(start["messages"]),
+        "turn_metrics": [],
+        "tool_calls_log": [],
+        "state": {},
+        "elapsed_s": 0.0,
+        "ended": False,
+        "completed": False,
+        "final_response": "",
+        "spin_detected": None,
+    }
+    for record in records[1:]:
+        kind = record.get("type")
+        if kind == "turn":
+            rebuilt["messages"].extend(record["messages"])
+            rebuilt["turn_metrics"].append(record["metrics"])
+            rebuilt["tool_calls_log"].extend(record["tool_calls"])
+            rebuilt["state"] = record.get("state", {})
+            rebuilt["elapsed_s"] = record.get("elapsed_s", rebuilt["elapsed_s"])
+        elif kind == "end":
+            rebuilt.update(ended=True, completed=record["completed"], final_response=record["final_response"],
+                           spin_detected=record.get("spin_detected"))
+        elif kind == "resume":
+            rebuilt["ended"] = False
+            rebuilt["turn_metrics"] = [t for t in rebuilt["turn_metrics"] if "error" not in t]
+    return rebuilt
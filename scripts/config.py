@@ -1,7 +1,9 @@
 """Shared configuration for the Ollama model testing framework."""
 
+import json
 import os
 import re
+from datetime import datetime
 
 # Paths
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -10,8 +12,8 @@ REFACTOR_SOURCE_DIR = os.path.join(PROJECT_ROOT, "refactor-source")
 MODELS_DIR = os.path.join(PROJECT_ROOT, "models")
 REPORTS_DIR = os.path.join(PROJECT_ROOT, "reports")
 
-# Ollama API
-OLLAMA_BASE_URL = "http://localhost:11434"
+# Ollama API (override with the OLLAMA_BASE_URL env var, e.g. to target scripts/mock_ollama.py)
+OLLAMA_BASE_URL = os.environ.get("OLLAMA_BASE_URL", "http://localhost:11434").rstrip("/")
 OLLAMA_GENERATE_URL = f"{OLLAMA_BASE_URL}/api/generate"
 OLLAMA_CHAT_URL = f"{OLLAMA_BASE_URL}/api/chat"
 OLLAMA_PULL_URL = f"{OLLAMA_BASE_URL}/api/pull"
@@ -29,6 +31,20 @@ AGENTIC_TOOLS_DIR = os.path.join(REQUIREMENTS_DIR, "tools_reference.py")
 # Engine task historical data
 HISTORICAL_CSV_PATH = os.path.join(REQUIREMENTS_DIR, "historical.csv")
 
+# Sandbox for running generated engine code (engine_executor.py)
+ENGINE_TIMEOUT_S = 30
+ENGINE_CPU_LIMIT_S = 60
+ENGINE_MEMORY_LIMIT_MB = 2048
+ENGINE_WORKERS = 1
+
+# Cached synthetic price histories for evaluate_engine_perf.py
+ENGINE_DATASETS_DIR = os.path.join(PROJECT_ROOT, "datasets", "engine")
+
+# Isolated environment for evaluate_api_code.py (offline install from a local wheel cache)
+API_WHEELHOUSE_DIR = os.path.join(PROJECT_ROOT, "wheelhouse")
+API_VENV_DIR = os.path.join(PROJECT_ROOT, ".api-eval-venv")
+API_EVAL_PACKAGES = ["fastapi", "uvicorn", "httpx", "pytest", "pytest-asyncio", "anyio"]
+
 # All models to benchmark
 MODELS = [
     # Tier 1: Small (<=6GB) — very comfortable on 3090
@@ -185,8 +201,17 @@ DEFAULT_MODEL_META = (99, 0)  # Unknown models sort last
 
 
 def get_model_meta(model: str) -> tuple:
-    """Get (tier, size_gb) for a model, falling back to DEFAULT_MODEL_META."""
-    return MODEL_META.get(model, DEFAULT_MODEL_META)
+    """Get (tier, size_gb) for a model, falling back to DEFAULT_MODEL_META.
+
+    Quant tags are matched case-insensitively (hf.co repos publish both q4_K_M and Q4_K_M).
+    """
+    if model in MODEL_META:
+        return MODEL_META[model]
+    lowered = model.lower()
+    for name, meta in MODEL_META.items():
+        if name.lower() == lowered:
+            return meta
+    return DEFAULT_MODEL_META
 
 
 def is_cloud_model(model: str) -> bool:
@@ -209,9 +234,94 @@ def get_chat_temperature(model: str) -> float:
         return 0.4
 
 
+# Approximate bits per weight of llama.cpp / GGUF quantization types (weights only,
+# including block scales). Used to order quant levels of the same base model.
+QUANT_BITS_PER_WEIGHT = {
+    "Q2_K": 2.63,
+    "IQ3_XXS": 3.06,
+    "IQ3_XS": 3.3,
+    "Q3_K_S": 3.5,
+    "Q3_K_M": 3.91,
+    "Q3_K_L": 4.27,
+    "IQ4_XS": 4.25,
+    "IQ4_NL": 4.5,
+    "Q4_0": 4.55,
+    "Q4_K_S": 4.58,
+    "Q4_K_M": 4.89,
+    "Q4_1": 5.0,
+    "Q5_0": 5.54,
+    "Q5_K_S": 5.54,
+    "Q5_K_M": 5.7,
+    "Q5_1": 6.0,
+    "Q6_K": 6.56,
+    "Q8_0": 8.5,
+    "BF16": 16.0,
+    "F16": 16.0,
+    "F32": 32.0,
+}
+
+# Quant used by Ollama library tags that don't name one (e.g. qwen3:8b)
+DEFAULT_LIBRARY_QUANT = "Q4_K_M"
+
+# Families whose quants are published under different names: family -> canonical family
+QUANT_FAMILY_ALIASES = {
+    "hf.co/Qwen/Qwen3-8B-GGUF": "qwen3:8b",
+    "qwen2.5-coder:7b-instruct": "qwen2.5-coder:7b",
+    "qwen2.5-coder:14b-instruct": "qwen2.5-coder:14b",
+    "qwen2.5-coder:32b-instruct": "qwen2.5-coder:32b",
+    "llama3.1:8b-instruct": "llama3.1:8b",
+}
+
+_QUANT_PATTERN = re.compile(
+    r"(?:^|[-_.:])(" + "|".join(sorted(QUANT_BITS_PER_WEIGHT, key=len, reverse=True)) + r")$",
+    re.IGNORECASE,
+)
+
+
+def get_quant_info(model: str) -> dict | None:
+    """Split a model tag into base-model family and quantization level.
+
+    The quant comes from the end of the tag (the part model_to_dirname puts in
+    parentheses): qwen2.5-coder:7b-instruct-q5_K_M -> family qwen2.5-coder:7b-instruct,
+    quant Q5_K_M. Library tags without a quant get DEFAULT_LIBRARY_QUANT, and families
+    are then mapped through QUANT_FAMILY_ALIASES so e.g. qwen3:8b and
+    hf.co/Qwen/Qwen3-8B-GGUF:Q8_0 compare as one family.
+
+    Returns {family, quant, bits_per_weight, quant_inferred}, or None for cloud models.
+    """
+    if is_cloud_model(model) or model.endswith(":cloud"):
+        return None
+    name, _, tag = model.partition(":")
+    match = _QUANT_PATTERN.search(tag)
+    if match:
+        quant = match.group(1).upper()
+        rest = tag[:match.start()]
+        family = f"{name}:{rest}" if rest else name
+        inferred = False
+    else:
+        quant = DEFAULT_LIBRARY_QUANT
+        family = model if tag and tag != "latest" else name
+        inferred = True
+    family = QUANT_FAMILY_ALIASES.get(family, family)
+    return {
+        "family": family,
+        "quant": quant,
+        "bits_per_weight": QUANT_BITS_PER_WEIGHT[quant],
+        "quant_inferred": inferred,
+    }
+
+
 # GPU monitoring interval in seconds
 GPU_POLL_INTERVAL = 1.0
 
+# Power sampling interval in seconds (energy per token)
+POWER_POLL_INTERVAL = 0.5
+
+# Model pulls: parallel downloads, retries per model, and the per-pull throughput log
+PULL_CONCURRENCY = 2
+PULL_RETRIES = 3
+PULL_LOG_PATH = os.path.join(REPORTS_DIR, "pull_log.jsonl")
+
 
 def model_to_dirname(model: str) -> str:
     """Convert an Ollama model tag to a Windows-safe directory name.
@@ -254,3 +364,27 @@ def get_model_results_dir(model: str, task: str, mode: str = None, ctx_size: int
         if mode == "gpu" and ctx_size is not None:
             path = os.path.join(path, f"ctx-{ctx_size}")
     return path
+
+
+# Evaluator scores saved next to metrics.json so analysis scripts can join them per run
+EVALUATION_FILENAME = "evaluation.json"
+
+
+def save_evaluation(results_dir: str, task: str, result: dict):
+    """Write an evaluator's result for one run to {results_dir}/evaluation.json.
+
+    `result` is the evaluator's per-model dict; scores["total"] is on a 0-10 scale.
+    """
+    scores = result.get("scores", {})
+    evaluation = {
+        "task": task,
+        "evaluated_at": datetime.now().isoformat(),
+        "status": result.get("status"),
+        "total": scores.get("total", 0),
+        "letter_grade": scores.get("letter_grade"),
+        "scores": scores,
+    }
+    if "classification" in result:
+        evaluation["classification"] = result["classification"].get("classification")
+    with open(os.path.join(results_dir, EVALUATION_FILENAME), "w", encoding="utf-8") as f:
+        json.dump(evaluation, f, indent=2)
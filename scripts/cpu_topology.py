@@ -0,0 +1,142 @@
+"""CPU / NUMA topology discovery.
+
+On Linux the topology is read from /sys (sockets, physical cores, SMT siblings, NUMA nodes
+with their CPUs and memory). Elsewhere it falls back to psutil core counts with a single
+node holding every CPU, so callers never need to special-case the platform.
+"""
+
+import glob
+import os
+import re
+
+import psutil
+
+SYS_CPU = "/sys/devices/system/cpu"
+SYS_NODE = "/sys/devices/system/node"
+
+
+def parse_cpulist(text: str) -> list[int]:
+    """Parse a kernel/taskset style CPU list ("0-3,8,10-11") into sorted CPU ids."""
+    cpus = set()
+    for part in text.strip().split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            cpus.update(range(int(lo), int(hi) + 1))
+        else:
+            cpus.add(int(part))
+    return sorted(cpus)
+
+
+def format_cpulist(cpus: list[int]) -> str:
+    """Inverse of parse_cpulist: [0, 1, 2, 3, 8] -> "0-3,8"."""
+    ranges = []
+    for cpu in sorted(set(cpus)):
+        if ranges and cpu == ranges[-1][1] + 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ",".join(f"{lo}-{hi}" if hi > lo else f"{lo}" for lo, hi in ranges)
+
+
+def _read(path: str) -> str | None:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _sysfs_numa_nodes() -> list[dict]:
+    nodes = []
+    for node_dir in sorted(glob.glob(os.path.join(SYS_NODE, "node[0-9]*")),
+                           key=lambda p: int(re.search(r"(\d+)$", p).group(1))):
+        node_id = int(re.search(r"(\d+)$", node_dir).group(1))
+        cpulist = _read(os.path.join(node_dir, "cpulist"))
+        if cpulist is None:
+            continue
+        memory_mb = None
+        meminfo = _read(os.path.join(node_dir, "meminfo")) or ""
+        match = re.search(r"MemTotal:\s+(\d+)\s+kB", meminfo)
+        if match:
+            memory_mb = round(int(match.group(1)) / 1024)
+        cpus = parse_cpulist(cpulist)
+        if cpus:
+            nodes.append({"node": node_id, "cpus": cpus, "memory_mb": memory_mb})
+    return nodes
+
+
+def _sysfs_cores() -> dict[int, tuple[int, int]]:
+    """cpu id -> (package id, core id) for every online CPU exposing topology."""
+    cores = {}
+    for cpu_dir in glob.glob(os.path.join(SYS_CPU, "cpu[0-9]*")):
+        cpu = int(re.search(r"(\d+)$", cpu_dir).group(1))
+        package = _read(os.path.join(cpu_dir, "topology", "physical_package_id"))
+        core = _read(os.path.join(cpu_dir, "topology", "core_id"))
+        if package is not None and core is not None:
+            cores[cpu] = (int(package), int(core))
+    return cores
+
+
+def discover_topology() -> dict:
+    """Discover sockets, cores, SMT and NUMA nodes.
+
+    Returns a dict with logical_cores, physical_cores, sockets, smt_threads_per_core,
+    numa_nodes ([{node, cpus, memory_mb}]), and source ("sysfs" or "psutil").
+    """
+    logical = os.cpu_count() or 1
+    physical = psutil.cpu_count(logical=False) or logical
+    cores = _sysfs_cores()
+    nodes = _sysfs_numa_nodes()
+
+    if cores:
+        sockets = len({pkg for pkg, _ in cores.values()})
+        physical = len(set(cores.values()))
+        source = "sysfs"
+    else:
+        sockets = 1
+        source = "psutil"
+    if not nodes:
+        nodes = [{"node": 0, "cpus": list(range(logical)), "memory_mb": None}]
+
+    return {
+        "logical_cores": logical,
+        "physical_cores": physical,
+        "sockets": sockets,
+        "smt_threads_per_core": max(1, round(logical / physical)) if physical else 1,
+        "numa_nodes": nodes,
+        "source": source,
+    }
+
+
+def topology_for_metrics(topology: dict) -> dict:
+    """Compact form for metrics.json (CPU lists as "0-15,32-47" strings)."""
+    return {
+        **topology,
+        "numa_nodes": [
+            {**node, "cpus": format_cpulist(node["cpus"])} for node in topology["numa_nodes"]
+        ],
+    }
+
+
+def node_cpus(topology: dict, node: int) -> list[int]:
+    """CPUs of a NUMA node; ValueError if the node doesn't exist."""
+    for n in topology["numa_nodes"]:
+        if n["node"] == node:
+            return n["cpus"]
+    raise ValueError(f"NUMA node {node} not found (available: {[n['node'] for n in topology['numa_nodes']]})")
+
+
+def monitor_cpu_groups(topology: dict, pinned_cpus: list[int] | None = None) -> dict[str, list[int]]:
+    """CPU groups for GPUMonitor per-group utilization: one per NUMA node, plus the pinned set."""
+    groups = {}
+    if len(topology["numa_nodes"]) > 1:
+        groups = {f"node{n['node']}": n["cpus"] for n in topology["numa_nodes"]}
+    if pinned_cpus:
+        groups["pinned"] = sorted(pinned_cpus)
+        others = [c for c in range(topology["logical_cores"]) if c not in set(pinned_cpus)]
+        if others:
+            groups["unpinned"] = others
+    return groups
@@ -0,0 +1,267 @@
+"""Sandboxed, asynchronous execution of generated engine code.
+
+The engine task's post-processing runs model-written code (trading_engine.py). Running
+it inline made the next model wait for it, and nothing bounded what it could do.
+EngineExecutor runs those scripts on a small worker pool while benchmarking continues.
+Each script runs in its own process group inside the results directory, with these
+resource limits:
+  - address space (RLIMIT_AS), CPU seconds (RLIMIT_CPU), output file size (RLIMIT_FSIZE)
+  - lowered scheduling priority, so a busy engine disturbs the next benchmark less
+  - a wall-clock timeout that kills the whole process group
+
+rlimits need the POSIX `resource` module. On Windows only the timeout applies, and the
+result records limits as not enforced. Runtime, CPU time and peak RSS (sampled with
+psutil across the process tree) go into engine_result.json next to metrics.json.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+
+import psutil
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from config import ENGINE_CPU_LIMIT_S, ENGINE_MEMORY_LIMIT_MB, ENGINE_TIMEOUT_S, HISTORICAL_CSV_PATH
+
+ENGINE_RESULT_FILENAME = "engine_result.json"
+RSS_SAMPLE_INTERVAL_S = 0.05
+MAX_OUTPUT_FILE_MB = 512
+NICE_INCREMENT = 10
+
+
+@dataclass
+class SandboxLimits:
+    """Resource limits for one sandboxed run."""
+    memory_mb: int = ENGINE_MEMORY_LIMIT_MB
+    cpu_s: int = ENGINE_CPU_LIMIT_S
+    timeout_s: float = ENGINE_TIMEOUT_S
+    max_file_mb: int = MAX_OUTPUT_FILE_MB
+
+
+# Applies the limits and then execs the real command. preexec_fn would do the same but is
+# unsafe in a process with other threads (the executor pool, GPU monitor, pulls).
+_LIMITS_LAUNCHER = """
+import os, resource, sys
+mem, cpu, fsize, nice = (int(v) for v in sys.argv[1:5])
+resource.setrlimit(resource.RLIMIT_AS, (mem, mem))
+resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 5))
+resource.setrlimit(resource.RLIMIT_FSIZE, (fsize, fsize))
+os.nice(nice)
+os.execv(sys.argv[5], sys.argv[5:])
+"""
+
+
+def _limited_command(cmd: list[str], limits: SandboxLimits) -> list[str]:
+    """Wrap cmd so it runs under the rlimits (POSIX only)."""
+    return [
+        sys.executable, "-c", _LIMITS_LAUNCHER,
+        str(limits.memory_mb * 1024 * 1024), str(limits.cpu_s),
+        str(limits.max_file_mb * 1024 * 1024), str(NICE_INCREMENT),
+        *cmd,
+    ]
+
+
+def _tree_rss(proc: psutil.Process) -> tuple[int, float]:
+    """(RSS bytes, CPU seconds) of a process and all its children."""
+    rss, cpu = 0, 0.0
+    try:
+        procs = [proc] + proc.children(recursive=True)
+    except psutil.Error:
+        return 0, 0.0
+    for p in procs:
+        try:
+            rss += p.memory_info().rss
+            times = p.cpu_times()
+            cpu += times.user + times.system
+        except psutil.Error:
+            continue
+    return rss, cpu
+
+
+def _kill_tree(popen: subprocess.Popen):
+    try:
+        if os.name == "posix":
+            os.killpg(popen.pid, 9)
+        else:
+            for child in psutil.Process(popen.pid).children(recursive=True):
+                child.kill()
+            popen.kill()
+    except (ProcessLookupError, psutil.Error, OSError):
+        pass
+
+
+def start_sandboxed(cmd: list[str], cwd: str, limits: SandboxLimits | None = None, **popen_kwargs) -> subprocess.Popen:
+    """Start a command under the rlimits in its own process group (for long-running servers).
+
+    The wall-clock timeout is not applied here; stop it with stop_sandboxed().
+    """
+    limits = limits or SandboxLimits()
+    if resource is not None:
+        cmd = _limited_command(cmd, limits)
+        popen_kwargs["start_new_session"] = True
+    return subprocess.Popen(cmd, cwd=cwd, **popen_kwargs)
+
+
+def stop_sandboxed(popen: subprocess.Popen, grace_s: float = 5.0):
+    """Terminate a process started by start_sandboxed(), killing its process group if it lingers."""
+    if popen.poll() is None:
+        popen.terminate()
+        try:
+            popen.wait(timeout=grace_s)
+        except subprocess.TimeoutExpired:
+            pass
+    _kill_tree(popen)
+    popen.wait()
+
+
+def run_sandboxed(cmd: list[str], cwd: str, limits: SandboxLimits | None = None) -> dict:
+    """Run a command under the sandbox limits and measure it.
+
+    Returns status ("ok", "failed", "timeout" or "error"), exit_code, runtime_s,
+    cpu_time_s, peak_rss_mb, the tails of stdout/stderr, and the limits applied.
+    """
+    limits = limits or SandboxLimits()
+    enforced = resource is not None
+    result = {
+        "command": " ".join(cmd),
+        "limits": {**asdict(limits), "rlimits_enforced": enforced},
+    }
+
+    start = time.perf_counter()
+    try:
+        popen = start_sandboxed(cmd, cwd, limits, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                text=True, errors="replace")
+    except OSError as e:
+        return {**result, "status": "error", "error": str(e)}
+
+    # Drain pipes in the background so a chatty script can't block on a full pipe
+    output = {"stdout": "", "stderr": ""}
+
+    def drain(name, stream):
+        output[name] = stream.read()
+
+    readers = [threading.Thread(target=drain, args=(n, s), daemon=True)
+               for n, s in (("stdout", popen.stdout), ("stderr", popen.stderr))]
+    for t in readers:
+        t.start()
+
+    peak_rss, cpu_s = 0, 0.0
+    timed_out = False
+    try:
+        ps_proc = psutil.Process(popen.pid)
+    except psutil.Error:
+        ps_proc = None
+    while popen.poll() is None:
+        if ps_proc is not None:
+            rss, cpu = _tree_rss(ps_proc)
+            peak_rss, cpu_s = max(peak_rss, rss), max(cpu_s, cpu)
+        if time.perf_counter() - start > limits.timeout_s:
+            timed_out = True
+            _kill_tree(popen)
+            break
+        time.sleep(RSS_SAMPLE_INTERVAL_S)
+    popen.wait()
+    runtime = time.perf_counter() - start
+    for t in readers:
+        t.join(timeout=5)
+
+    if timed_out:
+        status = "timeout"
+    elif popen.returncode == 0:
+        status = "ok"
+    else:
+        status = "failed"
+    result.update({
+        "status": status,
+        "exit_code": popen.returncode,
+        "runtime_s": round(runtime, 3),
+        "cpu_time_s": round(cpu_s, 3),
+        "peak_rss_mb": round(peak_rss / 1024 / 1024, 1),
+        "stdout_tail": output["stdout"][-2000:],
+        "stderr_tail": output["stderr"][-4000:],
+    })
+    # A negative exit code on POSIX is the signal that killed it (e.g. SIGXCPU, SIGKILL)
+    if popen.returncode is not None and popen.returncode < 0:
+        result["signal"] = -popen.returncode
+    return result
+
+
+def _write_failure(results_dir: str, title: str, body: str):
+    with open(os.path.join(results_dir, "failure.md"), "w", encoding="utf-8") as f:
+        f.write(f"# {title}\n\n{body}")
+
+
+def execute_engine(model: str, results_dir: str, limits: SandboxLimits | None = None) -> dict:
+    """Run trading_engine.py in results_dir and write engine_result.json (and failure.md on failure)."""
+    limits = limits or SandboxLimits()
+    run = run_sandboxed([sys.executable, "trading_engine.py"], cwd=results_dir, limits=limits)
+    run["model"] = model
+    run["dataset"] = os.path.basename(HISTORICAL_CSV_PATH)
+    run["output_csv"] = os.path.exists(os.path.join(results_dir, "output.csv"))
+    run["finished_at"] = datetime.now().isoformat()
+
+    if run["status"] == "timeout":
+        _write_failure(results_dir, "Engine Task Execution Failure",
+                       f"**Reason:** Execution timed out after {limits.timeout_s:g} seconds\n")
+    elif run["status"] == "failed":
+        _write_failure(results_dir, "Engine Task Execution Failure",
+                       f"**Exit Code:** {run['exit_code']}\n\n## stderr:\n```\n{run['stderr_tail']}\n```\n")
+    elif run["status"] == "error":
+        _write_failure(results_dir, "Engine Task Execution Failure", f"**Error:** {run['error']}\n")
+
+    with open(os.path.join(results_dir, ENGINE_RESULT_FILENAME), "w", encoding="utf-8") as f:
+        json.dump(run, f, indent=2)
+    return run
+
+
+def describe_engine_result(run: dict) -> str:
+    """One-line summary for console output."""
+    if run["status"] == "ok":
+        csv = "output.csv written" if run.get("output_csv") else "no output.csv"
+        return f"ok in {run['runtime_s']}s, peak RSS {run['peak_rss_mb']} MB, {csv}"
+    if run["status"] == "failed":
+        return f"exit code {run['exit_code']} after {run['runtime_s']}s"
+    if run["status"] == "timeout":
+        return f"timed out after {run['runtime_s']}s"
+    return f"error: {run.get('error')}"
+
+
+class EngineExecutor:
+    """Worker pool that runs engine scripts while the benchmark moves on to the next model."""
+
+    def __init__(self, max_workers: int = 1, limits: SandboxLimits | None = None):
+        self.limits = limits or SandboxLimits()
+        self._pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="engine")
+        self._futures: list[tuple[str, Future]] = []
+
+    def submit(self, model: str, results_dir: str) -> Future:
+        future = self._pool.submit(self._run, model, results_dir)
+        self._futures.append((model, future))
+        return future
+
+    def _run(self, model: str, results_dir: str) -> dict:
+        try:
+            run = execute_engine(model, results_dir, self.limits)
+        except Exception as e:  # never lose a worker to an unexpected error
+            run = {"model": model, "status": "error", "error": str(e)}
+        print(f"  [engine] {model}: {describe_engine_result(run)}", flush=True)
+        return run
+
+    def pending(self) -> int:
+        return sum(1 for _, f in self._futures if not f.done())
+
+    def wait_all(self) -> list[dict]:
+        """Block until every submitted run has finished; results in submission order."""
+        results = [f.result() for _, f in self._futures]
+        self._pool.shutdown(wait=True)
+        return results
@@ -12,7 +12,8 @@ Scoring Criteria:
 - Tool Coverage (15%): How many of 8 tools were called? (threshold: 6)
 - Call Ordering (15%): Data-dependent calls in correct order per portfolio?
 - Argument Correctness (15%): Valid portfolio IDs, symbol lists, risk config values?
-- Portfolio Coverage (15%): All 3 portfolios processed?
+- Portfolio Coverage (15%): All 3 portfolios processed? (all scenario portfolios for
+  runs with a scenario.json from --chat-scaling; their risk outcomes are checked too)
 - Final Response (10%): Useful text summary at the end?
 - Error Recovery (10%): Continued processing after any tool errors?
 
@@ -31,7 +32,8 @@ from typing import Any
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from config import MODELS_DIR, REPORTS_DIR, TASKS, dirname_to_model, get_model_meta
+from config import MODELS_DIR, REPORTS_DIR, TASKS, dirname_to_model, get_model_meta, save_evaluation
+from results_io import load_json, result_exists
 
 ALL_TOOLS = {
     "get_stock_prices",
@@ -68,18 +70,19 @@ class AgenticChatEvaluator:
         self.mode = mode
         self.ctx_size = ctx_size
 
-    def evaluate_model(self, model_dir_name: str, ctx: int | None = None) -> dict:
-        """Evaluate a single model's agentic-chat transcript."""
+    def evaluate_model(self, model_dir_name: str, ctx: int | None = None, result_path: Path | None = None) -> dict:
+        """Evaluate a single model's agentic-chat transcript (from result_path when given)."""
         print(f"\nEvaluating {model_dir_name}...")
 
         # Build path to results
-        result_path = self.models_dir / model_dir_name / "results" / "agentic-chat"
-        if self.mode == "gpu" and ctx:
-            result_path = result_path / "gpu" / f"ctx-{ctx}"
-        else:
-            result_path = result_path / self.mode
+        if result_path is None:
+            result_path = self.models_dir / model_dir_name / "results" / "agentic-chat"
+            if self.mode == "gpu" and ctx:
+                result_path = result_path / "gpu" / f"ctx-{ctx}"
+            else:
+                result_path = result_path / self.mode
+        result_path = Path(result_path)
 
-        transcript_file = result_path / "transcript.json"
         metrics_file = result_path / "metrics.json"
 
         result = {
@@ -90,14 +93,13 @@ class AgenticChatEvaluator:
             "details": {},
         }
 
-        if not transcript_file.exists():
+        if not result_exists(result_path, "transcript.json"):
             result["status"] = "No transcript.json found"
             result["scores"]["total"] = 0
             return result
 
         try:
-            with open(transcript_file, "r", encoding="utf-8") as f:
-                raw = json.load(f)
+            raw = load_json(result_path, "transcript.json")
             # Handle both old format (plain array) and new enriched format (object)
             if isinstance(raw, list):
                 messages = raw
@@ -118,6 +120,17 @@ class AgenticChatEvaluator:
             except (json.JSONDecodeError, OSError):
                 pass
 
+        # Generated scenarios (--chat-scaling) carry their own portfolios and expected outcomes
+        scenario = None
+        scenario_file = result_path / "scenario.json"
+        if scenario_file.exists():
+            try:
+                with open(scenario_file, "r", encoding="utf-8") as f:
+                    scenario = json.load(f)
+            except (json.JSONDecodeError, OSError):
+                pass
+        required = set(scenario["required_portfolios"]) if scenario else REQUIRED_PORTFOLIOS
+
         # Extract tool calls from messages
         tool_calls = self._extract_tool_calls(messages)
 
@@ -129,8 +142,8 @@ class AgenticChatEvaluator:
         result["scores"]["valid_tool_calls"] = self._score_valid_tool_calls(tool_calls, messages, result)
         result["scores"]["tool_coverage"] = self._score_tool_coverage(tool_calls, result)
         result["scores"]["call_ordering"] = self._score_call_ordering(tool_calls, result)
-        result["scores"]["argument_correctness"] = self._score_argument_correctness(tool_calls, result)
-        result["scores"]["portfolio_coverage"] = self._score_portfolio_coverage(tool_calls, messages, result)
+        result["scores"]["argument_correctness"] = self._score_argument_correctness(tool_calls, result, required)
+        result["scores"]["portfolio_coverage"] = self._score_portfolio_coverage(tool_calls, messages, result, required)
         result["scores"]["final_response"] = self._score_final_response(messages, result)
         result["scores"]["error_recovery"] = self._score_error_recovery(tool_calls, messages, result)
 
@@ -152,6 +165,9 @@ class AgenticChatEvaluator:
         result["scores"]["total"] = round(total, 2)
         result["scores"]["letter_grade"] = self._get_letter_grade(total)
 
+        if scenario:
+            result["details"]["risk_outcomes"] = self._check_risk_outcomes(tool_calls, scenario["expected"], result)
+
         # Include chat metrics summary if available
         if "chat" in metrics:
             result["details"]["chat_metrics"] = metrics["chat"]
@@ -188,6 +204,7 @@ class AgenticChatEvaluator:
                     pressure_note += " -- tool definitions may have been truncated"
                 result["issues"].append(pressure_note)
 
+        save_evaluation(str(result_path), "agentic-chat", result)
         return result
 
     def _extract_tool_calls(self, messages: list[dict]) -> list[dict]:
@@ -334,7 +351,8 @@ class AgenticChatEvaluator:
 
         return score
 
-    def _score_argument_correctness(self, tool_calls: list[dict], result: dict) -> float:
+    def _score_argument_correctness(self, tool_calls: list[dict], result: dict,
+                                    required: set[str] = REQUIRED_PORTFOLIOS) -> float:
         """Score: Were arguments correct? (15%, 0-10 scale)"""
         if not tool_calls:
             return 0.0
@@ -357,7 +375,7 @@ class AgenticChatEvaluator:
             if name == "get_portfolio_holdings":
                 checks += 1
                 pid = args.get("portfolio_id", "")
-                if pid in REQUIRED_PORTFOLIOS:
+                if pid in required:
                     correct += 1
                 else:
                     issues.append(f"get_portfolio_holdings: invalid portfolio_id '{pid}'")
@@ -413,8 +431,9 @@ class AgenticChatEvaluator:
 
         return score
 
-    def _score_portfolio_coverage(self, tool_calls: list[dict], messages: list[dict], result: dict) -> float:
-        """Score: Were all 3 portfolios processed? (15%, 0-10 scale)"""
+    def _score_portfolio_coverage(self, tool_calls: list[dict], messages: list[dict], result: dict,
+                                  required: set[str] = REQUIRED_PORTFOLIOS) -> float:
+        """Score: Were all required portfolios (3 in the fixed task) processed? (15%, 0-10 scale)"""
         portfolios_seen = set()
 
         for tc in tool_calls:
@@ -427,37 +446,36 @@ class AgenticChatEvaluator:
 
             # Check arguments for portfolio IDs
             pid = args.get("portfolio_id", "")
-            if pid in REQUIRED_PORTFOLIOS:
+            if pid in required:
                 portfolios_seen.add(pid)
 
             # Also check nested data for portfolio references
             for val in args.values():
-                if isinstance(val, str) and val in REQUIRED_PORTFOLIOS:
+                if isinstance(val, str) and val in required:
                     portfolios_seen.add(val)
                 elif isinstance(val, dict):
                     for v2 in val.values():
-                        if isinstance(v2, str) and v2 in REQUIRED_PORTFOLIOS:
+                        if isinstance(v2, str) and v2 in required:
                             portfolios_seen.add(v2)
 
         # Also scan tool results and assistant text for portfolio IDs
+        id_pattern = re.compile(r"PORT-\d+")
         for msg in messages:
             content = msg.get("content", "")
             if isinstance(content, str):
-                for pid in REQUIRED_PORTFOLIOS:
-                    if pid in content:
-                        portfolios_seen.add(pid)
+                portfolios_seen.update(pid for pid in id_pattern.findall(content) if pid in required)
 
-        coverage = len(portfolios_seen & REQUIRED_PORTFOLIOS)
-        score = round((coverage / 3) * 10.0, 2)
+        coverage = len(portfolios_seen & required)
+        score = round((coverage / len(required)) * 10.0, 2)
 
         result["details"]["portfolio_coverage"] = {
-            "portfolios_processed": sorted(portfolios_seen & REQUIRED_PORTFOLIOS),
-            "missing": sorted(REQUIRED_PORTFOLIOS - portfolios_seen),
+            "portfolios_processed": sorted(portfolios_seen & required),
+            "missing": sorted(required - portfolios_seen),
         }
 
-        if coverage < 3:
+        if coverage < len(required):
             result["issues"].append(
-                f"Only {coverage}/3 portfolios processed"
+                f"Only {coverage}/{len(required)} portfolios processed"
             )
 
         return score
@@ -602,6 +620,33 @@ class AgenticChatEvaluator:
         return {"classification": "no_tool_support",
                 "description": f"Generated text with no tool references"}
 
+    def _check_risk_outcomes(self, tool_calls: list[dict], expected: dict[str, dict], result: dict) -> dict:
+        """Compare each portfolio's last risk check with the scenario's expected outcome (not weighted)."""
+        correct, wrong = [], []
+        for pid, calls in self._group_calls_by_portfolio(tool_calls).items():
+            if pid not in expected:
+                continue
+            checks = [tc for tc in calls if tc["name"] == "check_risk_threshold" and tc["result"]]
+            if not checks:
+                continue
+            try:
+                outcome = json.loads(checks[-1]["result"])
+            except json.JSONDecodeError:
+                continue
+            if isinstance(outcome, dict) and outcome.get("risk_level") == expected[pid]["risk_level"]:
+                correct.append(pid)
+            else:
+                wrong.append(pid)
+
+        if wrong:
+            result["issues"].append(f"{len(wrong)} portfolio(s) with an unexpected risk outcome")
+        return {
+            "expected": len(expected),
+            "correct": len(correct),
+            "wrong": sorted(wrong)[:10],
+            "unchecked": len(expected) - len(correct) - len(wrong),
+        }
+
     def _group_calls_by_portfolio(self, tool_calls: list[dict]) -> dict[str, list[dict]]:
         """Group tool calls by portfolio ID for ordering analysis.
 
@@ -657,20 +702,20 @@ class AgenticChatEvaluator:
                 continue
 
             if self.mode == "gpu" and self.ctx_size:
-                f = model_dir / "results" / "agentic-chat" / "gpu" / f"ctx-{self.ctx_size}" / "transcript.json"
-                if f.exists():
+                d = model_dir / "results" / "agentic-chat" / "gpu" / f"ctx-{self.ctx_size}"
+                if result_exists(d, "transcript.json"):
                     model_entries.append((model_dir.name, self.ctx_size))
             elif self.mode == "gpu" and not self.ctx_size:
                 gpu_dir = model_dir / "results" / "agentic-chat" / "gpu"
                 if gpu_dir.is_dir():
                     for ctx_dir in sorted(gpu_dir.iterdir()):
                         if ctx_dir.is_dir() and ctx_dir.name.startswith("ctx-"):
-                            if (ctx_dir / "transcript.json").exists():
+                            if result_exists(ctx_dir, "transcript.json"):
                                 ctx = ctx_dir.name.replace("ctx-", "")
                                 model_entries.append((model_dir.name, ctx))
             else:
-                f = model_dir / "results" / "agentic-chat" / self.mode / "transcript.json"
-                if f.exists():
+                d = model_dir / "results" / "agentic-chat" / self.mode
+                if result_exists(d, "transcript.json"):
                     model_entries.append((model_dir.name, None))
 
         print(f"Found {len(model_entries)} model(s) to evaluate:")
@@ -32,6 +32,10 @@ from datetime import datetime
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from config import save_evaluation
+from markdown_blocks import PYTHON_LANGUAGES, parse_markdown
+from results_io import read_text, result_exists
+
 
 class AgenticEvaluator:
     def __init__(self, mode="cpu", ctx_size=None):
@@ -76,7 +80,7 @@ class AgenticEvaluator:
         else:
             output_file = model_dir / self.mode / "output.md"
 
-        if not output_file.exists():
+        if not result_exists(output_file.parent, output_file.name):
             return {
                 'model': model_name,
                 'status': 'No output.md found',
@@ -157,6 +161,7 @@ class AgenticEvaluator:
         result['scores']['total'] = round(total_score, 2)
         result['scores']['letter_grade'] = self._get_letter_grade(total_score)
 
+        save_evaluation(str(output_file.parent), 'agentic', result)
         return result
 
     def _parse_output_sections(self, output_file: Path, result: Dict) -> Dict[str, str]:
@@ -169,54 +174,29 @@ class AgenticEvaluator:
         - Code blocks that appear before section headers (code-first outputs)
         """
         try:
-            with open(output_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = read_text(output_file.parent, output_file.name)
 
             sections = {}
-
-            # Build a list of code fence ranges so we can ignore # lines inside them
-            fence_ranges = []
-            for m in re.finditer(r'```[^\n]*\n.*?```', content, re.DOTALL):
-                fence_ranges.append((m.start(), m.end()))
-
-            def is_in_fence(pos):
-                return any(s <= pos < e for s, e in fence_ranges)
-
-            # Find positions of all real markdown headers (not inside code fences)
-            real_header_positions = []
-            for m in re.finditer(r'^\s*#{1,4}\s+', content, re.MULTILINE):
-                if not is_in_fence(m.start()):
-                    real_header_positions.append(m.start())
+            doc = parse_markdown(content)
 
             # Flexible header pattern:
-            # - Any header level: #{1,4}
+            # - Any header level up to ####
             # - Optional "Section N:" prefix (non-capturing)
             # - Keyword match
-            hdr = r'^\s*#{1,4}\s+(?:Section\s*\d+[:\s]*)?\s*'
-
             def best_match(keywords):
-                """Find the header matching keywords with the most content."""
-                pattern = hdr + r'(' + keywords + r')\b[^\n]*'
-                best_content = None
+                """Find the header matching keywords with the most content (heading, text)."""
+                best = (None, None)
                 best_len = -1
-                for m in re.finditer(pattern, content, re.IGNORECASE | re.MULTILINE):
-                    if is_in_fence(m.start()):
-                        continue
-                    # Find next real header after this one
-                    section_end = len(content)
-                    for h_pos in real_header_positions:
-                        if h_pos > m.end():
-                            section_end = h_pos
-                            break
-                    section_text = content[m.end():section_end].strip()
+                for h in doc.find_headings(r'(?:Section\s*\d+[:\s]*)?\s*(' + keywords + r')\b', max_level=4):
+                    section_text = doc.section_text(h, max_level=4)
                     if len(section_text) > best_len:
-                        best_content = section_text
+                        best = (h, section_text)
                         best_len = len(section_text)
-                return best_content
+                return best
 
-            plan_text = best_match(r'Execution Plan|Plan|Step-by-Step Plan')
-            impl_text = best_match(r'Implementation|Code|Python Implementation')
-            just_text = best_match(r'Design Justification|Justification|Reasoning')
+            _, plan_text = best_match(r'Execution Plan|Plan|Step-by-Step Plan')
+            impl_heading, impl_text = best_match(r'Implementation|Code|Python Implementation')
+            _, just_text = best_match(r'Design Justification|Justification|Reasoning')
 
             if plan_text:
                 sections['plan'] = plan_text
@@ -224,10 +204,12 @@ class AgenticEvaluator:
             if impl_text:
                 sections['implementation'] = impl_text
                 # Extract code from markdown code blocks within implementation section
-                code_match = re.search(r'```(?:python)?\n(.*?)```', impl_text, re.DOTALL)
-                if code_match:
-                    sections['code'] = code_match.group(1).strip()
-                elif '```' not in impl_text:
+                impl_blocks = doc.blocks_between(impl_heading.end, doc.section_end(impl_heading, max_level=4),
+                                                 closed_only=False)
+                code_blocks = [blk for blk in impl_blocks if blk.closed and (blk.is_python or not blk.language)]
+                if code_blocks:
+                    sections['code'] = code_blocks[0].code.strip()
+                elif not impl_blocks:
                     # No code fences at all - text itself might be raw code
                     if re.search(r'^\s*(?:def |import |from |class )', impl_text, re.MULTILINE):
                         sections['code'] = impl_text
@@ -238,7 +220,7 @@ class AgenticEvaluator:
             # Fallback: if no code found in implementation section, search entire document
             # for code blocks (handles code-first outputs like gemma3, llama3.1)
             if 'code' not in sections:
-                all_code_blocks = re.findall(r'```(?:python)?\n(.*?)```', content, re.DOTALL)
+                all_code_blocks = [blk.code for blk in doc.blocks(PYTHON_LANGUAGES + ("",))]
                 if all_code_blocks:
                     # Use the largest code block as the implementation
                     largest_block = max(all_code_blocks, key=len).strip()
@@ -609,7 +591,7 @@ from tools_reference import (
             if model_dir.is_dir():
                 if self.mode == "gpu" and self.ctx_size:
                     output_file = model_dir / "results" / "agentic" / "gpu" / f"ctx-{self.ctx_size}" / "output.md"
-                    if output_file.exists():
+                    if result_exists(output_file.parent, output_file.name):
                         model_entries.append((model_dir.name, self.ctx_size))
                 elif self.mode == "gpu" and not self.ctx_size:
                     # Scan all ctx-* subdirectories
@@ -618,12 +600,12 @@ from tools_reference import (
                         for ctx_dir in sorted(gpu_dir.iterdir()):
                             if ctx_dir.is_dir() and ctx_dir.name.startswith("ctx-"):
                                 output_file = ctx_dir / "output.md"
-                                if output_file.exists():
+                                if result_exists(output_file.parent, output_file.name):
                                     ctx = ctx_dir.name.replace("ctx-", "")
                                     model_entries.append((model_dir.name, ctx))
                 else:
                     output_file = model_dir / "results" / "agentic" / self.mode / "output.md"
-                    if output_file.exists():
+                    if result_exists(output_file.parent, output_file.name):
                         model_entries.append((model_dir.name, None))
 
         print(f"Found {len(model_entries)} models to evaluate:")
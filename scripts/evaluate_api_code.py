@@ -0,0 +1,628 @@
+#!/usr/bin/env python3
+"""
+API Task Evaluation Script
+
+Evaluates each model's Weather Station API (requirements/api.md) by running it.
+weather_api.py and test_weather_api.py are extracted from output.md into
+{results_dir}/api_app/ and run in an isolated virtualenv. The virtualenv is built
+offline from a local wheel cache, so no package index is needed at evaluation time.
+
+Per model:
+- Model Tests (30%): the model's own pytest suite, scored by pass rate
+- Spec Checks (40%): the live app (uvicorn) probed against every endpoint rule in the spec
+- Reliability (30%): share of requests without errors during the load test
+
+The load test is a local multi-threaded HTTP generator with a mixed workload: station
+and temperature-range queries, stats, and create+delete pairs that keep storage size
+steady. It reports throughput (req/s), p50/p99 latency and errors. The generator shares
+the machine with the server, so compare throughput only between runs on the same host.
+
+One-time setup (needs network), then evaluate offline:
+    python scripts/evaluate_api_code.py --download-wheels
+    python scripts/evaluate_api_code.py --mode cpu
+    python scripts/evaluate_api_code.py --mode gpu --ctx-size 16384 --duration 20 --concurrency 32
+"""
+
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import requests
+
+from config import API_EVAL_PACKAGES, API_VENV_DIR, API_WHEELHOUSE_DIR, save_evaluation
+from engine_executor import SandboxLimits, run_sandboxed, start_sandboxed, stop_sandboxed
+from markdown_blocks import parse_markdown
+from results_io import read_text, result_exists
+
+APP_FILE = "weather_api.py"
+TEST_FILE = "test_weather_api.py"
+APP_DIRNAME = "api_app"
+API_EVAL_FILENAME = "api_eval.json"
+SERVER_START_TIMEOUT_S = 20
+
+WEIGHTS = {
+    "model_tests": 0.30,
+    "spec_checks": 0.40,
+    "reliability": 0.30,
+}
+
+# Load-test operation mix (weights); "write" is a POST followed by a DELETE of the created reading
+LOAD_MIX = {"list_station": 0.4, "list_range": 0.2, "stats": 0.2, "write": 0.2}
+LOAD_STATIONS = [f"LOAD-{i:02d}" for i in range(10)]
+LOAD_SEED_READINGS = 200
+
+_FILENAME_RE = re.compile(r"\b(test_weather_api|weather_api)\.py\b")
+
+
+def extract_files(content: str) -> dict[str, str]:
+    """Map weather_api.py / test_weather_api.py to their code blocks in output.md.
+
+    A block belongs to the file named in the lines just before its fence (a header,
+    bold label or sentence) or in its first line (# weather_api.py). Unlabelled blocks
+    fall back to their content: "def test_" marks the tests, "FastAPI(" the app. When
+    several blocks map to one file, the largest wins.
+    """
+    files: dict[str, str] = {}
+    prev_end = 0
+    for block in parse_markdown(content).blocks():
+        code = block.code.strip()
+        lead = content[prev_end:block.start].strip().splitlines()[-3:]
+        prev_end = block.end
+        names = _FILENAME_RE.findall("\n".join(lead))
+        first_line = _FILENAME_RE.search(code.splitlines()[0]) if code else None
+        if first_line:
+            name = first_line.group(0)
+        elif names:
+            name = names[-1] + ".py"
+        elif "def test_" in code:
+            name = TEST_FILE
+        elif "FastAPI(" in code:
+            name = APP_FILE
+        else:
+            continue
+        if len(code) > len(files.get(name, "")):
+            files[name] = code
+    return files
+
+
+def venv_python(venv_dir: str = API_VENV_DIR) -> str:
+    if os.name == "nt":
+        return os.path.join(venv_dir, "Scripts", "python.exe")
+    return os.path.join(venv_dir, "bin", "python")
+
+
+def download_wheels(wheelhouse: str = API_WHEELHOUSE_DIR):
+    """Fill the wheel cache (needs network). Run once per Python version/platform."""
+    os.makedirs(wheelhouse, exist_ok=True)
+    print(f"Downloading {', '.join(API_EVAL_PACKAGES)} into {wheelhouse}...")
+    subprocess.run([sys.executable, "-m", "pip", "download", "-d", wheelhouse, *API_EVAL_PACKAGES], check=True)
+
+
+def ensure_venv(wheelhouse: str = API_WHEELHOUSE_DIR, venv_dir: str = API_VENV_DIR) -> str:
+    """Create (or reuse) the evaluation virtualenv, installing offline from the wheel cache.
+
+    Returns the venv's python. Raises RuntimeError when the wheel cache is missing or incomplete.
+    """
+    marker = os.path.join(venv_dir, "api-eval-packages.json")
+    python = venv_python(venv_dir)
+    if os.path.exists(python) and os.path.exists(marker):
+        with open(marker, "r", encoding="utf-8") as f:
+            if json.load(f) == sorted(API_EVAL_PACKAGES):
+                return python
+
+    if not os.path.isdir(wheelhouse) or not os.listdir(wheelhouse):
+        raise RuntimeError(f"Wheel cache {wheelhouse} is empty. Run with --download-wheels once (needs network).")
+    print(f"Creating evaluation virtualenv in {venv_dir}...")
+    subprocess.run([sys.executable, "-m", "venv", "--clear", venv_dir], check=True)
+    install = subprocess.run(
+        [python, "-m", "pip", "install", "--quiet", "--no-index", "--find-links", wheelhouse, *API_EVAL_PACKAGES],
+        capture_output=True, text=True)
+    if install.returncode != 0:
+        raise RuntimeError(f"Offline install failed (wheel cache incomplete?):\n{install.stderr[-2000:]}")
+    with open(marker, "w", encoding="utf-8") as f:
+        json.dump(sorted(API_EVAL_PACKAGES), f)
+    return python
+
+
+def parse_junit(path: str) -> dict | None:
+    """Test counts from a pytest --junitxml file."""
+    try:
+        root = ET.parse(path).getroot()
+    except (ET.ParseError, OSError):
+        return None
+    suites = [root] if root.tag == "testsuite" else root.findall("testsuite")
+    counts = {"tests": 0, "failures": 0, "errors": 0, "skipped": 0}
+    for suite in suites:
+        for key in counts:
+            counts[key] += int(suite.get(key, 0))
+    counts["passed"] = counts["tests"] - counts["failures"] - counts["errors"] - counts["skipped"]
+    return counts
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_until_ready(base_url: str, server: subprocess.Popen) -> bool:
+    deadline = time.time() + SERVER_START_TIMEOUT_S
+    while time.time() < deadline:
+        if server.poll() is not None:
+            return False
+        try:
+            requests.get(f"{base_url}/readings", timeout=2)
+            return True
+        except requests.RequestException:
+            time.sleep(0.2)
+    return False
+
+
+def _reading(station: str, temp: float, rng: random.Random | None = None) -> dict:
+    rng = rng or random.Random(0)
+    return {
+        "station_id": station,
+        "timestamp": f"2025-01-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:30:00",
+        "temperature_c": temp,
+        "humidity_pct": round(rng.uniform(10, 90), 1),
+        "description": "Clear sky",
+    }
+
+
+def run_spec_checks(base_url: str) -> list[dict]:
+    """Probe the running app against the endpoint rules in requirements/api.md.
+
+    Uses its own station ids, so it does not depend on the app starting empty.
+    """
+    checks = []
+
+    def check(name: str, fn):
+        try:
+            detail = fn()
+            checks.append({"name": name, "passed": detail is None, "detail": detail})
+        except (requests.RequestException, ValueError, KeyError, TypeError, AssertionError) as e:
+            checks.append({"name": name, "passed": False, "detail": f"{type(e).__name__}: {e}"})
+
+    created = []
+    fixtures = [("SPEC-A", 10.0), ("SPEC-A", 20.0), ("SPEC-B", 30.5)]
+
+    def create():
+        for station, temp in fixtures:
+            resp = requests.post(f"{base_url}/readings", json=_reading(station, temp), timeout=5)
+            if resp.status_code != 201:
+                return f"POST returned {resp.status_code}, expected 201"
+            body = resp.json()
+            if not isinstance(body.get("id"), int) or body.get("station_id") != station:
+                return f"POST body missing id/fields: {str(body)[:200]}"
+            created.append(body["id"])
+        if len(set(created)) != len(created):
+            return f"ids not unique: {created}"
+        return None
+
+    def list_all():
+        resp = requests.get(f"{base_url}/readings", timeout=5)
+        ids = {r["id"] for r in resp.json()}
+        if resp.status_code != 200 or not set(created) <= ids:
+            return f"GET /readings returned {resp.status_code} without the created readings"
+        return None
+
+    def filter_station():
+        rows = requests.get(f"{base_url}/readings", params={"station_id": "SPEC-A"}, timeout=5).json()
+        if len(rows) != 2 or any(r["station_id"] != "SPEC-A" for r in rows):
+            return f"station_id=SPEC-A returned {len(rows)} rows, expected 2"
+        return None
+
+    def filter_temp():
+        rows = requests.get(f"{base_url}/readings", params={"min_temp": 15, "max_temp": 30.5}, timeout=5).json()
+        ours = {r["id"] for r in rows} & set(created)
+        if ours != {created[1], created[2]}:
+            return f"min_temp=15&max_temp=30.5 matched ids {sorted(ours)}, expected {[created[1], created[2]]}"
+        return None
+
+    def stats():
+        resp = requests.get(f"{base_url}/readings/stats", timeout=5)
+        a = resp.json()["SPEC-A"]
+        expected = {"count": 2, "min_temp": 10.0, "max_temp": 20.0, "avg_temp": 15.0}
+        wrong = {k: a.get(k) for k, v in expected.items() if a.get(k) != v}
+        if resp.status_code != 200 or wrong:
+            return f"stats for SPEC-A wrong: {wrong}"
+        return None
+
+    def delete():
+        resp = requests.delete(f"{base_url}/readings/{created[0]}", timeout=5)
+        if resp.status_code != 204:
+            return f"DELETE returned {resp.status_code}, expected 204"
+        ids = {r["id"] for r in requests.get(f"{base_url}/readings", timeout=5).json()}
+        if created[0] in ids:
+            return "deleted reading still listed"
+        return None
+
+    def delete_missing():
+        resp = requests.delete(f"{base_url}/readings/987654321", timeout=5)
+        if resp.status_code != 404:
+            return f"DELETE of missing id returned {resp.status_code}, expected 404"
+        if resp.json().get("detail") != "Reading not found":
+            return f"404 body was {resp.text[:100]}"
+        return None
+
+    check("create", create)
+    if len(created) == len(fixtures):
+        check("list_all", list_all)
+        check("filter_station", filter_station)
+        check("filter_temperature", filter_temp)
+        check("stats", stats)
+        check("delete", delete)
+    check("delete_missing", delete_missing)
+    return checks
+
+
+def run_load_test(base_url: str, duration_s: float, concurrency: int, seed: int = 0) -> dict:
+    """Drive the app with LOAD_MIX from `concurrency` threads for `duration_s` seconds.
+
+    If the app can't be reached while seeding, the test is skipped and the result
+    carries an "error" with an error_rate of 1.0.
+    """
+    rng = random.Random(seed)
+    with requests.Session() as session:
+        for i in range(LOAD_SEED_READINGS):
+            try:
+                session.post(f"{base_url}/readings", json=_reading(LOAD_STATIONS[i % len(LOAD_STATIONS)],
+                                                                   round(rng.uniform(-10, 35), 1), rng), timeout=10)
+            except requests.RequestException as e:
+                return {"requests": 0, "errors": 0, "error_rate": 1.0, "duration_s": 0.0,
+                        "error": f"seeding failed: {e}"}
+
+    ops, weights = list(LOAD_MIX), list(LOAD_MIX.values())
+    samples: list[list[tuple[str, float, bool]]] = [[] for _ in range(concurrency)]
+    stop_at = time.perf_counter() + duration_s
+
+    def timed(out, name, method, url, expected, **kwargs):
+        start = time.perf_counter()
+        try:
+            resp = method(url, timeout=10, **kwargs)
+            ok = resp.status_code in expected
+        except requests.RequestException:
+            out.append((name, time.perf_counter() - start, False))
+            return None
+        out.append((name, time.perf_counter() - start, ok))
+        return resp
+
+    def worker(index: int):
+        wrng = random.Random(seed + index + 1)
+        out = samples[index]
+        with requests.Session() as s:
+            while time.perf_counter() < stop_at:
+                op = wrng.choices(ops, weights)[0]
+                if op == "list_station":
+                    timed(out, op, s.get, f"{base_url}/readings", (200,),
+                          params={"station_id": wrng.choice(LOAD_STATIONS)})
+                elif op == "list_range":
+                    low = wrng.uniform(-10, 25)
+                    timed(out, op, s.get, f"{base_url}/readings", (200,),
+                          params={"min_temp": round(low, 1), "max_temp": round(low + 10, 1)})
+                elif op == "stats":
+                    timed(out, op, s.get, f"{base_url}/readings/stats", (200,))
+                else:
+                    resp = timed(out, "create", s.post, f"{base_url}/readings", (201,),
+                                 json=_reading(wrng.choice(LOAD_STATIONS), round(wrng.uniform(-10, 35), 1), wrng))
+                    try:
+                        new_id = resp.json()["id"] if resp is not None and resp.status_code == 201 else None
+                    except (ValueError, KeyError, TypeError):
+                        new_id = None
+                    if new_id is not None:
+                        timed(out, "delete", s.delete, f"{base_url}/readings/{new_id}", (204,))
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    flat = [s for per_thread in samples for s in per_thread]
+    if not flat:
+        return {"requests": 0, "errors": 0, "error_rate": 1.0, "duration_s": round(elapsed, 2)}
+    latencies = np.array([lat for _, lat, _ in flat]) * 1000
+    errors = sum(1 for _, _, ok in flat if not ok)
+    by_op = {}
+    for name in sorted({n for n, _, _ in flat}):
+        op_lat = np.array([lat for n, lat, _ in flat if n == name]) * 1000
+        by_op[name] = {
+            "requests": len(op_lat),
+            "errors": sum(1 for n, _, ok in flat if n == name and not ok),
+            "p50_ms": round(float(np.percentile(op_lat, 50)), 2),
+            "p99_ms": round(float(np.percentile(op_lat, 99)), 2),
+        }
+    return {
+        "duration_s": round(elapsed, 2),
+        "concurrency": concurrency,
+        "requests": len(flat),
+        "throughput_rps": round(len(flat) / elapsed, 1),
+        "p50_ms": round(float(np.percentile(latencies, 50)), 2),
+        "p99_ms": round(float(np.percentile(latencies, 99)), 2),
+        "errors": errors,
+        "error_rate": round(errors / len(flat), 4),
+        "by_operation": by_op,
+    }
+
+
+class ApiEvaluator:
+    def __init__(self, mode: str, ctx_size: int | None = None, duration_s: float = 10.0,
+                 concurrency: int = 16, test_timeout_s: float = 120):
+        self.base_dir = Path(__file__).parent.parent
+        self.models_dir = self.base_dir / "models"
+        self.mode = mode
+        self.ctx_size = ctx_size
+        self.duration_s = duration_s
+        self.concurrency = concurrency
+        self.test_limits = SandboxLimits(timeout_s=test_timeout_s, cpu_s=int(test_timeout_s * 2))
+        # The server runs for the whole load test; only the rlimits apply to it
+        self.server_limits = SandboxLimits(cpu_s=int(duration_s * 10 + 120))
+        self.python = None
+
+    def evaluate_model(self, model_dir_name: str, ctx: int | None = None) -> dict:
+        """Extract, test and load-test a single model's API implementation."""
+        print(f"\nEvaluating {model_dir_name}...")
+
+        result_path = self.models_dir / model_dir_name / "results" / "api"
+        if self.mode == "gpu" and ctx:
+            result_path = result_path / "gpu" / f"ctx-{ctx}"
+        else:
+            result_path = result_path / self.mode
+
+        result = {
+            "model": model_dir_name,
+            "status": "evaluated",
+            "scores": {},
+            "issues": [],
+            "details": {},
+        }
+
+        if not result_exists(result_path, "output.md"):
+            result["status"] = "No output.md found"
+            result["scores"]["total"] = 0
+            return result
+
+        files = extract_files(read_text(result_path, "output.md"))
+        app_dir = result_path / APP_DIRNAME
+        app_dir.mkdir(exist_ok=True)
+        for name, code in files.items():
+            (app_dir / name).write_text(code + "\n", encoding="utf-8")
+        result["details"]["files"] = sorted(files)
+
+        result["scores"]["model_tests"] = self._score_model_tests(app_dir, files, result)
+        if APP_FILE in files:
+            self._run_server_checks(app_dir, result)
+        else:
+            result["issues"].append(f"No {APP_FILE} found in output")
+        result["scores"].setdefault("spec_checks", 0.0)
+        result["scores"].setdefault("reliability", 0.0)
+
+        total = sum(result["scores"][k] * w for k, w in WEIGHTS.items())
+        result["scores"]["total"] = round(total, 2)
+        result["scores"]["letter_grade"] = self._get_letter_grade(total)
+
+        with open(result_path / API_EVAL_FILENAME, "w", encoding="utf-8") as f:
+            json.dump({**result, "evaluated_at": datetime.now().isoformat()}, f, indent=2)
+        save_evaluation(str(result_path), "api", result)
+        return result
+
+    def _score_model_tests(self, app_dir: Path, files: dict, result: dict) -> float:
+        """Model Tests (30%): pass rate of the model's own pytest suite."""
+        if TEST_FILE not in files:
+            result["issues"].append(f"No {TEST_FILE} found in output")
+            return 0.0
+        junit = app_dir / "junit.xml"
+        junit.unlink(missing_ok=True)
+        run = run_sandboxed([self.python, "-m", "pytest", TEST_FILE, "-q", "-p", "no:cacheprovider",
+                             f"--junitxml={junit.name}"], cwd=str(app_dir), limits=self.test_limits)
+        counts = parse_junit(str(junit))
+        result["details"]["pytest"] = {
+            "status": run["status"],
+            "exit_code": run.get("exit_code"),
+            "runtime_s": run.get("runtime_s"),
+            **(counts or {}),
+        }
+        if run["status"] == "timeout":
+            result["issues"].append(f"pytest timed out after {self.test_limits.timeout_s:g}s")
+        if not counts or counts["tests"] == 0:
+            result["issues"].append("pytest collected no tests")
+            result["details"]["pytest"]["output_tail"] = run.get("stdout_tail", "")[-1500:]
+            return 0.0
+        if counts["passed"] < counts["tests"]:
+            result["issues"].append(f"{counts['tests'] - counts['passed']} of {counts['tests']} model tests did not pass")
+        print(f"  pytest: {counts['passed']}/{counts['tests']} passed")
+        return round(10.0 * counts["passed"] / counts["tests"], 2)
+
+    def _run_server_checks(self, app_dir: Path, result: dict):
+        """Spec Checks (40%) and Reliability (30%) against the app under uvicorn."""
+        port = _free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        log_path = app_dir / "server.log"
+        with open(log_path, "w", encoding="utf-8") as log:
+            server = start_sandboxed(
+                [self.python, "-m", "uvicorn", "weather_api:app", "--host", "127.0.0.1",
+                 "--port", str(port), "--log-level", "warning"],
+                cwd=str(app_dir), limits=self.server_limits, stdout=log, stderr=subprocess.STDOUT)
+            try:
+                if not _wait_until_ready(base_url, server):
+                    result["issues"].append("App did not start under uvicorn (see api_app/server.log)")
+                    return
+                checks = run_spec_checks(base_url)
+                passed = sum(c["passed"] for c in checks)
+                result["details"]["spec_checks"] = checks
+                result["scores"]["spec_checks"] = round(10.0 * passed / len(checks), 2)
+                for c in checks:
+                    if not c["passed"]:
+                        result["issues"].append(f"Spec check '{c['name']}' failed: {c['detail']}")
+                print(f"  spec checks: {passed}/{len(checks)} passed")
+
+                # The spec checks can crash the app; then there is nothing left to load test
+                if server.poll() is not None:
+                    result["scores"]["reliability"] = 0.0
+                    result["issues"].append(f"Server exited during the spec checks (exit code {server.returncode})")
+                    return
+                try:
+                    load = run_load_test(base_url, self.duration_s, self.concurrency)
+                except requests.RequestException as e:
+                    load = {"requests": 0, "errors": 0, "error_rate": 1.0, "error": str(e)}
+                result["details"]["load_test"] = load
+                result["scores"]["reliability"] = round(10.0 * (1 - load["error_rate"]), 2)
+                if "error" in load:
+                    result["issues"].append(f"Load test failed: {load['error']}")
+                    return
+                if server.poll() is not None:
+                    result["issues"].append(f"Server exited during the load test (exit code {server.returncode})")
+                print(f"  load: {load.get('throughput_rps', 0)} req/s, p99 {load.get('p99_ms', '-')} ms, "
+                      f"{load['errors']} error(s)")
+            finally:
+                stop_sandboxed(server)
+
+    def _get_letter_grade(self, score: float) -> str:
+        if score >= 9.0:
+            return "A"
+        elif score >= 8.0:
+            return "B"
+        elif score >= 7.0:
+            return "C"
+        elif score >= 6.0:
+            return "D"
+        return "F"
+
+    def evaluate_all_models(self):
+        """Evaluate all models and generate report."""
+        print("Evaluating api task implementations...")
+
+        model_entries = []  # (dir_name, ctx_or_None)
+        for model_dir in sorted(self.models_dir.iterdir()):
+            if not model_dir.is_dir():
+                continue
+
+            if self.mode == "gpu" and self.ctx_size:
+                d = model_dir / "results" / "api" / "gpu" / f"ctx-{self.ctx_size}"
+                if result_exists(d, "output.md"):
+                    model_entries.append((model_dir.name, self.ctx_size))
+            elif self.mode == "gpu" and not self.ctx_size:
+                gpu_dir = model_dir / "results" / "api" / "gpu"
+                if gpu_dir.is_dir():
+                    for ctx_dir in sorted(gpu_dir.iterdir()):
+                        if ctx_dir.is_dir() and ctx_dir.name.startswith("ctx-"):
+                            if result_exists(ctx_dir, "output.md"):
+                                ctx = ctx_dir.name.replace("ctx-", "")
+                                model_entries.append((model_dir.name, ctx))
+            else:
+                d = model_dir / "results" / "api" / self.mode
+                if result_exists(d, "output.md"):
+                    model_entries.append((model_dir.name, None))
+
+        print(f"Found {len(model_entries)} model(s) to evaluate:")
+        for name, ctx in model_entries:
+            label = f"{name} (ctx-{ctx})" if ctx else name
+            print(f"  - {label}")
+
+        if not model_entries:
+            print("No api results found. Run benchmarks first.")
+            return
+
+        self.python = ensure_venv()
+
+        all_results = []
+        for dir_name, ctx in model_entries:
+            r = self.evaluate_model(dir_name, ctx=ctx)
+            if ctx and not self.ctx_size:
+                r["model"] = f"{dir_name} (ctx-{ctx})"
+            all_results.append(r)
+
+        report_path = self._generate_report(all_results)
+        print(f"\nEvaluation complete! Report: {report_path}")
+
+    def _generate_report(self, results: list[dict]) -> Path:
+        """Generate the evaluation report card."""
+        report_dir = self.base_dir / "reports" / self.mode
+        report_dir.mkdir(parents=True, exist_ok=True)
+        report_path = report_dir / "report_card_api.md"
+
+        results.sort(key=lambda x: x["scores"].get("total", 0), reverse=True)
+
+        with open(report_path, "w", encoding="utf-8") as f:
+            f.write("# API Task Report Card\n\n")
+            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+            f.write("Each model's Weather Station API was run in an isolated virtualenv: its own pytest suite, "
+                    "spec checks against the live app, then a load test "
+                    f"({self.concurrency} concurrent clients for {self.duration_s:g}s).\n\n")
+
+            f.write("## Summary Rankings\n\n")
+            f.write("| Rank | Model | Grade | Total | Model Tests | Spec Checks | Throughput (req/s) | p50 (ms) | p99 (ms) | Errors |\n")
+            f.write("|------|-------|-------|-------|-------------|-------------|--------------------|----------|----------|--------|\n")
+            for i, r in enumerate(results, 1):
+                s = r["scores"]
+                pytest_info = r["details"].get("pytest", {})
+                tests = f"{pytest_info['passed']}/{pytest_info['tests']}" if pytest_info.get("tests") else "-"
+                checks = r["details"].get("spec_checks", [])
+                spec = f"{sum(c['passed'] for c in checks)}/{len(checks)}" if checks else "-"
+                load = r["details"].get("load_test", {})
+                f.write(f"| {i} | {r['model']} | {s.get('letter_grade', 'N/A')} | {s.get('total', 0):.1f} | "
+                        f"{tests} | {spec} | {load.get('throughput_rps', '-')} | {load.get('p50_ms', '-')} | "
+                        f"{load.get('p99_ms', '-')} | {load.get('errors', '-')} |\n")
+
+            f.write("\n**Scoring:** Model Tests 30%, Spec Checks 40%, Reliability (1 - load-test error rate) 30%. "
+                    "Throughput and latency are reported, not scored.\n\n")
+
+            f.write("## Issues\n\n")
+            for r in results:
+                if r["issues"] or r["status"] != "evaluated":
+                    f.write(f"### {r['model']}\n\n")
+                    if r["status"] != "evaluated":
+                        f.write(f"- {r['status']}\n")
+                    for issue in r["issues"]:
+                        f.write(f"- {issue}\n")
+                    f.write("\n")
+
+            f.write("*Report generated by evaluate_api_code.py*\n")
+
+        return report_path
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Evaluate api task implementations (tests, spec checks, load test)")
+    parser.add_argument("--mode", type=str, choices=["cloud", "cpu", "gpu"],
+                        help="Execution mode")
+    parser.add_argument("--ctx-size", type=int, default=None,
+                        help="Context size for GPU mode (e.g., 8192)")
+    parser.add_argument("--duration", type=float, default=10.0,
+                        help="Load test duration in seconds (default: 10)")
+    parser.add_argument("--concurrency", type=int, default=16,
+                        help="Concurrent load-test clients (default: 16)")
+    parser.add_argument("--test-timeout", type=float, default=120,
+                        help="Timeout for the model's pytest suite in seconds (default: 120)")
+    parser.add_argument("--download-wheels", action="store_true",
+                        help="Fill the local wheel cache (needs network) and exit")
+    args = parser.parse_args()
+
+    if args.download_wheels:
+        download_wheels()
+        sys.exit(0)
+    if not args.mode:
+        parser.error("--mode is required unless --download-wheels is given")
+
+    evaluator = ApiEvaluator(mode=args.mode, ctx_size=args.ctx_size, duration_s=args.duration,
+                             concurrency=args.concurrency, test_timeout_s=args.test_timeout)
+    try:
+        evaluator.evaluate_all_models()
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
@@ -0,0 +1,352 @@
+"""Engine Performance Evaluation
+
+The engine task only checks that trading_engine.py runs on the 275-row historical.csv.
+This evaluator runs every model's generated engine on scaled synthetic price histories.
+The histories use the same Ticker,sharedate,HighPrice,LowPrice,ClosePrice schema. The
+evaluator measures runtime and peak memory and, when a reference implementation is
+given, checks that output.csv matches the reference's output on the same data.
+
+Synthetic datasets are seeded geometric random walks, about 10 years of business days per
+ticker, so 1M rows is ~400 tickers. They are cached in datasets/engine/. Engines run
+under the same sandbox as the benchmark (engine_executor.run_sandboxed), with larger
+limits. The scaling exponent is the slope of log(runtime) against log(rows): ~1 for
+linear code, ~2 for quadratic loops.
+
+The engine specification is not public, so there is no built-in reference. Pass
+--reference with any script that reads historical.csv and writes output.csv.
+
+Usage:
+    python scripts/evaluate_engine_perf.py --mode cpu
+    python scripts/evaluate_engine_perf.py --mode gpu --sizes 10k,1m --reference my_engine.py
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+from datetime import datetime
+
+# Allow running from any directory
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from config import ENGINE_DATASETS_DIR, MODELS_DIR, REPORTS_DIR, dirname_to_model
+from engine_executor import SandboxLimits, run_sandboxed
+
+DEFAULT_SIZES = "10k,1m,10m"
+DAYS_PER_TICKER = 2500
+ENGINE_PERF_FILENAME = "engine_perf.json"
+CSV_COLUMNS = ["Ticker", "sharedate", "HighPrice", "LowPrice", "ClosePrice"]
+# Part of the cache file name: bump when generate_dataset's output changes
+DATASET_VERSION = 2
+# Relative tolerance for numeric output comparison
+FLOAT_RTOL = 1e-6
+
+
+def parse_size(text: str) -> int:
+    """'10k' -> 10000, '1m' -> 1000000, '2500' -> 2500."""
+    text = text.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text.rstrip("km")) * scale)
+
+
+def format_size(rows: int) -> str:
+    for unit, scale in (("M", 1_000_000), ("k", 1_000)):
+        if rows >= scale and rows % scale == 0:
+            return f"{rows // scale}{unit}"
+    return str(rows)
+
+
+def generate_dataset(rows: int, path: str, seed: int = 42, chunk_tickers: int = 200):
+    """Write a synthetic historical.csv with `rows` rows (grouped by ticker, dates ascending).
+
+    Written in ticker chunks so 10M rows never sit in memory at once. Uses the same
+    UTF-8 BOM and M/D/YYYY dates as requirements/historical.csv.
+    """
+    rng = np.random.default_rng(seed)
+    n_tickers = max(1, math.ceil(rows / DAYS_PER_TICKER))
+    days = pd.bdate_range("2015-01-02", periods=min(rows, DAYS_PER_TICKER))
+    date_strings = np.array([f"{d.month}/{d.day}/{d.year}" for d in days])
+
+    tmp_path = path + ".tmp"
+    remaining = rows
+    with open(tmp_path, "w", encoding="utf-8-sig", newline="") as f:
+        f.write(",".join(CSV_COLUMNS) + "\n")
+        for first in range(0, n_tickers, chunk_tickers):
+            tickers = range(first, min(first + chunk_tickers, n_tickers))
+            counts = [min(len(days), remaining - i * len(days)) for i in range(len(tickers))]
+            counts = [c for c in counts if c > 0]
+            total = sum(counts)
+            remaining -= total
+
+            start = rng.uniform(10, 500, len(counts))
+            returns = rng.normal(0.0004, 0.02, total)
+            ticker_idx = np.repeat(np.arange(len(counts)), counts)
+            day_idx = np.concatenate([np.arange(c) for c in counts])
+            # Cumulative log-returns restarted at each ticker boundary
+            log_path = np.cumsum(returns)
+            offsets = np.repeat(np.concatenate([[0], log_path[np.cumsum(counts)[:-1] - 1]]), counts)
+            close = start[ticker_idx] * np.exp(log_path - offsets)
+            high = close * (1 + np.abs(rng.normal(0, 0.01, total)))
+            low = close * (1 - np.abs(rng.normal(0, 0.01, total)))
+            # Round close first and clamp, so rounding never breaks High >= Close >= Low
+            close = close.round(2)
+            high = np.maximum(high.round(3), close)
+            low = np.minimum(low.round(3), close)
+
+            chunk = pd.DataFrame({
+                "Ticker": np.array([f"SYN{first + i:05d}" for i in range(len(counts))])[ticker_idx],
+                "sharedate": date_strings[day_idx],
+                "HighPrice": high,
+                "LowPrice": low,
+                "ClosePrice": close,
+            })
+            chunk.to_csv(f, header=False, index=False)
+            if remaining <= 0:
+                break
+    os.replace(tmp_path, path)
+
+
+def ensure_dataset(rows: int, seed: int) -> str:
+    """Path to the cached dataset for `rows`, generating it on first use."""
+    os.makedirs(ENGINE_DATASETS_DIR, exist_ok=True)
+    path = os.path.join(ENGINE_DATASETS_DIR, f"historical_{format_size(rows)}_seed{seed}_v{DATASET_VERSION}.csv")
+    if not os.path.exists(path):
+        print(f"  Generating {format_size(rows)}-row dataset...", flush=True)
+        generate_dataset(rows, path, seed=seed)
+    return path
+
+
+def _link_or_copy(src: str, dest: str):
+    try:
+        os.symlink(os.path.abspath(src), dest)
+    except (OSError, NotImplementedError):
+        shutil.copy2(src, dest)
+
+
+def run_engine_on(script: str, dataset: str, limits: SandboxLimits) -> tuple[dict, str]:
+    """Run an engine script against a dataset in a scratch dir.
+
+    Returns the run record and the scratch dir (holding output.csv); the caller removes it.
+    """
+    workdir = tempfile.mkdtemp(prefix="engine-perf-", dir=ENGINE_DATASETS_DIR)
+    shutil.copy2(script, os.path.join(workdir, "trading_engine.py"))
+    _link_or_copy(dataset, os.path.join(workdir, "historical.csv"))
+    run = run_sandboxed([sys.executable, "trading_engine.py"], cwd=workdir, limits=limits)
+    run["output_csv"] = os.path.exists(os.path.join(workdir, "output.csv"))
+    for key in ("command", "limits"):
+        run.pop(key, None)
+    return run, workdir
+
+
+def _normalize(frame: pd.DataFrame) -> pd.DataFrame:
+    frame = frame.rename(columns=lambda c: str(c).strip().lower())
+    frame = frame[sorted(frame.columns)]
+    numeric = frame.select_dtypes("number").columns
+    frame[numeric] = frame[numeric].round(6)
+    return frame.sort_values(list(frame.columns)).reset_index(drop=True)
+
+
+def compare_outputs(candidate_csv: str, reference_csv: str) -> dict:
+    """Order-insensitive comparison of two output.csv files.
+
+    Column names are compared case-insensitively. Numeric columns must agree within
+    FLOAT_RTOL, and all other columns must match exactly.
+    """
+    try:
+        cand = _normalize(pd.read_csv(candidate_csv, encoding="utf-8-sig"))
+        ref = _normalize(pd.read_csv(reference_csv, encoding="utf-8-sig"))
+    except (ValueError, OSError, pd.errors.ParserError) as e:
+        return {"equivalent": False, "reason": f"unreadable output: {e}"}
+
+    if set(cand.columns) != set(ref.columns):
+        missing = sorted(set(ref.columns) - set(cand.columns))
+        extra = sorted(set(cand.columns) - set(ref.columns))
+        return {"equivalent": False, "reason": f"columns differ (missing {missing}, extra {extra})"}
+    if len(cand) != len(ref):
+        return {"equivalent": False, "reason": f"{len(cand)} rows vs {len(ref)} in reference"}
+
+    for col in ref.columns:
+        if pd.api.types.is_numeric_dtype(ref[col]) and pd.api.types.is_numeric_dtype(cand[col]):
+            same = np.isclose(cand[col].to_numpy(float), ref[col].to_numpy(float), rtol=FLOAT_RTOL, equal_nan=True)
+        else:
+            same = (cand[col].astype(str) == ref[col].astype(str)).to_numpy()
+        if not same.all():
+            return {"equivalent": False, "reason": f"{int((~same).sum())} rows differ in '{col}'"}
+    return {"equivalent": True, "reason": None}
+
+
+def scaling_exponent(points: list[tuple[int, float]]) -> float | None:
+    """Slope of log(runtime) vs log(rows) over successful sizes (needs two or more)."""
+    pts = [(n, t) for n, t in points if t > 0]
+    if len(pts) < 2:
+        return None
+    x = np.log([n for n, _ in pts])
+    y = np.log([t for _, t in pts])
+    return round(float(np.polyfit(x, y, 1)[0]), 2)
+
+
+def find_engine_runs(mode: str, models: list[str] | None = None) -> list[tuple[str, str]]:
+    """(model, run_dir) for every engine result with a trading_engine.py."""
+    runs = []
+    if not os.path.isdir(MODELS_DIR):
+        return runs
+    for dirname in sorted(os.listdir(MODELS_DIR)):
+        model = dirname_to_model(dirname)
+        if models and model not in models:
+            continue
+        base = os.path.join(MODELS_DIR, dirname, "results", "engine", mode)
+        for root, _, files in os.walk(base):
+            if "trading_engine.py" in files:
+                runs.append((model, root))
+    return runs
+
+
+class ReferenceOutputs:
+    """Runs the reference engine once per dataset and caches its output.csv."""
+
+    def __init__(self, script: str | None, limits: SandboxLimits):
+        self.script = script
+        self.limits = limits
+        self._cache: dict[str, str | None] = {}
+        if script:
+            with open(script, "rb") as f:
+                self._digest = hashlib.sha256(f.read()).hexdigest()[:12]
+
+    def output_for(self, dataset: str) -> str | None:
+        if not self.script:
+            return None
+        if dataset not in self._cache:
+            cached = f"{os.path.splitext(dataset)[0]}.reference-{self._digest}.output.csv"
+            if not os.path.exists(cached):
+                print(f"  Running reference on {os.path.basename(dataset)}...", flush=True)
+                run, workdir = run_engine_on(self.script, dataset, self.limits)
+                if run["status"] == "ok" and run["output_csv"]:
+                    shutil.move(os.path.join(workdir, "output.csv"), cached)
+                else:
+                    print(f"  WARNING: reference failed on {os.path.basename(dataset)} ({run['status']})")
+                    cached = None
+                shutil.rmtree(workdir, ignore_errors=True)
+            self._cache[dataset] = cached
+        return self._cache[dataset]
+
+
+def evaluate_run(model: str, run_dir: str, datasets: dict[int, str], reference: ReferenceOutputs,
+                 limits: SandboxLimits) -> dict:
+    """Run one generated engine on every dataset size; writes engine_perf.json into run_dir."""
+    script = os.path.join(run_dir, "trading_engine.py")
+    sizes = []
+    for rows, dataset in sorted(datasets.items()):
+        ref_csv = reference.output_for(dataset)
+        print(f"  {model} @ {format_size(rows)} rows...", end="", flush=True)
+        run, workdir = run_engine_on(script, dataset, limits)
+        entry = {"rows": rows, **run}
+        if run["status"] == "ok" and run["output_csv"] and ref_csv:
+            entry["equivalence"] = compare_outputs(os.path.join(workdir, "output.csv"), ref_csv)
+        shutil.rmtree(workdir, ignore_errors=True)
+        sizes.append(entry)
+        eq = entry.get("equivalence")
+        eq_text = "" if eq is None else (", matches reference" if eq["equivalent"] else f", MISMATCH: {eq['reason']}")
+        print(f" {run['status']} in {run.get('runtime_s', '-')}s, peak {run.get('peak_rss_mb', '-')} MB{eq_text}")
+        if run["status"] == "timeout":
+            # Larger inputs would only time out too
+            break
+
+    result = {
+        "model": model,
+        "evaluated_at": datetime.now().isoformat(),
+        "reference": os.path.basename(reference.script) if reference.script else None,
+        "limits": {"memory_mb": limits.memory_mb, "cpu_s": limits.cpu_s, "timeout_s": limits.timeout_s},
+        "sizes": sizes,
+        "scaling_exponent": scaling_exponent([(s["rows"], s["runtime_s"]) for s in sizes if s["status"] == "ok"]),
+    }
+    with open(os.path.join(run_dir, ENGINE_PERF_FILENAME), "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    return result
+
+
+def build_report(mode: str, results: list[dict], rows_list: list[int], has_reference: bool) -> str:
+    lines = [
+        f"# Engine Performance ({mode.upper()} Mode)",
+        "",
+        f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        "",
+        "*Cells: runtime s / peak RSS MB"
+        + (" / output vs reference (= match, ≠ mismatch)" if has_reference else "")
+        + ". Scaling = slope of log(runtime) vs log(rows): ~1 linear, ~2 quadratic.*",
+        "",
+        "| Model | " + " | ".join(f"{format_size(r)} rows" for r in rows_list) + " | Scaling |",
+        "|-------|" + "|".join("--------" for _ in rows_list) + "|---------|",
+    ]
+    for res in results:
+        by_rows = {s["rows"]: s for s in res["sizes"]}
+        cells = []
+        for rows in rows_list:
+            s = by_rows.get(rows)
+            if s is None:
+                cells.append("skipped")
+            elif s["status"] != "ok":
+                cells.append(s["status"] + (f" ({s.get('runtime_s')}s)" if s["status"] == "timeout" else ""))
+            else:
+                cell = f"{s['runtime_s']:.2f} / {s['peak_rss_mb']:.0f}"
+                if "equivalence" in s:
+                    cell += " / " + ("=" if s["equivalence"]["equivalent"] else "≠")
+                elif not s["output_csv"]:
+                    cell += " / no output"
+                cells.append(cell)
+        exponent = res["scaling_exponent"]
+        lines.append(f"| `{res['model']}` | " + " | ".join(cells) + f" | {exponent if exponent is not None else '-'} |")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run generated trading engines on large synthetic datasets")
+    parser.add_argument("--mode", type=str, required=True, choices=["cloud", "cpu", "gpu"],
+                        help="Execution mode whose engine results to evaluate")
+    parser.add_argument("--models", type=str, default=None,
+                        help="Comma-separated list of models (default: all with engine results)")
+    parser.add_argument("--sizes", type=str, default=DEFAULT_SIZES,
+                        help=f"Comma-separated dataset sizes in rows, k/m suffixes allowed (default: {DEFAULT_SIZES})")
+    parser.add_argument("--reference", type=str, default=None,
+                        help="Reference engine script (reads historical.csv, writes output.csv) for output equivalence")
+    parser.add_argument("--timeout", type=float, default=600,
+                        help="Wall-clock limit per engine run in seconds (default: 600)")
+    parser.add_argument("--memory-mb", type=int, default=8192,
+                        help="Address-space limit per engine run in MB (default: 8192)")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the synthetic datasets (default: 42)")
+    args = parser.parse_args()
+
+    if args.reference and not os.path.exists(args.reference):
+        print(f"Error: reference script not found: {args.reference}")
+        sys.exit(1)
+
+    models = [m.strip() for m in args.models.split(",")] if args.models else None
+    runs = find_engine_runs(args.mode, models)
+    if not runs:
+        print(f"No engine results with trading_engine.py found for mode '{args.mode}'.")
+        return
+
+    limits = SandboxLimits(memory_mb=args.memory_mb, cpu_s=int(args.timeout * 2), timeout_s=args.timeout)
+    rows_list = sorted({parse_size(s) for s in args.sizes.split(",")})
+    datasets = {rows: ensure_dataset(rows, args.seed) for rows in rows_list}
+    reference = ReferenceOutputs(args.reference, limits)
+
+    print(f"Evaluating {len(runs)} engine(s) on {', '.join(format_size(r) for r in rows_list)} rows")
+    results = [evaluate_run(model, run_dir, datasets, reference, limits) for model, run_dir in runs]
+
+    report_dir = os.path.join(REPORTS_DIR, args.mode)
+    os.makedirs(report_dir, exist_ok=True)
+    report_path = os.path.join(report_dir, "engine_perf.md")
+    with open(report_path, "w", encoding="utf-8") as f:
+        f.write(build_report(args.mode, results, rows_list, bool(args.reference)))
+    print(f"\nEngine performance report: {report_path}")
+
+
+if __name__ == "__main__":
+    main()
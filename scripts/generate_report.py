@@ -9,287 +9,382 @@ from datetime import datetime
 # Allow running from any directory
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from config import MODELS_DIR, REPORTS_DIR, TASKS, model_to_dirname, dirname_to_model, get_model_meta
+import pandas as pd
+
+from config import MODELS_DIR, REPORTS_DIR, TASKS, dirname_to_model, get_model_meta
+from timing_breakdown import compute_timing_breakdown, effective_eval_tps
 
 
 TIER_LABELS = {1: "Tier 1", 2: "Tier 2", 3: "Tier 3", 4: "Cloud", 99: "Unknown"}
 
+EXPORT_FORMATS = ["csv", "parquet"]
 
-def sort_models(models: list) -> list:
-    """Sort models by tier ascending, then size descending within each tier."""
-    return sorted(models, key=lambda m: (get_model_meta(m)[0], -get_model_meta(m)[1]))
 
+def _parse_run_path(rel_parts: list[str]) -> tuple[str, int | None] | None:
+    """Map the path below results/{task}/{mode}/ to (hardware, ctx_size).
 
-def collect_results(mode: str) -> dict:
-    """Scan models directory and collect metrics for specified mode."""
-    results = {}  # {model: {task|ctx-size: metrics}}
+    Accepted layouts: metrics.json, ctx-N/metrics.json, {hardware}/metrics.json
+    and {hardware}/ctx-N/metrics.json. Anything deeper belongs to other tools.
+    """
+    dirs = rel_parts[:-1]
+    hardware, ctx = "", None
+    if dirs and dirs[-1].startswith("ctx-") and dirs[-1][4:].isdigit():
+        ctx = int(dirs.pop()[4:])
+    if len(dirs) > 1:
+        return None
+    if dirs:
+        hardware = dirs[0]
+    return hardware, ctx
 
-    if not os.path.exists(MODELS_DIR):
-        return results
 
-    for model_dir in os.listdir(MODELS_DIR):
+def _scan_runs(mode: str):
+    """Yield (model_name, task, hardware, ctx_size, run_dir, metrics) for every metrics.json of a mode."""
+    if not os.path.exists(MODELS_DIR):
+        return
+    for model_dir in sorted(os.listdir(MODELS_DIR)):
         model_path = os.path.join(MODELS_DIR, model_dir)
         if not os.path.isdir(model_path):
             continue
-
         model_name = dirname_to_model(model_dir)
-        task_results = {}
-
         for task in TASKS:
-            if mode == "gpu":
-                # For GPU, collect all ctx-* subfolders
-                gpu_dir = os.path.join(model_path, "results", task, "gpu")
-                if os.path.isdir(gpu_dir):
-                    ctx_dirs = sorted([d for d in os.listdir(gpu_dir) if d.startswith("ctx-")])
-                    for ctx_dir in ctx_dirs:
-                        metrics_path = os.path.join(gpu_dir, ctx_dir, "metrics.json")
-                        if os.path.exists(metrics_path):
-                            with open(metrics_path, "r", encoding="utf-8") as f:
-                                # Use composite key: "task|ctx-size"
-                                task_results[f"{task}|{ctx_dir}"] = json.load(f)
-            else:
-                # CPU and cloud modes: flat structure
-                metrics_path = os.path.join(model_path, "results", task, mode, "metrics.json")
-                if os.path.exists(metrics_path):
-                    with open(metrics_path, "r", encoding="utf-8") as f:
-                        task_results[task] = json.load(f)
-
-        # Only include models that have at least one result
-        if task_results:
-            results[model_name] = task_results
-
-    return results
-
-
-def build_speed_table(results: dict, mode: str) -> str:
+            mode_dir = os.path.join(model_path, "results", task, mode)
+            if not os.path.isdir(mode_dir):
+                continue
+            for root, _, files in os.walk(mode_dir):
+                if "metrics.json" not in files:
+                    continue
+                rel_parts = os.path.relpath(os.path.join(root, "metrics.json"), mode_dir).split(os.sep)
+                parsed = _parse_run_path(rel_parts)
+                if parsed is None:
+                    continue
+                hardware, ctx = parsed
+                with open(os.path.join(root, "metrics.json"), "r", encoding="utf-8") as f:
+                    metrics = json.load(f)
+                yield model_name, task, hardware, ctx, root, metrics
+
+
+def collect_results(mode: str) -> pd.DataFrame:
+    """Scan models directory and collect metrics for a mode into one tidy DataFrame.
+
+    One row per run. Identity columns (model, tier, size_gb, task, hardware, ctx,
+    run_dir, column) come first, followed by derived speed/timing columns and the flattened
+    metrics.json fields ("tokens.eval_tokens_per_sec", "gpu.peak_vram_mb", ...).
+    `column` is the report column label, e.g. "agentic-chat (ctx-8192)".
+    """
+    ids, flat = [], []
+    for model, task, hardware, ctx, run_dir, metrics in _scan_runs(mode):
+        tier, size_gb = get_model_meta(model)
+        tps, tps_source = effective_eval_tps(metrics) if "tokens" in metrics else (None, "none")
+        row = {
+            "model": model,
+            "tier": tier,
+            "size_gb": size_gb,
+            "task": task,
+            "hardware": hardware,
+            "ctx": ctx,
+            "run_dir": run_dir,
+            "eff_tps": tps if tps_source != "none" else None,
+            "eff_tps_estimated": tps_source not in ("server", "none"),
+        }
+        breakdown = compute_timing_breakdown(metrics)
+        if breakdown:
+            row.update({f"breakdown.{k}": v for k, v in pd.json_normalize(breakdown).iloc[0].items()})
+        ids.append(row)
+        flat.append(metrics)
+
+    if not ids:
+        return pd.DataFrame()
+
+    id_frame = pd.DataFrame(ids)
+    flat_frame = pd.json_normalize(flat)
+    # metrics.json repeats "model"/"task"; the identity columns derived from the path win
+    flat_frame = flat_frame.drop(columns=[c for c in flat_frame.columns if c in id_frame.columns])
+    df = pd.concat([id_frame, flat_frame], axis=1)
+    df["ctx"] = df["ctx"].astype("Int64")
+
+    # Only spell out the hardware profile when results from several are mixed
+    show_hw = df["hardware"].nunique() > 1
+    ctx_label = ("ctx-" + df["ctx"].astype("string")).fillna("")
+    hw_label = df["hardware"] if show_hw else pd.Series("", index=df.index)
+    parts = (hw_label + ", " + ctx_label).str.strip(", ")
+    df["column"] = df["task"].where(parts == "", df["task"] + " (" + parts + ")")
+
+    # Models tied on tier and size keep their scan order, as the old sorted() did
+    df["scan_order"] = df["model"].map({m: i for i, m in enumerate(df["model"].drop_duplicates())})
+    df = df.sort_values(["tier", "size_gb", "scan_order", "task", "hardware", "ctx"],
+                        ascending=[True, False, True, True, True, True], na_position="first")
+    return df.drop(columns="scan_order").reset_index(drop=True)
+
+
+def ordered_columns(df: pd.DataFrame) -> list[str]:
+    """Report columns in task order, then hardware, then ascending context size."""
+    keys = df[["task", "hardware", "ctx", "column"]].drop_duplicates("column")
+    keys = keys.assign(task_order=keys["task"].map(TASKS.index))
+    return keys.sort_values(["task_order", "hardware", "ctx"], na_position="first")["column"].tolist()
+
+
+def ordered_models(df: pd.DataFrame) -> list[str]:
+    """Models by tier ascending, then size descending (collect_results already sorts rows)."""
+    return df["model"].drop_duplicates().tolist()
+
+
+def format_value(value) -> str:
+    """Markdown cell for a numeric value; '-' when missing."""
+    if value is None or pd.isna(value):
+        return "-"
+    if isinstance(value, float):
+        return f"{round(value, 2)}"
+    return str(value)
+
+
+def render_table(frame: pd.DataFrame, first_header: str = "Model", code_index: bool = True) -> list[str]:
+    """Render a frame of pre-formatted string cells as a markdown table (index = first column)."""
+    header = f"| {first_header} |" + "".join(f" {c} |" for c in frame.columns)
+    separator = "|-------|" + "--------|" * len(frame.columns)
+    lines = [header, separator]
+    for idx, row in frame.iterrows():
+        label = f"`{idx}`" if code_index else f"{idx}"
+        lines.append(f"| {label} |" + "".join(f" {v} |" for v in row))
+    return lines
+
+
+def pivot_metric(df: pd.DataFrame, value: str) -> pd.DataFrame:
+    """Model x column pivot of a numeric metric (mean over repetitions), in report order."""
+    table = df.pivot_table(index="model", columns="column", values=value, aggfunc="mean", dropna=False)
+    return table.reindex(index=ordered_models(df), columns=ordered_columns(df))
+
+
+def build_speed_table(results: pd.DataFrame, mode: str) -> str:
     """Build a markdown table of generation speed (tokens/sec) per model per task."""
     lines = ["## Generation Speed (tokens/sec)", ""]
+    if results["eff_tps_estimated"].any():
+        lines.append("*~ = estimated from streaming timestamps or total request time; cloud models report no eval_duration.*")
+        lines.append("")
 
-    # Collect all task keys (may include ctx-size for GPU mode)
-    task_keys = set()
-    for model_data in results.values():
-        task_keys.update(model_data.keys())
-    task_keys = sorted(task_keys)
-
-    # Build header
-    header = "| Model |"
-    separator = "|-------|"
-    for task_key in task_keys:
-        # Format column header
-        if "|" in task_key:
-            task, ctx = task_key.split("|")
-            col_name = f"{task} ({ctx})"
-        else:
-            col_name = task_key
-        header += f" {col_name} |"
-        separator += "--------|"
-    lines.append(header)
-    lines.append(separator)
-
-    for model in sort_models(results.keys()):
-        row = f"| `{model}` |"
-        for task_key in task_keys:
-            metrics = results[model].get(task_key)
-            if metrics and "tokens" in metrics:
-                tps = metrics["tokens"].get("eval_tokens_per_sec", "-")
-                row += f" {tps} |"
-            else:
-                row += " - |"
-        lines.append(row)
-
+    speed = pivot_metric(results, "eff_tps")
+    estimated = (results.pivot_table(index="model", columns="column", values="eff_tps_estimated", aggfunc="any")
+                 .reindex_like(speed).fillna(False).astype(bool))
+    cells = speed.map(format_value)
+    cells = cells.mask(estimated & speed.notna(), "~" + cells)
+    lines.extend(render_table(cells))
     return "\n".join(lines)
 
 
-def build_vram_table(results: dict, mode: str) -> str:
+def build_vram_table(results: pd.DataFrame, mode: str) -> str:
     """Build a markdown table of peak VRAM usage per model per task, with model size."""
     lines = ["## Peak VRAM Usage (MB)", ""]
 
-    # Collect all task keys
-    task_keys = set()
-    for model_data in results.values():
-        task_keys.update(model_data.keys())
-    task_keys = sorted(task_keys)
-
-    header = "| Model | Size (GB) |"
-    separator = "|-------|-----------|"
-    for task_key in task_keys:
-        if "|" in task_key:
-            task, ctx = task_key.split("|")
-            col_name = f"{task} ({ctx})"
-        else:
-            col_name = task_key
-        header += f" {col_name} |"
-        separator += "--------|"
-    lines.append(header)
-    lines.append(separator)
-
-    for model in sort_models(results.keys()):
-        tier, size_gb = get_model_meta(model)
-        size_str = f"{size_gb}" if size_gb > 0 else "cloud"
-        row = f"| `{model}` | {size_str} |"
-        for task_key in task_keys:
-            metrics = results[model].get(task_key)
-            if metrics and "gpu" in metrics:
-                vram = metrics["gpu"].get("peak_vram_mb", "-")
-                row += f" {vram} |"
-            else:
-                row += " - |"
-        lines.append(row)
-
+    if "gpu.peak_vram_mb" not in results:
+        return ""
+    cells = pivot_metric(results, "gpu.peak_vram_mb").map(format_value)
+    sizes = results.drop_duplicates("model").set_index("model")["size_gb"]
+    cells.insert(0, "Size (GB)", sizes.reindex(cells.index).map(lambda s: f"{s}" if s > 0 else "cloud"))
+    lines.extend(render_table(cells))
     return "\n".join(lines)
 
 
-def build_timing_table(results: dict, mode: str) -> str:
+def build_timing_table(results: pd.DataFrame, mode: str) -> str:
     """Build a markdown table of total generation time per model per task."""
     lines = ["## Total Generation Time (seconds)", ""]
 
-    # Collect all task keys
-    task_keys = set()
-    for model_data in results.values():
-        task_keys.update(model_data.keys())
-    task_keys = sorted(task_keys)
-
-    header = "| Model |"
-    separator = "|-------|"
-    for task_key in task_keys:
-        if "|" in task_key:
-            task, ctx = task_key.split("|")
-            col_name = f"{task} ({ctx})"
-        else:
-            col_name = task_key
-        header += f" {col_name} |"
-        separator += "--------|"
-    lines.append(header)
-    lines.append(separator)
-
-    for model in sort_models(results.keys()):
-        row = f"| `{model}` |"
-        for task_key in task_keys:
-            metrics = results[model].get(task_key)
-            if metrics and "timing" in metrics:
-                total = metrics["timing"].get("total_duration_s", "-")
-                row += f" {total} |"
-            elif metrics and "wall_clock_s" in metrics:
-                row += f" {metrics['wall_clock_s']} |"
-            else:
-                row += " - |"
-        lines.append(row)
+    total = pd.Series(pd.NA, index=results.index, dtype="Float64")
+    if "timing.total_duration_s" in results:
+        total = results["timing.total_duration_s"].astype("Float64")
+    if "wall_clock_s" in results:
+        total = total.fillna(results["wall_clock_s"].astype("Float64"))
+    cells = pivot_metric(results.assign(total_s=total.astype(float)), "total_s").map(format_value)
+    lines.extend(render_table(cells))
+    return "\n".join(lines)
+
+
+def build_overhead_table(results: pd.DataFrame, mode: str) -> str:
+    """Build a table reconciling client wall clock with Ollama's server-side timing."""
+    if "breakdown.wall_s" not in results:
+        return ""
+    rows = results[results["breakdown.wall_s"].notna()]
+    if rows.empty:
+        return ""
+
+    numeric = ["breakdown.wall_s", "breakdown.server_total_s", "breakdown.client_overhead_s",
+               "breakdown.load_s", "breakdown.prefill_s", "breakdown.decode_s", "breakdown.unexplained_s",
+               "breakdown.ttft_s", "breakdown.effective_eval_tokens_per_sec"]
+    numeric = [c for c in numeric if c in rows]
+    agg = (rows.assign(**{c: pd.to_numeric(rows[c], errors="coerce") for c in numeric})
+           .groupby(["model", "column"], sort=False)
+           .agg({**{c: "mean" for c in numeric}, "breakdown.effective_tps_source": "first"}))
+    agg = agg.reindex(pd.MultiIndex.from_product([ordered_models(rows), ordered_columns(rows)])).dropna(how="all")
+
+    wall = agg["breakdown.wall_s"]
+
+    def cell(name: str) -> pd.Series:
+        col = f"breakdown.{name}"
+        if col not in agg:
+            return pd.Series("-", index=agg.index)
+        share = (100 * agg[col] / wall).round(1)
+        text = agg[col].round(2).astype(str) + " (" + share.astype(str) + "%)"
+        return text.where(agg[col].notna(), "-")
+
+    source = agg["breakdown.effective_tps_source"]
+    tps = agg["breakdown.effective_eval_tokens_per_sec"].map(format_value)
+    tps = tps.where(source == "server", "~" + tps + " (" + source + ")")
+    table = pd.DataFrame({
+        "Task": agg.index.get_level_values(1),
+        "Wall": wall.map(format_value).values,
+        "Server Total": agg["breakdown.server_total_s"].map(format_value).values,
+        "Client Overhead": cell("client_overhead_s").values,
+        "Load": cell("load_s").values,
+        "Prefill": cell("prefill_s").values,
+        "Decode": cell("decode_s").values,
+        "Unexplained": cell("unexplained_s").values,
+        "TTFT": (agg["breakdown.ttft_s"] if "breakdown.ttft_s" in agg else pd.Series(None, index=agg.index)).map(format_value).values,
+        "Eff. tok/s": tps.values,
+    }, index=agg.index.get_level_values(0))
+
+    lines = ["## Timing Breakdown (seconds, % of wall clock)", ""]
+    lines.append("*Client overhead = wall clock - server total_duration (network, HTTP, queueing). "
+                 "Unexplained = server total not covered by load + prefill + decode. "
+                 "For agentic-chat, wall clock is the summed time of the chat requests.*")
+    lines.append("")
+    lines.extend(render_table(table))
+    return "\n".join(lines)
+
 
+def build_energy_table(results: pd.DataFrame, mode: str) -> str:
+    """Build a table of energy per token (generated / prefilled) per model per task."""
+    if "energy.model_j" not in results:
+        return ""
+    rows = results[results["energy.model_j"].notna()]
+    if rows.empty:
+        return ""
+
+    generated = pivot_metric(rows, "energy.joules_per_generated_token") if "energy.joules_per_generated_token" in rows else None
+    prefill = pivot_metric(rows, "energy.joules_per_prefill_token") if "energy.joules_per_prefill_token" in rows else None
+    base = generated if generated is not None else prefill
+    if base is None:
+        return ""
+
+    def joules(table: pd.DataFrame | None) -> pd.DataFrame:
+        if table is None:
+            return pd.DataFrame("-", index=base.index, columns=base.columns)
+        return table.map(lambda v: f"{v:.4g}" if pd.notna(v) else "-")
+
+    cells = joules(generated) + " / " + joules(prefill)
+    cells = cells.where(cells != "- / -", "-")
+
+    lines = ["## Energy per Token (J/generated token / J/prefill token)", ""]
+    lines.append("*Energy over the model request spans from GPU power.draw and CPU RAPL (whichever were readable), "
+                 "split into prefill and decode by Ollama's prompt_eval/eval durations.*")
+    lines.append("")
+    lines.extend(render_table(cells))
     return "\n".join(lines)
 
 
-def build_quality_table(results: dict, mode: str) -> str:
+def build_quality_table(results: pd.DataFrame, mode: str) -> str:
     """Build a placeholder quality scoring table for manual evaluation."""
     lines = ["## Quality Scores (Manual Evaluation)", ""]
     lines.append("*Score each criterion 1-10. Fill in after reviewing outputs.*")
     lines.append("")
 
-    # Collect all task keys
-    task_keys = set()
-    for model_data in results.values():
-        task_keys.update(model_data.keys())
-    task_keys = sorted(task_keys)
-
-    for task_key in task_keys:
-        if "|" in task_key:
-            task, ctx = task_key.split("|")
-            title = f"{task.title()} ({ctx})"
-        else:
-            title = task_key.title()
-        lines.append(f"### {title}")
+    models_per_column = results.groupby("column", sort=False)["model"].unique()
+    for column in ordered_columns(results):
+        task, _, rest = column.partition(" ")
+        lines.append(f"### {task.title()}{' ' + rest if rest else ''}")
         lines.append("")
         lines.append("| Model | Completeness | Correctness | Code Quality | Overall |")
         lines.append("|-------|-------------|-------------|--------------|---------|")
-        for model in sort_models(results.keys()):
-            if task_key in results[model]:
+        present = set(models_per_column[column])
+        for model in ordered_models(results):
+            if model in present:
                 lines.append(f"| `{model}` | /10 | /10 | /10 | /10 |")
         lines.append("")
 
     return "\n".join(lines)
 
 
-def build_warnings_table(results: dict, mode: str) -> str:
+def build_warnings_table(results: pd.DataFrame, mode: str) -> str:
     """Build a markdown table of warnings and errors per model per task."""
-    # Collect all entries that have warnings or errors
-    entries = []
-    for model in sort_models(results.keys()):
-        for task_key, metrics in results[model].items():
-            if not metrics:
-                continue
-            # Extract task name from composite key
-            if "|" in task_key:
-                task, ctx = task_key.split("|")
-                task_display = f"{task} ({ctx})"
-            else:
-                task_display = task_key
-            num_ctx = metrics.get("num_ctx", "-")
-            num_predict = metrics.get("num_predict", "-")
-            num_threads = metrics.get("num_threads", "-")
-            error = metrics.get("error")
-            warnings = metrics.get("warnings", [])
-            if error:
-                entries.append((model, task_display, num_ctx, num_predict, num_threads, "ERROR", error))
-            for w in warnings:
-                entries.append((model, task_display, num_ctx, num_predict, num_threads, "WARNING", w))
-
-    if not entries:
+    cols = ["model", "column", "num_ctx", "num_predict", "num_threads"]
+    base = results.reindex(columns=cols + ["error", "warnings"])
+
+    errors = base[base["error"].notna()].assign(severity="ERROR", detail=lambda d: d["error"])
+    warned = base[base["warnings"].map(lambda w: isinstance(w, list) and len(w) > 0)]
+    warned = warned.explode("warnings").assign(severity="WARNING", detail=lambda d: d["warnings"])
+    entries = pd.concat([errors, warned])
+    if entries.empty:
         return ""
 
+    # Keep model order from the frame, errors before warnings within a run
+    entries = entries.sort_index(kind="stable")
+
     lines = ["## Warnings & Errors", ""]
     lines.append("| Model | Task | num_ctx | num_predict | num_threads | Severity | Detail |")
     lines.append("|-------|------|---------|-------------|-------------|----------|--------|")
-    for model, task, num_ctx, num_predict, num_threads, severity, detail in entries:
-        lines.append(f"| `{model}` | {task} | {num_ctx} | {num_predict} | {num_threads} | {severity} | {detail} |")
+    for e in entries.itertuples(index=False):
+        # Missing values turn these int columns into floats; print them as ints again
+        num_ctx, num_predict, num_threads = (
+            format_value(v if pd.isna(v) else int(v)) for v in (e.num_ctx, e.num_predict, e.num_threads)
+        )
+        lines.append(f"| `{e.model}` | {e.column} | {num_ctx} | {num_predict} | {num_threads} | {e.severity} | {e.detail} |")
 
     return "\n".join(lines)
 
 
-def build_rankings(results: dict, mode: str) -> str:
+def build_rankings(results: pd.DataFrame, mode: str) -> str:
     """Build rankings by generation speed across all tasks."""
     lines = ["## Rankings by Generation Speed", ""]
 
-    # Collect all task keys
-    task_keys = set()
-    for model_data in results.values():
-        task_keys.update(model_data.keys())
-    task_keys = sorted(task_keys)
-
-    for task_key in task_keys:
-        speeds = []
-        for model, tasks_data in results.items():
-            if task_key in tasks_data:
-                metrics = tasks_data[task_key]
-                if "tokens" in metrics:
-                    tps = metrics["tokens"].get("eval_tokens_per_sec", 0)
-                    if tps > 0:
-                        speeds.append((model, tps))
-
-        if speeds:
-            speeds.sort(key=lambda x: x[1], reverse=True)
-            if "|" in task_key:
-                task, ctx = task_key.split("|")
-                title = f"{task.title()} ({ctx})"
-            else:
-                title = task_key.title()
-            lines.append(f"### {title}")
-            lines.append("")
-            for rank, (model, tps) in enumerate(speeds, 1):
-                lines.append(f"{rank}. `{model}` - {tps} tok/s")
-            lines.append("")
+    speeds = (results[results["eff_tps"] > 0]
+              .groupby(["column", "model"], sort=False)
+              .agg(tps=("eff_tps", "mean"), estimated=("eff_tps_estimated", "any"))
+              .reset_index())
+    if speeds.empty:
+        return "\n".join(lines)
+    speeds["rank"] = speeds.groupby("column")["tps"].rank(method="first", ascending=False).astype(int)
+
+    for column in ordered_columns(results):
+        ranked = speeds[speeds["column"] == column].sort_values("rank")
+        if ranked.empty:
+            continue
+        task, _, rest = column.partition(" ")
+        lines.append(f"### {task.title()}{' ' + rest if rest else ''}")
+        lines.append("")
+        for r in ranked.itertuples(index=False):
+            marker = "~" if r.estimated else ""
+            lines.append(f"{r.rank}. `{r.model}` - {marker}{format_value(r.tps)} tok/s")
+        lines.append("")
 
     return "\n".join(lines)
 
 
-def generate_report(mode: str):
+def export_results(results: pd.DataFrame, mode: str, fmt: str) -> str:
+    """Write the tidy results frame to reports/{mode}/results.{csv|parquet}."""
+    report_dir = os.path.join(REPORTS_DIR, mode)
+    os.makedirs(report_dir, exist_ok=True)
+    path = os.path.join(report_dir, f"results.{fmt}")
+
+    # Lists (warnings, tools_used, ...) don't round-trip through CSV or mixed-type Parquet columns
+    out = results.copy()
+    for col in out.columns[out.dtypes == object]:
+        if out[col].map(lambda v: isinstance(v, (list, dict))).any():
+            out[col] = out[col].map(lambda v: json.dumps(v) if isinstance(v, (list, dict)) else v)
+
+    if fmt == "csv":
+        out.to_csv(path, index=False)
+    else:
+        out.to_parquet(path, index=False)
+    return path
+
+
+def generate_report(mode: str, export: str | None = None):
     """Generate the full comparison report for specified mode."""
     results = collect_results(mode)
 
-    if not results:
+    if results.empty:
         print(f"No results found for mode '{mode}'. Run benchmarks first.")
         return
 
-    models_with_data = sum(1 for m in results if results[m])
-    print(f"Found results for {models_with_data} models in '{mode}' mode")
+    models_with_data = results["model"].nunique()
+    print(f"Found results for {models_with_data} models in '{mode}' mode ({len(results)} runs)")
 
     # Build report sections
     report_parts = [
@@ -311,6 +406,10 @@ def generate_report(mode: str):
         "",
         build_timing_table(results, mode),
         "",
+        build_overhead_table(results, mode),
+        "",
+        build_energy_table(results, mode),
+        "",
         build_rankings(results, mode),
         "",
         build_quality_table(results, mode),
@@ -335,10 +434,15 @@ def generate_report(mode: str):
     print(f"Report saved to: {timestamped_path}")
     print(f"Latest report:   {latest_path}")
 
+    if export:
+        print(f"Results table:   {export_results(results, mode, export)}")
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Generate benchmark comparison report")
     parser.add_argument("--mode", type=str, required=True, choices=["cloud", "cpu", "gpu"],
                        help="Execution mode to generate report for")
+    parser.add_argument("--export", type=str, default=None, choices=EXPORT_FORMATS,
+                       help="Also write the tidy per-run results table to reports/{mode}/results.{csv|parquet}")
     args = parser.parse_args()
-    generate_report(args.mode)
+    generate_report(args.mode, export=args.export)
@@ -0,0 +1,201 @@
+"""Single-pass markdown tokenizer for model outputs: fenced code blocks and ATX headings.
+
+Every script that pulls code out of output.md uses this module, so fences are
+recognised the same way everywhere. Call sites: engine post-processing in
+run_benchmark, the agentic evaluator's sectioning, and the api evaluator's file
+extraction. The text is scanned line by line once:
+  - A fence opens on a line starting with ``` or ~~~ (indentation allowed). It closes on
+    a line of the same character, at least as long and with nothing else on it, indented
+    no more than 3 spaces (or the opening fence's indent, for fences nested in lists). A
+    more deeply indented fence is content, e.g. an example inside a ```markdown plan. An
+    unclosed fence runs to the end of the text (closed=False), e.g. a truncated response.
+  - Headings (# to ######) are recognised only outside fences, so a "# comment" in code
+    never starts a section.
+  - Each code block records its enclosing (nearest preceding) heading.
+
+Offsets are str indices into the original text. Section lookups are bisects over the
+sorted offsets, so the old per-header scan over every fence is gone.
+
+Usage:
+    python scripts/markdown_blocks.py --bench                      # synthetic 19k-token output
+    python scripts/markdown_blocks.py --bench models/*/results/greenfield/*/output.md
+"""
+
+import argparse
+import bisect
+import glob
+import re
+import time
+from dataclasses import dataclass
+
+from results_io import open_text
+
+PYTHON_LANGUAGES = ("python", "py", "python3")
+
+_FENCE_OPEN = re.compile(r"([ \t]*)(`{3,}|~{3,})([^`\n]*?)\r?\n?")
+_FENCE_CLOSE = re.compile(r"([ \t]*)(`{3,}|~{3,})[ \t]*\r?\n?")
+_HEADING = re.compile(r"[ \t]*(#{1,6})[ \t]+(.*?)[ \t#]*\r?\n?")
+
+
+@dataclass(frozen=True)
+class Heading:
+    level: int
+    title: str
+    start: int      # offset of the heading line
+    end: int        # offset of the end of the heading text (before the newline)
+    index: int      # position in MarkdownDocument.headings
+
+
+@dataclass(frozen=True)
+class CodeBlock:
+    language: str           # first word of the info string, lower-cased ("" when none)
+    code: str               # content between the fences
+    start: int              # offset of the opening fence
+    end: int                # offset just past the closing fence (end of text when unclosed)
+    closed: bool
+    heading: Heading | None  # nearest heading above the block
+
+    @property
+    def is_python(self) -> bool:
+        return self.language in PYTHON_LANGUAGES
+
+
+class MarkdownDocument:
+    """Headings and code blocks of one markdown text, in document order."""
+
+    def __init__(self, text: str, headings: list[Heading], code_blocks: list[CodeBlock]):
+        self.text = text
+        self.headings = headings
+        self.code_blocks = code_blocks
+        self._block_starts = [b.start for b in code_blocks]
+
+    def find_headings(self, pattern: str, max_level: int = 6, flags: int = re.IGNORECASE) -> list[Heading]:
+        """Headings up to max_level whose title starts with a match for pattern."""
+        regex = re.compile(pattern, flags)
+        return [h for h in self.headings if h.level <= max_level and regex.match(h.title)]
+
+    def section_end(self, heading: Heading, max_level: int = 6) -> int:
+        """Offset where the section under heading ends: the next heading of level <= max_level."""
+        for h in self.headings[heading.index + 1:]:
+            if h.level <= max_level:
+                return h.start
+        return len(self.text)
+
+    def section_text(self, heading: Heading, max_level: int = 6) -> str:
+        return self.text[heading.end:self.section_end(heading, max_level)].strip()
+
+    def blocks_between(self, start: int, end: int, closed_only: bool = True) -> list[CodeBlock]:
+        """Code blocks whose opening fence lies in [start, end)."""
+        lo = bisect.bisect_left(self._block_starts, start)
+        hi = bisect.bisect_left(self._block_starts, end)
+        return [b for b in self.code_blocks[lo:hi] if b.closed or not closed_only]
+
+    def blocks(self, languages: tuple[str, ...] | None = None, closed_only: bool = True) -> list[CodeBlock]:
+        """Code blocks, optionally limited to info-string languages ("" = no language)."""
+        return [b for b in self.code_blocks
+                if (b.closed or not closed_only) and (languages is None or b.language in languages)]
+
+
+def parse_markdown(text: str) -> MarkdownDocument:
+    """Tokenize text in one pass over its lines."""
+    headings: list[Heading] = []
+    blocks: list[CodeBlock] = []
+    current_heading: Heading | None = None
+
+    fence: str | None = None     # opening fence marker while inside a block
+    fence_start = code_start = fence_indent = 0
+    language = ""
+
+    pos = 0
+    for line in text.splitlines(keepends=True):
+        line_start, pos = pos, pos + len(line)
+        if fence is None:
+            m = _FENCE_OPEN.fullmatch(line)
+            if m:
+                fence, fence_start, code_start = m.group(2), line_start, pos
+                fence_indent = len(m.group(1).expandtabs(4))
+                info = m.group(3).split()
+                language = info[0].lower() if info else ""
+                continue
+            m = _HEADING.fullmatch(line)
+            if m:
+                current_heading = Heading(level=len(m.group(1)), title=m.group(2), start=line_start,
+                                          end=line_start + len(line.rstrip("\r\n")), index=len(headings))
+                headings.append(current_heading)
+        else:
+            m = _FENCE_CLOSE.fullmatch(line)
+            if (m and m.group(2)[0] == fence[0] and len(m.group(2)) >= len(fence)
+                    and len(m.group(1).expandtabs(4)) <= max(3, fence_indent)):
+                blocks.append(CodeBlock(language, text[code_start:line_start], fence_start, pos, True, current_heading))
+                fence = None
+
+    if fence is not None:
+        blocks.append(CodeBlock(language, text[code_start:], fence_start, len(text), False, current_heading))
+    return MarkdownDocument(text, headings, blocks)
+
+
+def extract_python_code(text: str) -> str | None:
+    """Longest closed ```python block, else the longest block without a language; None if neither."""
+    doc = parse_markdown(text)
+    candidates = doc.blocks(PYTHON_LANGUAGES) or doc.blocks(("",))
+    if not candidates:
+        return None
+    return max((b.code for b in candidates), key=len).strip()
+
+
+def _synthetic_output(sections: int = 40, lines_per_block: int = 30) -> str:
+    """A greenfield-sized response (~19k tokens): headings, prose and dozens of fences."""
+    parts = ["# Project Implementation\n\n"]
+    for i in range(sections):
+        parts.append(f"## Step {i + 1}: Module {i}\n\n")
+        parts.append("This module handles part of the workflow. " * 8 + "\n\n")
+        parts.append(f"```python\n# module_{i}.py\n")
+        parts.extend(f"def function_{i}_{j}(value: int) -> int:\n    return value * {j}  # ``` in a comment\n"
+                     for j in range(lines_per_block // 2))
+        parts.append("```\n\n")
+        parts.append("```json\n{\"module\": %d}\n```\n\n" % i)
+    return "".join(parts)
+
+
+def _legacy_sections(content: str) -> int:
+    """The previous approach (fence ranges, then a fence scan per header), kept as the benchmark baseline."""
+    fence_ranges = [(m.start(), m.end()) for m in re.finditer(r'```[^\n]*\n.*?```', content, re.DOTALL)]
+    headers = [m.start() for m in re.finditer(r'^\s*#{1,4}\s+', content, re.MULTILINE)
+               if not any(s <= m.start() < e for s, e in fence_ranges)]
+    return len(headers) + len(re.findall(r'```python\n(.*?)```', content, re.DOTALL))
+
+
+def run_bench(paths: list[str], repeat: int):
+    if paths:
+        samples = []
+        for pattern in paths:
+            for path in sorted(glob.glob(pattern, recursive=True)) or [pattern]:
+                with open_text(path) as f:  # output.md, .gz or .zst
+                    samples.append((path, f.read()))
+    else:
+        samples = [("synthetic (40 sections, 80 fences)", _synthetic_output())]
+
+    print(f"{'Input':<60} {'KB':>7} {'Fences':>6} {'Headings':>8} {'Parse ms':>9} {'Legacy ms':>10}")
+    for label, text in samples:
+        timings = {}
+        for name, fn in (("parse", parse_markdown), ("legacy", _legacy_sections)):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                fn(text)
+            timings[name] = (time.perf_counter() - start) / repeat * 1000
+        doc = parse_markdown(text)
+        short = label if len(label) <= 60 else "..." + label[-57:]
+        print(f"{short:<60} {len(text) / 1024:>7.1f} {len(doc.code_blocks):>6} {len(doc.headings):>8} "
+              f"{timings['parse']:>9.2f} {timings['legacy']:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Markdown fence/heading tokenizer for model outputs")
+    parser.add_argument("--bench", action="store_true",
+                        help="Time the tokenizer against the previous regex approach")
+    parser.add_argument("--repeat", type=int, default=20, help="Iterations per input for --bench (default: 20)")
+    parser.add_argument("paths", nargs="*", help="output.md files or globs to benchmark (default: synthetic output)")
+    args = parser.parse_args()
+    if not args.bench:
+        parser.error("nothing to do (use --bench)")
+    run_bench(args.paths, args.repeat)
@@ -0,0 +1,62 @@
+"""Convert an existing models/ tree to another result storage (see results_io.py).
+
+Rewrites every output.md, transcript.json and transcript.jsonl under models/ as gzip,
+zstd or plain files and reports the bytes saved. JSON is re-serialized compactly when
+compressed and indented when plain, so `--storage plain` restores the original layout.
+metrics.json and evaluation.json are left as they are.
+
+Usage:
+    python scripts/migrate_results.py --storage gzip
+    python scripts/migrate_results.py --storage zstd --models-dir /data/models
+    python scripts/migrate_results.py --storage plain     # decompress again
+"""
+
+import argparse
+import os
+import sys
+
+# Allow running from any directory
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import MODELS_DIR
+from results_io import COMPRESSIBLE_FILES, STORAGE_FORMATS, SUFFIXES, convert_file
+
+
+def migrate(models_dir: str, storage: str) -> tuple[int, int, int]:
+    """Convert every compressible result file; returns (files, bytes before, bytes after)."""
+    files = before_total = after_total = 0
+    for root, _, names in os.walk(models_dir):
+        present = {name for name in COMPRESSIBLE_FILES
+                   if any(name + suffix in names for suffix in SUFFIXES.values())}
+        for name in sorted(present):
+            before, after = convert_file(root, name, storage)
+            files += 1
+            before_total += before
+            after_total += after
+        if present:
+            print(f"  {os.path.relpath(root, models_dir)}: {', '.join(sorted(present))}")
+    return files, before_total, after_total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert result files under models/ to another storage format")
+    parser.add_argument("--storage", type=str, required=True, choices=list(STORAGE_FORMATS),
+                        help="Target format: plain, gzip, or zstd (needs the zstandard package)")
+    parser.add_argument("--models-dir", type=str, default=MODELS_DIR, help=f"Results tree (default: {MODELS_DIR})")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.models_dir):
+        print(f"Error: {args.models_dir} is not a directory")
+        sys.exit(1)
+    try:
+        files, before, after = migrate(args.models_dir, args.storage)
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    change = (after - before) / before * 100 if before else 0
+    print(f"\nConverted {files} file(s) to {args.storage}: {before / 1e6:.1f} MB -> {after / 1e6:.1f} MB ({change:+.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,687 @@
+"""Mock Ollama server for offline benchmarking of the harness.
+
+Implements the subset of the Ollama HTTP API used by the scripts in this
+directory (/api/generate, /api/chat with tool_calls, /api/tags, /api/pull,
+/api/ps and keep_alive unload) with configurable latency and token-rate
+profiles, so the orchestrator, the report pipeline and the concurrency modes
+can be exercised on machines without models.
+
+Responses are synthetic: generate returns filler text with a small Python code
+block, and chat with tools runs a scripted agent that walks the portfolio risk
+workflow from requirements/agentic-chat.md using the real tool results it is
+sent back.
+
+Usage:
+    python scripts/mock_ollama.py --port 11435 --profile gpu-small
+    python scripts/mock_ollama.py --port 11435 --profile cpu --time-scale 0.05 --failure-rate 0.02
+
+Then point the harness at it:
+    OLLAMA_BASE_URL=http://localhost:11435 python scripts/run_benchmark.py --mode gpu --skip-pull
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, fields, replace
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Allow running from any directory
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import MODELS, get_model_meta, is_cloud_model
+
+
+@dataclass
+class MockProfile:
+    """Latency and throughput characteristics of the simulated server."""
+    load_time_s: float = 2.0        # Cold model load (reported as load_duration)
+    ttft_s: float = 0.05            # Fixed per-request overhead before the first token
+    prefill_tps: float = 2000.0     # Prompt evaluation speed (tokens/sec)
+    decode_tps: float = 50.0        # Generation speed (tokens/sec)
+    output_tokens: int = 512        # Tokens produced per generate/final chat response
+    failure_rate: float = 0.0       # Probability a request fails with HTTP 500
+    max_concurrency: int = 1        # Requests processed in parallel (OLLAMA_NUM_PARALLEL)
+    max_queue: int = 512            # Pending requests before HTTP 503 (OLLAMA_MAX_QUEUE)
+    pull_mbps: float = 400.0        # Simulated registry download speed (MB/s)
+    time_scale: float = 1.0         # Multiplier applied to every simulated sleep
+    tool_calls_per_turn: int = 1    # Max independent tool calls emitted per chat turn
+    server_timings: bool = True     # False mimics cloud models (only total_duration reported)
+
+
+PROFILES = {
+    "instant": MockProfile(load_time_s=0.0, ttft_s=0.0, prefill_tps=1e9, decode_tps=1e9, max_concurrency=64),
+    "gpu-small": MockProfile(load_time_s=2.0, ttft_s=0.05, prefill_tps=2500.0, decode_tps=60.0),
+    "gpu-large": MockProfile(load_time_s=8.0, ttft_s=0.1, prefill_tps=800.0, decode_tps=18.0),
+    "cpu": MockProfile(load_time_s=5.0, ttft_s=0.1, prefill_tps=60.0, decode_tps=8.0),
+    "cloud": MockProfile(load_time_s=0.0, ttft_s=0.8, prefill_tps=5000.0, decode_tps=80.0,
+                         max_concurrency=8, server_timings=False),
+}
+
+DEFAULT_KEEP_ALIVE_S = 300
+
+# Default risk configuration when the user message does not specify one
+_DEFAULT_RISK_CONFIG = {"max_volatility": 35.0, "min_value": 50000.0, "max_value": 2000000.0}
+
+
+def _estimate_tokens(text: str) -> int:
+    """Same ~4 chars/token heuristic used by run_chat_benchmark."""
+    return max(1, len(text) // 4) if text else 0
+
+
+def _parse_keep_alive(value) -> float | None:
+    """Parse an Ollama keep_alive value into seconds. None = keep forever."""
+    if value is None:
+        return DEFAULT_KEEP_ALIVE_S
+    if isinstance(value, (int, float)):
+        return None if value < 0 else float(value)
+    match = re.fullmatch(r"\s*(-?\d+(?:\.\d+)?)\s*(ms|s|m|h)?\s*", str(value))
+    if not match:
+        return DEFAULT_KEEP_ALIVE_S
+    amount = float(match.group(1))
+    if amount < 0:
+        return None
+    unit = match.group(2) or "s"
+    return amount * {"ms": 0.001, "s": 1, "m": 60, "h": 3600}[unit]
+
+
+def _digest(name: str) -> str:
+    return hashlib.sha256(name.encode()).hexdigest()
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class MockFailure(Exception):
+    """Raised to turn a request into an HTTP error response."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class MockOllamaState:
+    """Installed/loaded model bookkeeping and request admission, shared by all handlers."""
+
+    def __init__(self, profile: MockProfile, installed: list[str], seed: int | None = None):
+        self.profile = profile
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max(1, profile.max_concurrency))
+        self._pending = 0
+        self._rng = random.Random(seed)
+        self.installed = {m: self._model_entry(m) for m in installed}
+        self.loaded: dict[str, float | None] = {}   # model -> expiry timestamp (None = forever)
+        self.partial_pulls: dict[str, int] = {}     # model -> bytes already downloaded
+        self.stats = {"requests": 0, "failures": 0, "rejected": 0, "max_pending": 0}
+
+    @staticmethod
+    def _model_entry(model: str) -> dict:
+        _, size_gb = get_model_meta(model)
+        size = int((size_gb or 1.0) * 1e9) if not is_cloud_model(model) else 384
+        return {
+            "name": model,
+            "model": model,
+            "modified_at": _now_iso(),
+            "size": size,
+            "digest": _digest(model),
+            "details": {"format": "gguf", "family": model.split(":")[0].split("/")[-1]},
+        }
+
+    def sleep(self, seconds: float) -> float:
+        """Sleep for a simulated duration and return the time actually slept."""
+        scaled = max(0.0, seconds * self.profile.time_scale)
+        if scaled > 0:
+            time.sleep(scaled)
+        return scaled
+
+    def maybe_fail(self, what: str):
+        with self._lock:
+            fail = self._rng.random() < self.profile.failure_rate
+            if fail:
+                self.stats["failures"] += 1
+        if fail:
+            raise MockFailure(500, f"injected failure during {what}")
+
+    def acquire_slot(self):
+        """Queue for a processing slot, rejecting when the queue is full."""
+        with self._lock:
+            self.stats["requests"] += 1
+            if self._pending >= self.profile.max_queue:
+                self.stats["rejected"] += 1
+                raise MockFailure(503, "server busy, please try again.  maximum pending requests exceeded")
+            self._pending += 1
+            self.stats["max_pending"] = max(self.stats["max_pending"], self._pending)
+        self._slots.acquire()
+
+    def release_slot(self):
+        self._slots.release()
+        with self._lock:
+            self._pending -= 1
+
+    def require_installed(self, model: str):
+        if not model:
+            raise MockFailure(400, "model is required")
+        if model not in self.installed and not is_cloud_model(model):
+            raise MockFailure(404, f'model "{model}" not found, try pulling it first')
+
+    def ensure_loaded(self, model: str, keep_alive) -> float:
+        """Load the model if needed. Returns the load time actually slept."""
+        now = time.time()
+        with self._lock:
+            expiry = self.loaded.get(model, 0.0)
+            warm = model in self.loaded and (expiry is None or expiry > now)
+        load_s = 0.0
+        if not warm and not is_cloud_model(model):
+            load_s = self.sleep(self.profile.load_time_s)
+        keep_s = _parse_keep_alive(keep_alive)
+        with self._lock:
+            if keep_s == 0:
+                self.loaded.pop(model, None)
+            else:
+                self.loaded[model] = None if keep_s is None else time.time() + keep_s
+        return load_s
+
+    def unload(self, model: str):
+        with self._lock:
+            self.loaded.pop(model, None)
+
+    def installed_models(self) -> list[dict]:
+        with self._lock:
+            return list(self.installed.values())
+
+    def pull_offset(self, model: str, total: int) -> int:
+        """Bytes of the model already downloaded (all of them if it is installed)."""
+        with self._lock:
+            return total if model in self.installed else self.partial_pulls.get(model, 0)
+
+    def record_pull(self, model: str, done: int):
+        with self._lock:
+            self.partial_pulls[model] = done
+
+    def finish_pull(self, model: str, entry: dict):
+        with self._lock:
+            self.installed[model] = entry
+            self.partial_pulls.pop(model, None)
+
+    def running_models(self) -> list[dict]:
+        now = time.time()
+        with self._lock:
+            for model, expiry in list(self.loaded.items()):
+                if expiry is not None and expiry <= now:
+                    del self.loaded[model]
+            running = []
+            for model, expiry in self.loaded.items():
+                entry = self.installed.get(model) or self._model_entry(model)
+                expires_at = (datetime.fromtimestamp(expiry, timezone.utc).isoformat()
+                              if expiry is not None else "0001-01-01T00:00:00Z")
+                running.append({
+                    "name": model,
+                    "model": model,
+                    "size": entry["size"],
+                    "digest": entry["digest"],
+                    "expires_at": expires_at,
+                    "size_vram": entry["size"],
+                })
+        return running
+
+
+# ---------------------------------------------------------------------------
+# Scripted agent for /api/chat with tools
+# ---------------------------------------------------------------------------
+
+def _tool_history(messages: list[dict]) -> list[tuple[str, dict, object]]:
+    """Pair each assistant tool call with the tool result message that follows it."""
+    history = []
+    for i, msg in enumerate(messages):
+        if msg.get("role") != "assistant" or not msg.get("tool_calls"):
+            continue
+        results = []
+        for follow in messages[i + 1:]:
+            if follow.get("role") != "tool":
+                break
+            results.append(follow.get("content", ""))
+        for j, tc in enumerate(msg["tool_calls"]):
+            fn = tc.get("function", {})
+            raw = results[j] if j < len(results) else None
+            try:
+                parsed = json.loads(raw) if isinstance(raw, str) else raw
+            except json.JSONDecodeError:
+                parsed = raw
+            history.append((fn.get("name", ""), fn.get("arguments", {}), parsed))
+    return history
+
+
+def _portfolio_stages(pid: str, risk_config: dict):
+    """Ordered (name, build_args, result_key) stages for one portfolio.
+
+    build_args reads earlier results from a context dict and raises KeyError when
+    a dependency has not been returned yet, which ends the current turn's batch.
+    The stage's tool result is stored in the context under result_key.
+    """
+    def symbols(ctx):
+        return [h["symbol"] for h in ctx["holdings"].get("holdings", [])]
+
+    return [
+        ("get_portfolio_holdings", lambda ctx: {"portfolio_id": pid}, "holdings"),
+        ("calculate_volatility_score", lambda ctx: {"symbols": symbols(ctx), "days": 30}, "volatility"),
+        ("get_stock_prices", lambda ctx: {"symbols": symbols(ctx)}, "prices"),
+        ("calculate_portfolio_value", lambda ctx: {
+            "holdings": ctx["holdings"].get("holdings", []),
+            "current_prices": ctx["prices"],
+        }, "value"),
+        ("check_risk_threshold", lambda ctx: {
+            "portfolio_value": ctx["value"].get("total_value", 0),
+            "volatility_score": ctx["volatility"],
+            "risk_config": risk_config,
+        }, "risk"),
+        ("generate_report", lambda ctx: {
+            "portfolio_data": {
+                "portfolio_id": pid,
+                "client_name": ctx["holdings"].get("client_name", ""),
+                "total_value": ctx["value"].get("total_value", 0),
+                "volatility_score": ctx["volatility"],
+                "risk_level": ctx["risk"].get("risk_level", ""),
+                "exceeded_thresholds": ctx["risk"].get("exceeded_thresholds", []),
+                "positions": ctx["value"].get("positions", []),
+            },
+            "report_format": "markdown",
+        }, "report"),
+        ("send_notification", lambda ctx: {
+            "recipient": ctx["holdings"].get("manager_email", "manager@firm.com"),
+            "subject": f"High risk alert: {pid}",
+            "message": ctx["report"] if isinstance(ctx["report"], str) else json.dumps(ctx["report"]),
+            "priority": "high",
+        }, "notification"),
+        ("log_operation", lambda ctx: {
+            "operation": "risk_check",
+            "details": {"portfolio_id": pid, "risk_level": ctx["risk"].get("risk_level", "")},
+            "level": "info",
+        }, "log"),
+    ]
+
+
+def _is_high_risk(ctx: dict) -> bool:
+    risk = ctx.get("risk")
+    return isinstance(risk, dict) and bool(risk.get("is_high_risk"))
+
+
+def scripted_tool_calls(messages: list[dict], limit: int = 1) -> tuple[list[dict], list[tuple[str, dict]]]:
+    """Decide the next tool calls for the portfolio workflow.
+
+    Returns (tool_calls, outcomes). tool_calls is empty once every portfolio named
+    in the first user message has been processed; outcomes lists (portfolio_id,
+    risk result) for the final summary.
+    """
+    user_text = next((m.get("content", "") for m in messages if m.get("role") == "user"), "")
+    portfolios = list(dict.fromkeys(re.findall(r"PORT-\d+", user_text)))
+    risk_config = dict(_DEFAULT_RISK_CONFIG)
+    for key in risk_config:
+        match = re.search(rf"{key}\s*=\s*([\d.]+)", user_text)
+        if match:
+            risk_config[key] = float(match.group(1))
+
+    history = _tool_history(messages)
+    pos = 0
+    calls = []
+    outcomes = []
+    for pid in portfolios:
+        ctx = {}
+        for name, build, key in _portfolio_stages(pid, risk_config):
+            if name in ("generate_report", "send_notification") and "risk" in ctx and not _is_high_risk(ctx):
+                continue
+            if pos < len(history):
+                ctx[key] = history[pos][2]
+                pos += 1
+                continue
+            if len(calls) >= limit:
+                return calls, outcomes
+            try:
+                args = build(ctx)
+            except (KeyError, AttributeError, TypeError):
+                # Depends on a result that is not back yet
+                return calls, outcomes
+            calls.append({"function": {"name": name, "arguments": args}})
+        if calls:
+            return calls, outcomes
+        outcomes.append((pid, ctx.get("risk")))
+    return calls, outcomes
+
+
+def _final_summary(outcomes: list[tuple[str, object]]) -> str:
+    if not outcomes:
+        return "No portfolios were specified, so there is nothing to analyze."
+    lines = ["Risk analysis summary:", ""]
+    for pid, risk in outcomes:
+        if isinstance(risk, dict):
+            exceeded = ", ".join(risk.get("exceeded_thresholds", [])) or "none"
+            lines.append(f"- {pid}: {risk.get('risk_level', 'UNKNOWN')} risk (thresholds exceeded: {exceeded})")
+        else:
+            lines.append(f"- {pid}: risk check failed")
+    return "\n".join(lines)
+
+
+def _filler(num_tokens: int) -> list[str]:
+    """Synthetic response pieces, one per token."""
+    header = ["# Mock", " response\n\n", "```python\n", "print('mock output')\n", "```\n\n"]
+    pieces = header[:num_tokens]
+    words = ["lorem ", "ipsum ", "dolor ", "sit ", "amet ", "consectetur ", "adipiscing ", "elit "]
+    while len(pieces) < num_tokens:
+        pieces.append(words[len(pieces) % len(words)])
+    return pieces
+
+
+# ---------------------------------------------------------------------------
+# HTTP handler
+# ---------------------------------------------------------------------------
+
+class MockOllamaHandler(BaseHTTPRequestHandler):
+    server_version = "MockOllama/0.1"
+    state: MockOllamaState = None  # set by make_server
+    quiet = True
+
+    def log_message(self, fmt, *args):
+        if not self.quiet:
+            super().log_message(fmt, *args)
+
+    # -- plumbing -----------------------------------------------------------
+
+    def _send_json(self, status: int, payload: dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _start_stream(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+
+    def _write_line(self, payload: dict):
+        self.wfile.write(json.dumps(payload).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+    def _read_body(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        if not raw:
+            return {}
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError as e:
+            raise MockFailure(400, f"invalid JSON body: {e}")
+
+    def _dispatch(self, handler):
+        try:
+            handler()
+        except MockFailure as e:
+            self._send_json(e.status, {"error": e.message})
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client went away mid-stream
+
+    # -- routes -------------------------------------------------------------
+
+    def do_GET(self):
+        if self.path == "/":
+            body = b"Ollama is running"
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif self.path == "/api/tags":
+            self._send_json(200, {"models": self.state.installed_models()})
+        elif self.path == "/api/ps":
+            self._send_json(200, {"models": self.state.running_models()})
+        elif self.path == "/mock/stats":
+            self._send_json(200, {"profile": asdict(self.state.profile), **self.state.stats})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        routes = {
+            "/api/generate": self._handle_generate,
+            "/api/chat": self._handle_chat,
+            "/api/pull": self._handle_pull,
+        }
+        handler = routes.get(self.path)
+        if handler is None:
+            self._send_json(404, {"error": "not found"})
+            return
+        self._dispatch(handler)
+
+    # -- inference ----------------------------------------------------------
+
+    def _handle_generate(self):
+        body = self._read_body()
+        model = body.get("model", "")
+        prompt = body.get("prompt", "")
+        self.state.require_installed(model)
+
+        # Empty prompt = load/unload request
+        if not prompt:
+            if _parse_keep_alive(body.get("keep_alive")) == 0:
+                self.state.unload(model)
+                self._send_json(200, {"model": model, "created_at": _now_iso(), "response": "",
+                                      "done": True, "done_reason": "unload"})
+            else:
+                load_s = self.state.ensure_loaded(model, body.get("keep_alive"))
+                self._send_json(200, {"model": model, "created_at": _now_iso(), "response": "",
+                                      "done": True, "done_reason": "load",
+                                      "load_duration": int(load_s * 1e9)})
+            return
+
+        options = body.get("options") or {}
+        prompt_tokens = _estimate_tokens(prompt)
+        pieces = _filler(self._output_budget(options, prompt_tokens))
+        self._respond(model, body, prompt_tokens, pieces, chat=False)
+
+    def _handle_chat(self):
+        body = self._read_body()
+        model = body.get("model", "")
+        self.state.require_installed(model)
+        messages = body.get("messages") or []
+        tools = body.get("tools") or []
+        options = body.get("options") or {}
+
+        prompt_tokens = _estimate_tokens(json.dumps(messages) + (json.dumps(tools) if tools else ""))
+        tool_calls = []
+        if tools:
+            tool_calls, outcomes = scripted_tool_calls(messages, limit=max(1, self.state.profile.tool_calls_per_turn))
+            available = {t.get("function", {}).get("name") for t in tools}
+            tool_calls = [tc for tc in tool_calls if tc["function"]["name"] in available]
+            text = "" if tool_calls else _final_summary(outcomes)
+            pieces = [text[i:i + 4] for i in range(0, len(text), 4)]
+        else:
+            pieces = _filler(self._output_budget(options, prompt_tokens))
+        self._respond(model, body, prompt_tokens, pieces, chat=True, tool_calls=tool_calls)
+
+    def _output_budget(self, options: dict, prompt_tokens: int) -> int:
+        budget = self.state.profile.output_tokens
+        num_predict = options.get("num_predict")
+        if isinstance(num_predict, int) and num_predict > 0:
+            budget = min(budget, num_predict)
+        num_ctx = options.get("num_ctx")
+        if isinstance(num_ctx, int) and num_ctx > 0:
+            budget = max(1, min(budget, num_ctx - min(prompt_tokens, num_ctx)))
+        return budget
+
+    def _respond(self, model: str, body: dict, prompt_tokens: int, pieces: list[str],
+                 chat: bool, tool_calls: list[dict] | None = None):
+        state = self.state
+        profile = state.profile
+        stream = body.get("stream", True)
+        options = body.get("options") or {}
+        num_ctx = options.get("num_ctx")
+        if isinstance(num_ctx, int) and num_ctx > 0:
+            prompt_tokens = min(prompt_tokens, num_ctx)
+        tool_calls = tool_calls or []
+        eval_count = len(pieces) + sum(_estimate_tokens(json.dumps(tc)) for tc in tool_calls)
+
+        state.acquire_slot()
+        try:
+            request_start = time.time()
+            state.maybe_fail("model load")
+            load_s = state.ensure_loaded(model, body.get("keep_alive"))
+            state.sleep(profile.ttft_s)
+            prefill_s = state.sleep(prompt_tokens / profile.prefill_tps)
+            state.maybe_fail("generation")
+
+            def chunk(piece: str = "", calls: list | None = None) -> dict:
+                out = {"model": model, "created_at": _now_iso(), "done": False}
+                if chat:
+                    out["message"] = {"role": "assistant", "content": piece}
+                    if calls:
+                        out["message"]["tool_calls"] = calls
+                else:
+                    out["response"] = piece
+                return out
+
+            decode_start = time.time()
+            step = 1.0 / profile.decode_tps
+            if stream:
+                self._start_stream()
+                for piece in pieces:
+                    state.sleep(step)
+                    self._write_line(chunk(piece))
+                for tc in tool_calls:
+                    # Like Ollama, each tool call arrives complete in a chunk of its own
+                    state.sleep(step * _estimate_tokens(json.dumps(tc)))
+                    self._write_line(chunk("", [tc]))
+            else:
+                state.sleep(step * eval_count)
+            decode_s = time.time() - decode_start
+
+            total_s = time.time() - request_start
+            final = chunk("")
+            final.update({"done": True, "done_reason": "stop"})
+            if not stream:
+                if chat:
+                    final["message"]["content"] = "".join(pieces)
+                    if tool_calls:
+                        final["message"]["tool_calls"] = tool_calls
+                else:
+                    final["response"] = "".join(pieces)
+            final.update({
+                "total_duration": int(total_s * 1e9),
+                "load_duration": int(load_s * 1e9) if profile.server_timings else 0,
+                "prompt_eval_count": prompt_tokens,
+                "prompt_eval_duration": int(prefill_s * 1e9) if profile.server_timings else 0,
+                "eval_count": eval_count,
+                "eval_duration": int(decode_s * 1e9) if profile.server_timings else 0,
+            })
+            if stream:
+                self._write_line(final)
+            else:
+                self._send_json(200, final)
+        finally:
+            state.release_slot()
+
+    # -- registry -----------------------------------------------------------
+
+    def _handle_pull(self):
+        body = self._read_body()
+        model = body.get("model") or body.get("name") or ""
+        if not model:
+            raise MockFailure(400, "model is required")
+        stream = body.get("stream", True)
+        state = self.state
+        entry = state._model_entry(model)
+        total = entry["size"]
+        digest = f"sha256:{entry['digest']}"
+
+        if stream:
+            self._start_stream()
+            emit = self._write_line
+        else:
+            emit = lambda payload: None
+
+        emit({"status": "pulling manifest"})
+        done = state.pull_offset(model, total)
+        chunk_bytes = max(1, int(state.profile.pull_mbps * 1e6 * 0.25))
+        try:
+            while done < total:
+                step = min(chunk_bytes, total - done)
+                state.sleep(step / (state.profile.pull_mbps * 1e6))
+                state.maybe_fail(f"pull of {model}")
+                done += step
+                state.record_pull(model, done)
+                emit({"status": f"pulling {entry['digest'][:12]}", "digest": digest,
+                      "total": total, "completed": done})
+        except MockFailure as e:
+            if not stream:
+                raise
+            emit({"error": e.message})
+            return
+
+        emit({"status": "verifying sha256 digest"})
+        emit({"status": "writing manifest"})
+        state.finish_pull(model, entry)
+        if stream:
+            emit({"status": "success"})
+        else:
+            self._send_json(200, {"status": "success"})
+
+
+def make_server(host: str, port: int, state: MockOllamaState, quiet: bool = True) -> ThreadingHTTPServer:
+    """Create (but do not start) a mock server bound to host:port."""
+    handler = type("BoundMockOllamaHandler", (MockOllamaHandler,), {"state": state, "quiet": quiet})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a mock Ollama server for offline harness testing")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=11435, help="Port to listen on (default: 11435)")
+    parser.add_argument("--profile", type=str, default="gpu-small", choices=sorted(PROFILES),
+                        help="Base latency/throughput profile (default: gpu-small)")
+    for f in fields(MockProfile):
+        flag = "--" + f.name.replace("_", "-")
+        if f.type in ("bool", bool):
+            parser.add_argument(flag, type=lambda v: v.lower() in ("1", "true", "yes"), default=None,
+                                help=f"Override profile {f.name} (true/false)")
+        else:
+            kind = int if f.type in ("int", int) else float
+            parser.add_argument(flag, type=kind, default=None, help=f"Override profile {f.name}")
+    parser.add_argument("--empty", action="store_true",
+                        help="Start with no models installed (exercise pulls)")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for failure injection")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    overrides = {f.name: getattr(args, f.name) for f in fields(MockProfile)
+                 if getattr(args, f.name) is not None}
+    profile = replace(PROFILES[args.profile], **overrides)
+    installed = [] if args.empty else MODELS
+    state = MockOllamaState(profile, installed, seed=args.seed)
+    server = make_server(args.host, args.port, state, quiet=not args.verbose)
+
+    print("Mock Ollama server")
+    print("=" * 60)
+    print(f"Listening on http://{args.host}:{args.port}")
+    print(f"Profile: {args.profile} {json.dumps(asdict(profile))}")
+    print(f"Installed models: {len(state.installed)}")
+    print(f"Point the harness at it with OLLAMA_BASE_URL=http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"\nServed {state.stats['requests']} inference requests "
+              f"({state.stats['failures']} injected failures, {state.stats['rejected']} rejected)")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,8 @@ class GPUSnapshot:
     gpu_utilization_pct: float
     temperature_c: float
     cpu_percent: float
+    per_core_percent: list[float] = field(default_factory=list)
+    gpu_sampled: bool = True
 
 
 @dataclass
@@ -29,9 +31,12 @@ class GPUSummary:
     peak_cpu_pct: float = 0.0
     avg_cpu_pct: float = 0.0
     sample_count: int = 0
+    per_core_avg_pct: list[float] = field(default_factory=list)
+    per_core_peak_pct: list[float] = field(default_factory=list)
+    cpu_group_avg_pct: dict[str, float] = field(default_factory=dict)
 
     def to_dict(self) -> dict:
-        return {
+        d = {
             "peak_vram_mb": round(self.peak_vram_mb, 1),
             "avg_vram_mb": round(self.avg_vram_mb, 1),
             "avg_gpu_utilization_pct": round(self.avg_gpu_utilization_pct, 1),
@@ -41,13 +46,24 @@ class GPUSummary:
             "avg_cpu_pct": round(self.avg_cpu_pct, 1),
             "sample_count": self.sample_count,
         }
+        if self.per_core_avg_pct:
+            d["per_core_avg_pct"] = [round(v, 1) for v in self.per_core_avg_pct]
+            d["per_core_peak_pct"] = [round(v, 1) for v in self.per_core_peak_pct]
+        if self.cpu_group_avg_pct:
+            d["cpu_group_avg_pct"] = {k: round(v, 1) for k, v in self.cpu_group_avg_pct.items()}
+        return d
 
 
 class GPUMonitor:
-    """Polls nvidia-smi in a background thread to capture GPU metrics."""
+    """Polls nvidia-smi in a background thread to capture GPU metrics.
 
-    def __init__(self, poll_interval: float = 1.0):
+    CPU utilization (overall and per core) is sampled on every poll, with or without a GPU.
+    `cpu_groups` ({"node0": [0, 1, ...], "pinned": [...]}) adds average utilization per group.
+    """
+
+    def __init__(self, poll_interval: float = 1.0, cpu_groups: dict[str, list[int]] | None = None):
         self.poll_interval = poll_interval
+        self.cpu_groups = cpu_groups or {}
         self._snapshots: list[GPUSnapshot] = []
         self._running = False
         self._thread: threading.Thread | None = None
@@ -71,10 +87,21 @@ class GPUMonitor:
         """Continuously poll nvidia-smi and CPU until stopped."""
         # Prime psutil's cpu_percent (first call always returns 0.0)
         psutil.cpu_percent(interval=None)
+        psutil.cpu_percent(interval=None, percpu=True)
         while self._running:
             snapshot = self._query_gpu()
-            if snapshot:
-                self._snapshots.append(snapshot)
+            if snapshot is None:
+                # No GPU (or nvidia-smi failed): still record CPU
+                snapshot = GPUSnapshot(
+                    timestamp=time.time(),
+                    vram_used_mb=0.0,
+                    gpu_utilization_pct=0.0,
+                    temperature_c=0.0,
+                    cpu_percent=psutil.cpu_percent(interval=None),
+                    gpu_sampled=False,
+                )
+            snapshot.per_core_percent = psutil.cpu_percent(interval=None, percpu=True)
+            self._snapshots.append(snapshot)
             time.sleep(self.poll_interval)
 
     @staticmethod
@@ -129,11 +156,23 @@ class GPUMonitor:
         if not self._snapshots:
             return GPUSummary()
 
-        vram_values = [s.vram_used_mb for s in self._snapshots]
-        util_values = [s.gpu_utilization_pct for s in self._snapshots]
-        temp_values = [s.temperature_c for s in self._snapshots]
+        # GPU stats only from polls where nvidia-smi answered
+        gpu_snapshots = [s for s in self._snapshots if s.gpu_sampled] or [GPUSnapshot(0, 0.0, 0.0, 0.0, 0.0)]
+        vram_values = [s.vram_used_mb for s in gpu_snapshots]
+        util_values = [s.gpu_utilization_pct for s in gpu_snapshots]
+        temp_values = [s.temperature_c for s in gpu_snapshots]
         cpu_values = [s.cpu_percent for s in self._snapshots]
 
+        per_core = [s.per_core_percent for s in self._snapshots if s.per_core_percent]
+        n_cores = min((len(pc) for pc in per_core), default=0)
+        per_core_avg = [sum(pc[i] for pc in per_core) / len(per_core) for i in range(n_cores)]
+        per_core_peak = [max(pc[i] for pc in per_core) for i in range(n_cores)]
+        group_avg = {}
+        for name, cpus in self.cpu_groups.items():
+            values = [per_core_avg[c] for c in cpus if c < n_cores]
+            if values:
+                group_avg[name] = sum(values) / len(values)
+
         return GPUSummary(
             peak_vram_mb=max(vram_values),
             avg_vram_mb=sum(vram_values) / len(vram_values),
@@ -143,6 +182,9 @@ class GPUMonitor:
             peak_cpu_pct=max(cpu_values),
             avg_cpu_pct=sum(cpu_values) / len(cpu_values),
             sample_count=len(self._snapshots),
+            per_core_avg_pct=per_core_avg,
+            per_core_peak_pct=per_core_peak,
+            cpu_group_avg_pct=group_avg,
         )
 
 
@@ -0,0 +1,213 @@
+"""Pluggable launchers that run or attach to an Ollama server pinned to chosen cores / NUMA nodes.
+
+  attach   pin the already-running Ollama processes with psutil cpu_affinity (Linux/Windows).
+           Runner processes Ollama starts later inherit the server's affinity. Memory can't
+           be re-bound on a running process, so attach only controls CPU placement.
+  taskset  start `taskset -c CPUS ollama serve`
+  numactl  start `numactl --cpunodebind=N --membind=N ollama serve` (or --physcpubind=CPUS)
+
+Spawned servers listen on the host:port of OLLAMA_BASE_URL, so stop any running Ollama
+first (or point OLLAMA_BASE_URL at a free port). Add a launcher by subclassing
+OllamaLauncher and registering it in LAUNCHERS.
+"""
+
+import os
+import shutil
+import subprocess
+import time
+from urllib.parse import urlparse
+
+import psutil
+import requests
+
+from config import OLLAMA_BASE_URL
+from cpu_topology import format_cpulist, node_cpus
+
+
+class LauncherError(RuntimeError):
+    """Raised when a launcher can't start, pin or reach the Ollama server."""
+
+
+class OllamaLauncher:
+    """Base launcher. Subclasses implement start()/stop() and may extend describe()."""
+
+    name = "base"
+
+    def __init__(self, topology: dict, cpus: list[int] | None = None, numa_node: int | None = None):
+        self.topology = topology
+        self.numa_node = numa_node
+        if cpus is None and numa_node is not None:
+            cpus = node_cpus(topology, numa_node)
+        self.cpus = sorted(cpus) if cpus else None
+
+    def start(self):
+        raise NotImplementedError
+
+    def stop(self):
+        pass
+
+    def describe(self) -> dict:
+        """Pinning details recorded in metrics.json."""
+        return {
+            "launcher": self.name,
+            "cpus": format_cpulist(self.cpus) if self.cpus else None,
+            "cpu_count": len(self.cpus) if self.cpus else None,
+            "numa_node": self.numa_node,
+            "memory_bound": False,
+        }
+
+
+class AttachLauncher(OllamaLauncher):
+    """Pin the running Ollama server (and any runners) via psutil cpu_affinity."""
+
+    name = "attach"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._original: dict[int, list[int]] = {}
+
+    @staticmethod
+    def _ollama_processes() -> list[psutil.Process]:
+        procs = []
+        for proc in psutil.process_iter(["name"]):
+            name = (proc.info.get("name") or "").lower()
+            if name.startswith("ollama"):
+                procs.append(proc)
+        return procs
+
+    def start(self):
+        if not self.cpus:
+            raise LauncherError("attach launcher needs --cpu-affinity or --numa-node")
+        if not hasattr(psutil.Process, "cpu_affinity"):
+            raise LauncherError("CPU affinity is not supported on this platform (psutil has no cpu_affinity)")
+        procs = self._ollama_processes()
+        if not procs:
+            raise LauncherError("No running Ollama process found to attach to")
+        for proc in procs:
+            try:
+                self._original[proc.pid] = proc.cpu_affinity()
+                proc.cpu_affinity(self.cpus)
+            except (psutil.AccessDenied, psutil.NoSuchProcess) as e:
+                self.stop()  # put back the processes already pinned
+                raise LauncherError(f"Could not pin Ollama process {proc.pid}: {e}")
+        print(f"  Pinned {len(procs)} Ollama process(es) to CPUs {format_cpulist(self.cpus)}")
+        if self.numa_node is not None:
+            print("  Note: attach cannot re-bind memory of a running server; use --launcher numactl for --membind")
+
+    def stop(self):
+        for pid, cpus in self._original.items():
+            try:
+                psutil.Process(pid).cpu_affinity(cpus)
+            except (psutil.AccessDenied, psutil.NoSuchProcess):
+                pass
+        self._original = {}
+
+    def describe(self) -> dict:
+        info = super().describe()
+        info["pinned_pids"] = sorted(self._original)
+        return info
+
+
+class SpawnLauncher(OllamaLauncher):
+    """Start `ollama serve` under a command prefix and stop it afterwards."""
+
+    ready_timeout_s = 60
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._proc: subprocess.Popen | None = None
+
+    def prefix(self) -> list[str]:
+        raise NotImplementedError
+
+    def start(self):
+        tool = self.prefix()[0]
+        if shutil.which(tool) is None:
+            raise LauncherError(f"'{tool}' not found on PATH")
+        if shutil.which("ollama") is None:
+            raise LauncherError("'ollama' not found on PATH")
+        if _server_up():
+            raise LauncherError(
+                f"An Ollama server is already listening on {OLLAMA_BASE_URL}. Stop it first, "
+                "point OLLAMA_BASE_URL at a free port, or use --launcher attach"
+            )
+
+        parsed = urlparse(OLLAMA_BASE_URL)
+        env = dict(os.environ, OLLAMA_HOST=f"{parsed.hostname}:{parsed.port or 11434}")
+        cmd = self.prefix() + ["ollama", "serve"]
+        print(f"  Starting: {' '.join(cmd)}")
+        self._proc = subprocess.Popen(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        deadline = time.time() + self.ready_timeout_s
+        while time.time() < deadline:
+            if self._proc.poll() is not None:
+                raise LauncherError(f"'{' '.join(cmd)}' exited with code {self._proc.returncode}")
+            if _server_up():
+                return
+            time.sleep(0.5)
+        self.stop()
+        raise LauncherError(f"Ollama did not become ready within {self.ready_timeout_s}s")
+
+    def stop(self):
+        if self._proc is None:
+            return
+        self._proc.terminate()
+        try:
+            self._proc.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+        self._proc = None
+
+    def describe(self) -> dict:
+        info = super().describe()
+        info["command"] = " ".join(self.prefix() + ["ollama", "serve"])
+        return info
+
+
+class TasksetLauncher(SpawnLauncher):
+    name = "taskset"
+
+    def prefix(self) -> list[str]:
+        if not self.cpus:
+            raise LauncherError("taskset launcher needs --cpu-affinity or --numa-node")
+        return ["taskset", "-c", format_cpulist(self.cpus)]
+
+
+class NumactlLauncher(SpawnLauncher):
+    name = "numactl"
+
+    def prefix(self) -> list[str]:
+        cmd = ["numactl"]
+        if self.numa_node is not None:
+            cmd += [f"--cpunodebind={self.numa_node}", f"--membind={self.numa_node}"]
+        if self.cpus and (self.numa_node is None or self.cpus != node_cpus(self.topology, self.numa_node)):
+            cmd.append(f"--physcpubind={format_cpulist(self.cpus)}")
+        if len(cmd) == 1:
+            raise LauncherError("numactl launcher needs --numa-node and/or --cpu-affinity")
+        return cmd
+
+    def describe(self) -> dict:
+        info = super().describe()
+        info["memory_bound"] = self.numa_node is not None
+        return info
+
+
+LAUNCHERS = {
+    "attach": AttachLauncher,
+    "taskset": TasksetLauncher,
+    "numactl": NumactlLauncher,
+}
+
+
+def make_launcher(name: str, topology: dict, cpus: list[int] | None = None,
+                  numa_node: int | None = None) -> OllamaLauncher:
+    if name not in LAUNCHERS:
+        raise LauncherError(f"Unknown launcher '{name}'. Available: {sorted(LAUNCHERS)}")
+    return LAUNCHERS[name](topology, cpus=cpus, numa_node=numa_node)
+
+
+def _server_up() -> bool:
+    try:
+        return requests.get(OLLAMA_BASE_URL, timeout=2).status_code == 200
+    except requests.RequestException:
+        return False
@@ -0,0 +1,117 @@
+"""Per-phase timing and optional profiler dumps for the benchmark harness.
+
+The harness only used to time the model call itself. PhaseTimer records how
+long every other step of a run takes (prompt loading, monitor start/stop,
+serialization, post-processing, unload) so harness overhead can be separated
+from model time in metrics.json.
+"""
+
+import os
+import time
+from contextlib import contextmanager, nullcontext
+
+# Phases that measure time spent waiting on the model server; everything else is harness overhead
+MODEL_PHASES = {"generation", "chat_request"}
+
+PROFILERS = ["cprofile", "pyinstrument"]
+
+
+class PhaseTimer:
+    """Accumulates named spans. Repeated spans with the same name are summed."""
+
+    def __init__(self):
+        self._created = time.time()
+        self._totals: dict[str, float] = {}
+        self._counts: dict[str, int] = {}
+        self._intervals: dict[str, list[tuple[float, float]]] = {}
+
+    @contextmanager
+    def span(self, name: str):
+        """Time the enclosed block under `name`."""
+        wall_start = time.time()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start, wall_start)
+
+    def add(self, name: str, duration_s: float, wall_start: float | None = None):
+        """Record an externally measured duration."""
+        if wall_start is None:
+            wall_start = time.time() - duration_s
+        self._totals[name] = self._totals.get(name, 0.0) + duration_s
+        self._counts[name] = self._counts.get(name, 0) + 1
+        self._intervals.setdefault(name, []).append((wall_start, wall_start + duration_s))
+
+    def intervals(self, name: str) -> list[tuple[float, float]]:
+        """(start, end) wall-clock timestamps of every span recorded under `name`."""
+        return list(self._intervals.get(name, []))
+
+    def phase_names(self) -> list[str]:
+        """Recorded phase names in first-seen order."""
+        return list(self._totals)
+
+    def total(self, name: str) -> float:
+        return self._totals.get(name, 0.0)
+
+    def to_dict(self) -> dict:
+        """Summary for metrics.json: per-phase totals plus model vs harness split."""
+        elapsed = time.time() - self._created
+        model_s = sum(v for k, v in self._totals.items() if k in MODEL_PHASES)
+        overhead_s = max(0.0, elapsed - model_s)
+        return {
+            "phases": {
+                name: {"total_s": round(total, 4), "count": self._counts[name]}
+                for name, total in self._totals.items()
+            },
+            "harness_total_s": round(elapsed, 2),
+            "model_s": round(model_s, 2),
+            "overhead_s": round(overhead_s, 2),
+            "overhead_pct": round(100 * overhead_s / elapsed, 1) if elapsed > 0 else 0,
+        }
+
+
+def timed(timer: PhaseTimer | None, name: str):
+    """timer.span(name), or a no-op context when no timer is attached."""
+    return timer.span(name) if timer is not None else nullcontext()
+
+
+class RunProfiler:
+    """Optional cProfile/pyinstrument capture around a single benchmark run."""
+
+    def __init__(self, kind: str | None):
+        self.kind = kind
+        self._profiler = None
+        if kind == "pyinstrument":
+            try:
+                import pyinstrument  # noqa: F401
+            except ImportError:
+                print("  Warning: pyinstrument not installed, falling back to cProfile")
+                self.kind = "cprofile"
+
+    def start(self):
+        if self.kind == "cprofile":
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        elif self.kind == "pyinstrument":
+            from pyinstrument import Profiler
+            self._profiler = Profiler()
+            self._profiler.start()
+
+    def stop(self, output_dir: str) -> str | None:
+        """Stop profiling and dump to output_dir. Returns the dump path."""
+        if self._profiler is None:
+            return None
+        os.makedirs(output_dir, exist_ok=True)
+        if self.kind == "cprofile":
+            self._profiler.disable()
+            path = os.path.join(output_dir, "profile.prof")
+            self._profiler.dump_stats(path)
+        else:
+            self._profiler.stop()
+            path = os.path.join(output_dir, "profile.html")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(self._profiler.output_html())
+        self._profiler = None
+        return path
@@ -0,0 +1,233 @@
+"""Power sampling and per-phase energy integration.
+
+Readers are pluggable. Each one returns either an instantaneous power in watts
+(kind "power", e.g. nvidia-smi power.draw) or a cumulative energy counter in joules
+(kind "energy", e.g. RAPL energy_uj under /sys/class/powercap). PowerMonitor polls
+every reader in a background thread. Energy over any wall-clock interval (such as a
+PhaseTimer span) is then the trapezoid integral of the power samples, or the
+difference of the interpolated counter values.
+
+RAPL counters are root-readable only on most distros since 2020. When no reader
+is usable the monitor is simply empty and no energy block is written.
+"""
+
+import glob
+import os
+import subprocess
+import threading
+import time
+
+from phase_timer import MODEL_PHASES
+
+POWERCAP_ROOT = "/sys/class/powercap"
+
+
+class PowerReader:
+    """Base reader. sample() returns watts (kind "power") or cumulative joules (kind "energy")."""
+
+    name = "base"
+    kind = "power"
+    source = ""
+
+    def available(self) -> bool:
+        return self.sample() is not None
+
+    def sample(self) -> float | None:
+        raise NotImplementedError
+
+
+class NvidiaSmiPowerReader(PowerReader):
+    """Board power of all NVIDIA GPUs (summed) from nvidia-smi power.draw."""
+
+    name = "gpu"
+    kind = "power"
+    source = "nvidia-smi power.draw"
+
+    def __init__(self, command: list[str] | None = None):
+        self.command = command or ["nvidia-smi", "--query-gpu=power.draw", "--format=csv,noheader,nounits"]
+
+    def sample(self) -> float | None:
+        try:
+            result = subprocess.run(self.command, capture_output=True, text=True, timeout=5)
+            if result.returncode != 0:
+                return None
+            return sum(float(line.strip()) for line in result.stdout.strip().splitlines() if line.strip())
+        except (subprocess.TimeoutExpired, FileNotFoundError, ValueError):
+            return None
+
+
+class RaplEnergyReader(PowerReader):
+    """One powercap/RAPL domain (e.g. package-0). Handles counter wrap-around."""
+
+    kind = "energy"
+    source = "rapl"
+
+    def __init__(self, domain_dir: str):
+        self.domain_dir = domain_dir
+        label = _read_text(os.path.join(domain_dir, "name")) or os.path.basename(domain_dir)
+        self.name = f"cpu-{label}"
+        max_range = _read_text(os.path.join(domain_dir, "max_energy_range_uj"))
+        self._max_uj = int(max_range) if max_range and max_range.isdigit() else None
+        self._last_uj: int | None = None
+        self._total_j = 0.0
+
+    def sample(self) -> float | None:
+        raw = _read_text(os.path.join(self.domain_dir, "energy_uj"))
+        if raw is None or not raw.isdigit():
+            return None
+        uj = int(raw)
+        if self._last_uj is not None:
+            delta = uj - self._last_uj
+            if delta < 0 and self._max_uj:
+                delta += self._max_uj
+            self._total_j += max(delta, 0) / 1e6
+        self._last_uj = uj
+        return self._total_j
+
+
+def _read_text(path: str) -> str | None:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def detect_power_readers(powercap_root: str = POWERCAP_ROOT) -> list[PowerReader]:
+    """All readers usable on this machine: NVIDIA board power plus readable RAPL package domains."""
+    readers: list[PowerReader] = []
+    gpu = NvidiaSmiPowerReader()
+    if gpu.available():
+        readers.append(gpu)
+    # Top-level zones only (intel-rapl:0, not the intel-rapl:0:0 subzones already counted in the package)
+    for domain in sorted(glob.glob(os.path.join(powercap_root, "*-rapl:[0-9]*"))):
+        if ":" in os.path.basename(domain).split("rapl:", 1)[1]:
+            continue
+        reader = RaplEnergyReader(domain)
+        if reader.available():
+            readers.append(reader)
+    return readers
+
+
+def _interpolate(samples: list[tuple[float, float]], t: float) -> float:
+    """Value at time t, linear between samples and clamped outside them."""
+    if t <= samples[0][0]:
+        return samples[0][1]
+    if t >= samples[-1][0]:
+        return samples[-1][1]
+    for (t0, v0), (t1, v1) in zip(samples, samples[1:]):
+        if t0 <= t <= t1:
+            return v0 if t1 == t0 else v0 + (v1 - v0) * (t - t0) / (t1 - t0)
+    return samples[-1][1]
+
+
+class PowerMonitor:
+    """Polls power readers in a background thread and integrates energy over intervals."""
+
+    def __init__(self, readers: list[PowerReader] | None = None, poll_interval: float = 0.5):
+        self.readers = readers if readers is not None else detect_power_readers()
+        self.poll_interval = poll_interval
+        self._samples: dict[str, list[tuple[float, float]]] = {r.name: [] for r in self.readers}
+        self._running = False
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        if not self.readers:
+            return
+        self._samples = {r.name: [] for r in self.readers}
+        self._poll()
+        self._running = True
+        self._thread = threading.Thread(target=self._poll_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+            self._poll()
+
+    def _poll(self):
+        for reader in self.readers:
+            value = reader.sample()
+            if value is not None:
+                self._samples[reader.name].append((time.time(), value))
+
+    def _poll_loop(self):
+        while self._running:
+            time.sleep(self.poll_interval)
+            self._poll()
+
+    def energy_j(self, reader: PowerReader, start: float, end: float) -> float | None:
+        """Joules drawn by one reader's domain between two wall-clock timestamps."""
+        samples = self._samples.get(reader.name, [])
+        if len(samples) < 2:
+            return None
+        # Only the monitored window counts; spans outside it (e.g. save, unload) have no samples
+        start, end = max(start, samples[0][0]), min(end, samples[-1][0])
+        if end <= start:
+            return None
+        if reader.kind == "energy":
+            return _interpolate(samples, end) - _interpolate(samples, start)
+        points = [(start, _interpolate(samples, start))]
+        points += [(t, w) for t, w in samples if start < t < end]
+        points.append((end, _interpolate(samples, end)))
+        return sum((t1 - t0) * (w0 + w1) / 2 for (t0, w0), (t1, w1) in zip(points, points[1:]))
+
+    def intervals_energy(self, intervals: list[tuple[float, float]]) -> dict[str, float]:
+        """Joules per reader summed over a list of (start, end) intervals."""
+        totals = {}
+        for reader in self.readers:
+            values = [self.energy_j(reader, start, end) for start, end in intervals]
+            values = [v for v in values if v is not None]
+            if values:
+                totals[reader.name] = sum(values)
+        return totals
+
+    def summarize(self, timer, metrics: dict) -> dict | None:
+        """Energy block for metrics.json, integrated over the PhaseTimer's spans.
+
+        Model-phase energy (generation / chat_request spans) is split into prefill and
+        decode in proportion to Ollama's prompt_eval_duration and eval_duration, i.e.
+        assuming roughly constant power within a request.
+        """
+        if not any(len(s) >= 2 for s in self._samples.values()):
+            return None
+
+        phases = {}
+        for name in timer.phase_names():
+            per_reader = self.intervals_energy(timer.intervals(name))
+            if per_reader:
+                phases[name] = round(sum(per_reader.values()), 2)
+
+        model_intervals = [iv for name in MODEL_PHASES for iv in timer.intervals(name)]
+        model_by_reader = self.intervals_energy(model_intervals)
+        model_j = sum(model_by_reader.values())
+        model_s = sum(end - start for start, end in model_intervals)
+
+        energy = {
+            "readers": {r.name: r.source for r in self.readers},
+            "phases_j": phases,
+            "model_j": round(model_j, 2),
+            "model_j_by_reader": {k: round(v, 2) for k, v in model_by_reader.items()},
+            "avg_model_power_w": round(model_j / model_s, 1) if model_s > 0 else None,
+        }
+
+        breakdown = metrics.get("timing_breakdown") or {}
+        tokens = metrics.get("tokens", {})
+        prefill_s, decode_s = breakdown.get("prefill_s") or 0, breakdown.get("decode_s") or 0
+        if breakdown.get("server_timings") and prefill_s + decode_s > 0:
+            prefill_j = model_j * prefill_s / (prefill_s + decode_s)
+            decode_j = model_j - prefill_j
+            energy["prefill_j"] = round(prefill_j, 2)
+            energy["decode_j"] = round(decode_j, 2)
+            if tokens.get("prompt_eval_count"):
+                energy["joules_per_prefill_token"] = round(prefill_j / tokens["prompt_eval_count"], 5)
+            if tokens.get("eval_count"):
+                energy["joules_per_generated_token"] = round(decode_j / tokens["eval_count"], 4)
+        elif tokens.get("eval_count"):
+            # No server split (cloud): charge the whole request to generated tokens
+            energy["joules_per_generated_token"] = round(model_j / tokens["eval_count"], 4)
+        if model_j > 0 and tokens.get("eval_count"):
+            energy["generated_tokens_per_joule"] = round(tokens["eval_count"] / model_j, 3)
+        return energy
@@ -0,0 +1,237 @@
+"""Concurrent model puller with retries, aggregated progress and throughput records.
+
+Pulls run on a bounded thread pool against the streaming /api/pull endpoint. Every
+progress line carries a layer digest with total/completed bytes; those are aggregated
+across all active pulls into one status line. A failed pull is retried with exponential
+backoff. Ollama keeps partially downloaded blobs, so a retry resumes where the previous
+attempt stopped. Each finished pull is appended to reports/pull_log.jsonl with its
+size, duration and download throughput.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+
+import requests
+
+from config import OLLAMA_PULL_URL, PULL_LOG_PATH
+
+# How often the aggregated status line is redrawn
+PROGRESS_INTERVAL_S = 0.5
+# Stream errors that another attempt cannot fix (unknown model or tag, bad name, no access)
+PERMANENT_PULL_ERRORS = (
+    "file does not exist",
+    "manifest unknown",
+    "not found",
+    "invalid model name",
+    "unauthorized",
+    "requires a newer version",
+)
+
+
+def is_retryable_pull_error(message: str) -> bool:
+    """False for /api/pull errors that will fail the same way on every attempt."""
+    message = message.lower()
+    return not any(pattern in message for pattern in PERMANENT_PULL_ERRORS)
+
+
+@dataclass
+class PullResult:
+    """Outcome of one model pull (all attempts)."""
+    model: str
+    ok: bool
+    attempts: int = 0
+    total_bytes: int = 0
+    downloaded_bytes: int = 0       # Bytes actually transferred (excludes resumed/cached layers)
+    elapsed_s: float = 0.0
+    backoff_s: float = 0.0          # Time spent waiting between attempts (part of elapsed_s)
+    throughput_mbps: float = 0.0    # downloaded MB / (elapsed - backoff) s
+    error: str | None = None
+    finished_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class PullError(RuntimeError):
+    """A pull attempt failed. `retryable` is False for client errors such as an unknown model."""
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class PullProgress:
+    """Thread-safe per-model, per-layer byte counts rendered as one status line."""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._layers: dict[str, dict[str, tuple[int, int]]] = {}   # model -> digest -> (completed, total)
+        self._status: dict[str, str] = {}
+        self._started = time.time()
+        self._downloaded = 0
+        self._last_draw = 0.0
+        self._width = 0
+
+    def begin(self, model: str):
+        with self._lock:
+            self._layers.setdefault(model, {})
+            self._status[model] = "starting"
+
+    def update(self, model: str, data: dict) -> int:
+        """Record one /api/pull progress line; returns newly downloaded bytes."""
+        new_bytes = 0
+        with self._lock:
+            self._status[model] = data.get("status", self._status.get(model, ""))
+            digest = data.get("digest")
+            if digest and "total" in data:
+                completed = data.get("completed", 0)
+                previous, _ = self._layers.setdefault(model, {}).get(digest, (None, 0))
+                if previous is not None:
+                    new_bytes = max(0, completed - previous)
+                self._layers[model][digest] = (completed, data["total"])
+                self._downloaded += new_bytes
+        self._draw()
+        return new_bytes
+
+    def finish(self, model: str, message: str):
+        with self._lock:
+            self._layers.pop(model, None)
+            self._status.pop(model, None)
+        self.message(message)
+
+    def _draw(self, force: bool = False):
+        if not self.enabled:
+            return
+        now = time.time()
+        with self._lock:
+            if not force and now - self._last_draw < PROGRESS_INTERVAL_S:
+                return
+            self._last_draw = now
+            completed = sum(c for layers in self._layers.values() for c, _ in layers.values())
+            total = sum(t for layers in self._layers.values() for _, t in layers.values())
+            rate = self._downloaded / 1e6 / max(now - self._started, 1e-6)
+            parts = []
+            for model, layers in self._layers.items():
+                m_total = sum(t for _, t in layers.values())
+                m_done = sum(c for c, _ in layers.values())
+                parts.append(f"{model} {100 * m_done / m_total:.0f}%" if m_total else f"{model} {self._status.get(model, '')}")
+            line = (f"  [{len(self._layers)} active] {completed / 1e9:.2f}/{total / 1e9:.2f} GB "
+                    f"@ {rate:.1f} MB/s | " + ", ".join(parts))
+            self._write(line)
+
+    def _write(self, line: str):
+        padding = max(0, self._width - len(line))
+        sys.stdout.write("\r" + line + " " * padding)
+        sys.stdout.flush()
+        self._width = len(line)
+
+    def message(self, message: str):
+        with self._lock:
+            if self.enabled and self._width:
+                sys.stdout.write("\r" + " " * self._width + "\r")
+                self._width = 0
+            print(message, flush=True)
+
+
+class PullManager:
+    """Pull models concurrently (at most `max_concurrent` at a time) with retries."""
+
+    def __init__(self, max_concurrent: int = 2, retries: int = 3, backoff_s: float = 5.0,
+                 show_progress: bool = True, log_path: str | None = PULL_LOG_PATH):
+        self.max_concurrent = max(1, max_concurrent)
+        self.retries = max(0, retries)
+        self.backoff_s = backoff_s
+        self.log_path = log_path
+        self.progress = PullProgress(enabled=show_progress)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent, thread_name_prefix="pull")
+        self._log_lock = threading.Lock()
+
+    def submit(self, model: str) -> Future:
+        """Queue a pull; the future resolves to a PullResult."""
+        return self._executor.submit(self.pull, model)
+
+    def pull_all(self, models: list[str]) -> list[PullResult]:
+        """Pull every model and wait for all of them. Results are in input order."""
+        futures = [self.submit(m) for m in models]
+        return [f.result() for f in futures]
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def pull(self, model: str) -> PullResult:
+        """Pull one model, retrying with exponential backoff."""
+        result = PullResult(model=model, ok=False)
+        start = time.time()
+        self.progress.begin(model)
+        for attempt in range(self.retries + 1):
+            result.attempts = attempt + 1
+            try:
+                self._pull_once(model, result)
+                result.ok = True
+                result.error = None
+                break
+            except PullError as e:
+                result.error = str(e)
+                if not e.retryable or attempt == self.retries:
+                    break
+                delay = self.backoff_s * (2 ** attempt)
+                self.progress.message(f"  Retry {attempt + 1}/{self.retries} for {model} in {delay:.0f}s: {e}")
+                time.sleep(delay)
+                result.backoff_s += delay
+
+        result.elapsed_s = round(time.time() - start, 2)
+        result.backoff_s = round(result.backoff_s, 2)
+        transfer_s = result.elapsed_s - result.backoff_s
+        if transfer_s > 0:
+            result.throughput_mbps = round(result.downloaded_bytes / 1e6 / transfer_s, 2)
+        result.finished_at = datetime.now().isoformat()
+        if result.ok:
+            self.progress.finish(model, f"  Pulled {model}: {result.downloaded_bytes / 1e9:.2f} GB in "
+                                        f"{result.elapsed_s:.1f}s ({result.throughput_mbps} MB/s)")
+        else:
+            self.progress.finish(model, f"  FAILED to pull {model} after {result.attempts} attempt(s): {result.error}")
+        self._log(result)
+        return result
+
+    def _pull_once(self, model: str, result: PullResult):
+        try:
+            resp = requests.post(OLLAMA_PULL_URL, json={"name": model, "stream": True},
+                                 stream=True, timeout=(10, 300))
+        except requests.RequestException as e:
+            raise PullError(f"request failed: {e}")
+        with resp:
+            if resp.status_code >= 400:
+                raise PullError(f"HTTP {resp.status_code}: {resp.text[:200]}",
+                                retryable=resp.status_code >= 500 or resp.status_code == 429)
+            layers: dict[str, int] = {}
+            try:
+                for line in resp.iter_lines():
+                    if not line:
+                        continue
+                    data = json.loads(line)
+                    if "error" in data:
+                        raise PullError(data["error"], retryable=is_retryable_pull_error(data["error"]))
+                    result.downloaded_bytes += self.progress.update(model, data)
+                    if data.get("digest") and "total" in data:
+                        layers[data["digest"]] = data["total"]
+                        result.total_bytes = sum(layers.values())
+                    if data.get("status") == "success":
+                        return
+            except (requests.RequestException, json.JSONDecodeError) as e:
+                raise PullError(f"stream interrupted: {e}")
+        raise PullError("stream ended without success")
+
+    def _log(self, result: PullResult):
+        if not self.log_path:
+            return
+        with self._log_lock:
+            os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(result.to_dict()) + "\n")
@@ -1,5 +1,6 @@
-"""Pull recommended models from Ollama."""
+"""Pull recommended models from Ollama (several at a time, with retries)."""
 
+import argparse
 import os
 import sys
 
@@ -7,7 +8,8 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 import requests
-from config import OLLAMA_PULL_URL, OLLAMA_LIST_URL, MODELS_TO_PULL
+from config import OLLAMA_LIST_URL, MODELS_TO_PULL, PULL_CONCURRENCY, PULL_RETRIES
+from pull_manager import PullManager
 
 
 def get_installed_models() -> set[str]:
@@ -22,43 +24,17 @@ def get_installed_models() -> set[str]:
         return set()
 
 
-def pull_model(model: str) -> bool:
-    """Pull a single model from Ollama. Returns True on success."""
-    print(f"\n{'='*60}")
-    print(f"Pulling: {model}")
-    print(f"{'='*60}")
-
-    try:
-        resp = requests.post(
-            OLLAMA_PULL_URL,
-            json={"name": model, "stream": True},
-            stream=True,
-            timeout=3600,
-        )
-        resp.raise_for_status()
-
-        for line in resp.iter_lines():
-            if line:
-                import json
-                data = json.loads(line)
-                status = data.get("status", "")
-                if "completed" in data and "total" in data:
-                    total = data["total"]
-                    completed = data["completed"]
-                    pct = (completed / total * 100) if total > 0 else 0
-                    print(f"\r  {status}: {pct:.1f}% ({completed}/{total})", end="", flush=True)
-                else:
-                    print(f"\r  {status}", end="", flush=True)
-
-        print(f"\n  Done: {model}")
-        return True
-
-    except requests.RequestException as e:
-        print(f"\n  FAILED: {model} - {e}")
-        return False
-
-
 def main():
+    parser = argparse.ArgumentParser(description="Pull recommended models from Ollama")
+    parser.add_argument("--models", type=str, default=None,
+                        help="Comma-separated list of models (default: MODELS_TO_PULL in config)")
+    parser.add_argument("--concurrency", type=int, default=PULL_CONCURRENCY,
+                        help=f"Models downloaded at the same time (default: {PULL_CONCURRENCY})")
+    parser.add_argument("--retries", type=int, default=PULL_RETRIES,
+                        help=f"Retries per model with exponential backoff (default: {PULL_RETRIES})")
+    args = parser.parse_args()
+    models = [m.strip() for m in args.models.split(",")] if args.models else MODELS_TO_PULL
+
     print("Ollama Model Puller")
     print("=" * 60)
 
@@ -69,7 +45,7 @@ def main():
             print(f"  - {m}")
 
     to_pull = []
-    for model in MODELS_TO_PULL:
+    for model in models:
         if model in installed:
             print(f"  Skipping (already installed): {model}")
         else:
@@ -83,17 +59,18 @@ def main():
     for m in to_pull:
         print(f"  - {m}")
 
-    print(f"\nStarting downloads...")
-    success = 0
-    failed = 0
-    for model in to_pull:
-        if pull_model(model):
-            success += 1
-        else:
-            failed += 1
+    print(f"\nStarting downloads ({args.concurrency} at a time)...")
+    manager = PullManager(max_concurrent=args.concurrency, retries=args.retries)
+    results = manager.pull_all(to_pull)
+    manager.shutdown()
+    success = sum(1 for r in results if r.ok)
+    failed = len(results) - success
 
     print(f"\n{'='*60}")
     print(f"Results: {success} succeeded, {failed} failed out of {len(to_pull)}")
+    for r in results:
+        status = f"{r.throughput_mbps} MB/s, {r.attempts} attempt(s)" if r.ok else f"FAILED: {r.error}"
+        print(f"  {r.model}: {r.downloaded_bytes / 1e9:.2f} GB in {r.elapsed_s}s ({status})")
     if failed > 0:
         sys.exit(1)
 
@@ -0,0 +1,184 @@
+"""Quantization comparison: the same base model at different quant levels.
+
+Models are grouped into families with config.get_quant_info (the quant comes from the
+tag, e.g. hf.co/DevQuasar/Nanbeige.Nanbeige4.1-3B-GGUF:q6_K -> Q6_K; library tags like
+qwen3:8b count as Ollama's default Q4_K_M). For every family with at least two quant
+levels, per task / hardware / context size, the report lists by bits per weight:
+  - decode and prefill tok/s (server-reported)
+  - peak VRAM and model load time
+  - evaluator quality (0-10) from evaluation.json, when an evaluator has been run
+
+and marks the best trade-off quant: the fastest decode among the quants whose quality is
+within QUALITY_TOLERANCE of the family's best. Without evaluator scores the fastest quant
+is marked and labelled "speed only". Results go to reports/{mode}/quant_report.md.
+
+Usage:
+    python scripts/evaluate_agentic_chat.py --mode gpu      # optional, adds quality
+    python scripts/quant_report.py --mode gpu
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+
+# Allow running from any directory
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from analyze_efficiency import group_label, load_quality
+from config import REPORTS_DIR, TASKS, get_quant_info
+from generate_report import collect_results, format_value, render_table
+
+# Quality points (0-10 scale) a lower quant may lose and still count as "as good as the best"
+QUALITY_TOLERANCE = 0.5
+
+
+def _column(runs: pd.DataFrame, *names: str) -> pd.Series:
+    """First non-null value across candidate columns (missing columns are skipped)."""
+    result = pd.Series(np.nan, index=runs.index, dtype=float)
+    for name in names:
+        if name in runs:
+            result = result.fillna(pd.to_numeric(runs[name], errors="coerce"))
+    return result
+
+
+def build_quant_frame(mode: str) -> pd.DataFrame:
+    """One row per (family, task, hardware, ctx, model) for families with 2+ quant levels.
+
+    Repeated runs of the same configuration are averaged.
+    """
+    runs = collect_results(mode)
+    if runs.empty:
+        return runs
+    if "error" in runs:
+        runs = runs[runs["error"].isna()]
+
+    info = runs["model"].map(get_quant_info)
+    runs = runs[info.notna()]
+    info = info[info.notna()]
+    runs = runs.assign(
+        family=info.map(lambda i: i["family"]),
+        quant=info.map(lambda i: i["quant"]),
+        bpw=info.map(lambda i: i["bits_per_weight"]),
+        quant_inferred=info.map(lambda i: i["quant_inferred"]),
+        decode_tps=_column(runs, "tokens.eval_tokens_per_sec"),
+        prefill_tps=_column(runs, "tokens.prompt_eval_tokens_per_sec"),
+        vram_gb=(_column(runs, "gpu.peak_vram_mb") / 1024).where(lambda v: v > 0),
+        load_s=_column(runs, "timing.load_duration_s", "breakdown.load_s"),
+        quality=runs["run_dir"].map(load_quality).astype(float),
+    )
+
+    keys = ["family", "task", "hardware", "ctx", "model"]
+    frame = (runs.groupby(keys, dropna=False, sort=False)
+             .agg(quant=("quant", "first"), bpw=("bpw", "first"),
+                  quant_inferred=("quant_inferred", "first"), size_gb=("size_gb", "first"),
+                  runs=("model", "size"), decode_tps=("decode_tps", "mean"),
+                  prefill_tps=("prefill_tps", "mean"), vram_gb=("vram_gb", "mean"),
+                  load_s=("load_s", "mean"), quality=("quality", "mean"))
+             .reset_index())
+
+    levels = frame.groupby("family")["quant"].transform("nunique")
+    return frame[levels >= 2].reset_index(drop=True)
+
+
+def mark_best_tradeoff(group: pd.DataFrame) -> pd.DataFrame:
+    """Add `best` (bool) and `basis` ("quality + speed" or "speed only") for one comparison group."""
+    group = group.assign(best=False, basis="speed only")
+    candidates = group[group["decode_tps"] > 0]
+    if candidates.empty:
+        return group
+    if candidates["quality"].notna().any():
+        top = candidates["quality"].max()
+        candidates = candidates[candidates["quality"] >= top - QUALITY_TOLERANCE]
+        group["basis"] = "quality + speed"
+    group.loc[candidates["decode_tps"].idxmax(), "best"] = True
+    return group
+
+
+def build_family_table(group: pd.DataFrame) -> list[str]:
+    """Markdown table for one family/task/hardware/ctx group, ordered by bits per weight."""
+    ordered = group.sort_values(["bpw", "model"])
+    # Speed relative to the highest-precision quant measured
+    reference = ordered["decode_tps"].iloc[-1]
+    relative = ordered["decode_tps"] / reference if reference and reference > 0 else ordered["decode_tps"] * np.nan
+    quant = ordered["quant"] + ordered["quant_inferred"].map(lambda i: "*" if i else "")
+    table = pd.DataFrame({
+        "Quant": quant.values,
+        "Bits/weight": ordered["bpw"].map(lambda v: f"{v:.2f}").values,
+        "Size (GB)": ordered["size_gb"].map(lambda v: format_value(v) if v else "-").values,
+        "Decode tok/s": ordered["decode_tps"].map(format_value).values,
+        "vs highest bpw": relative.map(lambda v: f"{v:.2f}x" if pd.notna(v) else "-").values,
+        "Prefill tok/s": ordered["prefill_tps"].map(format_value).values,
+        "Peak VRAM (GB)": ordered["vram_gb"].map(format_value).values,
+        "Load (s)": ordered["load_s"].map(format_value).values,
+        "Quality": ordered["quality"].map(format_value).values,
+        "Runs": ordered["runs"].values,
+        "Best trade-off": ordered["best"].map(lambda b: "**yes**" if b else "").values,
+    }, index=ordered["model"].values)
+    return render_table(table)
+
+
+def generate_quant_report(mode: str, tasks: list[str] | None = None):
+    """Write reports/{mode}/quant_report.md."""
+    frame = build_quant_frame(mode)
+    if frame.empty:
+        print(f"No quantization families with 2+ quant levels found for mode '{mode}'.")
+        return
+    if tasks:
+        frame = frame[frame["task"].isin(tasks)]
+
+    report_dir = os.path.join(REPORTS_DIR, mode)
+    os.makedirs(report_dir, exist_ok=True)
+
+    lines = [
+        f"# Quantization Comparison ({mode.upper()} Mode)",
+        "",
+        f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        "",
+        f"*Best trade-off = fastest decode among quants within {QUALITY_TOLERANCE} quality points of the "
+        "family's best score (fastest decode when no evaluator scores exist). "
+        "\\* = quant inferred from Ollama's library default. Bits/weight are approximate GGUF averages.*",
+        "",
+    ]
+
+    frame = frame.assign(task_order=frame["task"].map(TASKS.index))
+    for family, by_family in frame.groupby("family", sort=True):
+        quants = by_family.drop_duplicates("quant").sort_values("bpw")["quant"]
+        lines.append(f"## `{family}`")
+        lines.append("")
+        lines.append(f"Quant levels: {', '.join(quants)}")
+        lines.append("")
+        for (_, task, hardware, ctx), group in by_family.groupby(
+                ["task_order", "task", "hardware", "ctx"], sort=True, dropna=False):
+            if group["quant"].nunique() < 2:
+                continue
+            group = mark_best_tradeoff(group)
+            best = group[group["best"]]
+            label = group_label(task, hardware) + (f", ctx-{ctx}" if pd.notna(ctx) else "")
+            lines.append(f"### {label}")
+            lines.append("")
+            if not best.empty:
+                lines.append(f"Best trade-off ({group['basis'].iloc[0]}): "
+                             f"**{best['quant'].iloc[0]}** (`{best['model'].iloc[0]}`)")
+                lines.append("")
+            lines.extend(build_family_table(group))
+            lines.append("")
+
+    report_path = os.path.join(report_dir, "quant_report.md")
+    with open(report_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+
+    print(f"Quantization report: {report_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare quant levels of the same base model")
+    parser.add_argument("--mode", type=str, required=True, choices=["cpu", "gpu"],
+                        help="Execution mode to analyze")
+    parser.add_argument("--tasks", type=str, default=None,
+                        help="Comma-separated list of tasks to include (default: all with results)")
+    args = parser.parse_args()
+    generate_quant_report(args.mode, tasks=args.tasks.split(",") if args.tasks else None)
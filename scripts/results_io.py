@@ -0,0 +1,134 @@
+"""Storage of bulky result files: plain, gzip or zstd, read back transparently.
+
+output.md, transcript.json and transcript.jsonl hold most of the bytes under models/.
+They are written as pretty-printed JSON, and a chat transcript is kept both as markdown
+and as JSON. With --storage gzip (stdlib) or --storage zstd (needs the optional
+`zstandard` package) they are written compressed instead, as output.md.gz,
+transcript.json.zst and so on, and JSON is written without indentation. metrics.json and
+evaluation.json stay plain: they are small, and other tools read them directly.
+
+Readers find a result by its plain name: find_result_file() returns whichever variant
+exists, and read_text()/load_json() decompress by suffix. Evaluators, the engine
+post-processing and the report pipeline therefore work on any mix of plain and
+compressed runs. migrate_results.py converts an existing models/ tree.
+"""
+
+import gzip
+import json
+import os
+
+try:
+    import zstandard
+except ImportError:  # optional: only needed for --storage zstd
+    zstandard = None
+
+STORAGE_FORMATS = ("plain", "gzip", "zstd")
+SUFFIXES = {"plain": "", "gzip": ".gz", "zstd": ".zst"}
+COMPRESSIBLE_FILES = ("output.md", "transcript.json", "transcript.jsonl")
+
+_storage = "plain"
+
+
+def set_storage(storage: str):
+    """Select the format for files written from now on (run_benchmark --storage)."""
+    global _storage
+    _check_storage(storage)
+    _storage = storage
+
+
+def get_storage() -> str:
+    return _storage
+
+
+def _check_storage(storage: str):
+    if storage not in STORAGE_FORMATS:
+        raise ValueError(f"unknown storage {storage!r} (choose from {', '.join(STORAGE_FORMATS)})")
+    if storage == "zstd" and zstandard is None:
+        raise RuntimeError("--storage zstd needs the zstandard package (pip install zstandard)")
+
+
+def open_text(path: str, mode: str = "r"):
+    """Open a text file for "r" or "w", (de)compressing by its suffix."""
+    path = os.fspath(path)
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"reading {path} needs the zstandard package (pip install zstandard)")
+        return zstandard.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def find_result_file(results_dir: str, name: str) -> str | None:
+    """Path of `name` in results_dir, plain or compressed, or None if neither exists."""
+    for suffix in SUFFIXES.values():
+        path = os.path.join(results_dir, name + suffix)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def result_exists(results_dir: str, name: str) -> bool:
+    return find_result_file(results_dir, name) is not None
+
+
+def read_text(results_dir: str, name: str) -> str:
+    path = find_result_file(results_dir, name)
+    if path is None:
+        raise FileNotFoundError(os.path.join(results_dir, name))
+    with open_text(path) as f:
+        return f.read()
+
+
+def load_json(results_dir: str, name: str):
+    return json.loads(read_text(results_dir, name))
+
+
+def write_text(results_dir: str, name: str, text: str, storage: str | None = None) -> str:
+    """Write `name` in the selected storage, removing other variants of it; returns the path."""
+    storage = storage or _storage
+    _check_storage(storage)
+    path = os.path.join(results_dir, name + SUFFIXES[storage])
+    with open_text(path, "w") as f:
+        f.write(text)
+    remove_other_variants(results_dir, name, keep=path)
+    return path
+
+
+def write_json(results_dir: str, name: str, data, storage: str | None = None) -> str:
+    """JSON is indented when plain and compact when compressed."""
+    storage = storage or _storage
+    if storage == "plain":
+        text = json.dumps(data, indent=2, default=str)
+    else:
+        text = json.dumps(data, separators=(",", ":"), default=str)
+    return write_text(results_dir, name, text, storage)
+
+
+def convert_file(results_dir: str, name: str, storage: str) -> tuple[int, int] | None:
+    """Rewrite an existing result file in `storage`; (bytes before, bytes after), or None if absent.
+
+    JSON files are re-serialized (compact when compressed, indented when plain). Other
+    files keep their text unchanged.
+    """
+    _check_storage(storage)
+    path = find_result_file(results_dir, name)
+    if path is None:
+        return None
+    before = os.path.getsize(path)
+    if path == os.path.join(results_dir, name + SUFFIXES[storage]):
+        return before, before
+    text = read_text(results_dir, name)
+    if name.endswith(".json"):
+        new_path = write_json(results_dir, name, json.loads(text), storage)
+    else:
+        new_path = write_text(results_dir, name, text, storage)
+    return before, os.path.getsize(new_path)
+
+
+def remove_other_variants(results_dir: str, name: str, keep: str):
+    """Delete every stored variant of `name` except the file at `keep`."""
+    for suffix in SUFFIXES.values():
+        path = os.path.join(results_dir, name + suffix)
+        if path != keep and os.path.exists(path):
+            os.remove(path)
@@ -1,9 +1,10 @@
 """Main orchestrator for running Ollama model benchmarks."""
 
 import argparse
+import atexit
+from concurrent.futures import Future
 import json
 import os
-import subprocess
 import sys
 import time
 
@@ -20,9 +21,16 @@ from config import (
     OLLAMA_GENERATE_URL,
     OLLAMA_LIST_URL,
     REFACTOR_SOURCE_DIR,
+    REPORTS_DIR,
     REQUIREMENTS_DIR,
     TASKS,
     GPU_POLL_INTERVAL,
+    POWER_POLL_INTERVAL,
+    PULL_CONCURRENCY,
+    PULL_RETRIES,
+    ENGINE_MEMORY_LIMIT_MB,
+    ENGINE_TIMEOUT_S,
+    ENGINE_WORKERS,
     get_model_results_dir,
     get_num_ctx,
     get_num_predict,
@@ -31,6 +39,19 @@ from config import (
     is_cloud_model,
 )
 from monitor_gpu import GPUMonitor
+from phase_timer import PROFILERS, PhaseTimer, RunProfiler
+from power_monitor import PowerMonitor
+from pull_manager import PullManager
+from engine_executor import EngineExecutor, SandboxLimits, describe_engine_result, execute_engine
+from markdown_blocks import extract_python_code
+from timing_breakdown import compute_timing_breakdown
+from cpu_topology import discover_topology, monitor_cpu_groups, parse_cpulist, topology_for_metrics
+from ollama_launcher import LAUNCHERS, LauncherError, make_launcher
+from thread_sweep import format_sweep_summary, run_thread_sweep, save_sweep, sweep_thread_counts
+from evaluate_agentic_chat import AgenticChatEvaluator
+from chat_batch import format_chat_batch_summary, plan_conversations, run_chat_batch, save_chat_batch
+from chat_scaling import format_scaling_summary, parse_sizes, run_chat_scaling, save_scaling
+from schema_ab import format_schema_ab_summary, run_schema_ab, save_schema_ab
 from datetime import datetime
 from run_chat_benchmark import (
     parse_prompt_for_chat,
@@ -38,7 +59,14 @@ from run_chat_benchmark import (
     aggregate_chat_metrics,
     classify_chat_result,
     save_chat_results,
+    TOOL_ROUTING_MODES,
 )
+from chat_transcript import TRANSCRIPT_LOG
+from results_io import STORAGE_FORMATS, read_text, result_exists, set_storage, write_text
+
+sys.path.insert(0, REQUIREMENTS_DIR)
+from tool_profiles import PROFILES as TOOL_PROFILES
+from agentic_chat_tools import SCHEMA_VARIANTS, schema_variant
 
 
 def check_ollama_running() -> bool:
@@ -66,21 +94,44 @@ def get_installed_models() -> set[str]:
         return set()
 
 
-def pull_model(model: str) -> bool:
-    """Pull a model if not already installed."""
-    print(f"  Pulling {model}...")
-    try:
-        resp = requests.post(
-            f"{OLLAMA_BASE_URL}/api/pull",
-            json={"name": model, "stream": False},
-            timeout=3600,
-        )
-        resp.raise_for_status()
-        print(f"  Pulled {model}")
+def start_pulls(models: list[str], args) -> tuple[PullManager | None, dict[str, Future]]:
+    """Queue pulls for every missing model, in benchmark order.
+
+    The pool downloads --pull-concurrency models at a time in the background, so later
+    models download while earlier ones are being benchmarked.
+    """
+    if args.skip_pull:
+        return None, {}
+    installed = get_installed_models()
+    missing = [m for m in models if m not in installed]
+    if not missing:
+        return None, {}
+    background = not (args.sequential_pulls or args.thread_sweep or args.chat_scaling or args.schema_ab
+                      or args.conversations)
+    print(f"\nPulling {len(missing)} model(s){' in the background' if background else ''}, "
+          f"{args.pull_concurrency} at a time...")
+    # The live progress line would interleave with benchmark output, so background pulls only report completion
+    manager = PullManager(max_concurrent=args.pull_concurrency, retries=PULL_RETRIES, show_progress=not background)
+    return manager, {m: manager.submit(m) for m in missing}
+
+
+def wait_for_pull(model: str, pulls: dict[str, Future]) -> bool:
+    """Block until the model's pull (if any) finishes. False if it failed."""
+    future = pulls.get(model)
+    if future is None:
         return True
-    except requests.RequestException as e:
-        print(f"  FAILED to pull {model}: {e}")
-        return False
+    if not future.done():
+        print(f"\n  Waiting for {model} to finish downloading...")
+    return future.result().ok
+
+
+def wait_for_ready(models: list[str], pulls: dict[str, Future]) -> list[str]:
+    """Wait for every model's pull and return the models that are available, reporting the rest."""
+    ready = [m for m in models if wait_for_pull(m, pulls)]
+    for model in models:
+        if model not in ready:
+            print(f"  Skipping {model}: pull failed")
+    return ready
 
 
 def unload_model(model: str):
@@ -147,29 +198,81 @@ def load_prompt(task: str) -> str:
 
 
 def run_generation(model: str, prompt: str, num_ctx: int, num_predict: int = 4096, timeout: int = 600, num_threads: int | None = None) -> dict:
-    """Call Ollama generate API and return the response with timing data."""
-    try:
-        options = {
-            "num_predict": num_predict,
-            "num_ctx": num_ctx,
-        }
-        if num_threads is not None:
-            options["num_thread"] = num_threads
+    """Call Ollama generate API (streaming) and return the final response with timing data.
 
-        resp = requests.post(
+    Streaming lets us timestamp the first and last generated chunk on the client side,
+    which is the only decode timing available for cloud models (they report
+    total_duration but zero eval_duration). The stream is reassembled into the same
+    shape as a non-streaming response, plus a "stream" dict of client timestamps.
+    """
+    options = {
+        "num_predict": num_predict,
+        "num_ctx": num_ctx,
+    }
+    if num_threads is not None:
+        options["num_thread"] = num_threads
+
+    request_start = time.time()
+    deadline = request_start + timeout
+    first_token_at = None
+    last_token_at = None
+    chunks = 0
+    response_parts = []
+    thinking_parts = []
+    final = {}
+    try:
+        with requests.post(
             OLLAMA_GENERATE_URL,
             json={
                 "model": model,
                 "prompt": prompt,
-                "stream": False,
+                "stream": True,
                 "options": options,
             },
             timeout=timeout,
-        )
-        resp.raise_for_status()
-        return resp.json()
+            stream=True,
+        ) as resp:
+            resp.raise_for_status()
+            for line in resp.iter_lines():
+                # requests' timeout is per-read, so enforce the total budget ourselves
+                if time.time() > deadline:
+                    return {"error": f"Generation exceeded total timeout of {timeout}s"}
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if "error" in chunk:
+                    return {"error": chunk["error"]}
+                piece = chunk.get("response", "")
+                thought = chunk.get("thinking", "")
+                if piece or thought:
+                    now = time.time()
+                    if first_token_at is None:
+                        first_token_at = now
+                    last_token_at = now
+                    chunks += 1
+                    response_parts.append(piece)
+                    thinking_parts.append(thought)
+                if chunk.get("done"):
+                    final = chunk
+                    break
     except requests.RequestException as e:
         return {"error": str(e)}
+    except json.JSONDecodeError as e:
+        return {"error": f"Malformed stream chunk: {e}"}
+
+    if not final:
+        return {"error": "Stream ended without a final (done) message"}
+
+    final["response"] = "".join(response_parts)
+    if any(thinking_parts):
+        final["thinking"] = "".join(thinking_parts)
+    final.pop("context", None)
+    final["stream"] = {
+        "ttft_s": round(first_token_at - request_start, 3) if first_token_at else None,
+        "decode_window_s": round(last_token_at - first_token_at, 3) if first_token_at else None,
+        "chunks": chunks,
+    }
+    return final
 
 
 def extract_metrics(response: dict, gpu_summary) -> dict:
@@ -197,7 +300,7 @@ def extract_metrics(response: dict, gpu_summary) -> dict:
     prompt_eval_tps = (prompt_eval_count / prompt_eval_duration_s) if prompt_eval_duration_s > 0 else 0
     eval_tps = (eval_count / eval_duration_s) if eval_duration_s > 0 else 0
 
-    return {
+    metrics = {
         "model": response.get("model", ""),
         "timing": {
             "total_duration_s": round(total_duration_s, 2),
@@ -213,63 +316,104 @@ def extract_metrics(response: dict, gpu_summary) -> dict:
         },
         "gpu": gpu_summary.to_dict(),
     }
+    if "stream" in response:
+        metrics["stream"] = response["stream"]
+    return metrics
 
 
-def save_results(model: str, task: str, output_text: str, metrics: dict, mode: str, ctx_size: int = None):
-    """Save output and metrics to mode-specific directory."""
-    results_dir = get_model_results_dir(model, task, mode=mode, ctx_size=ctx_size)
-    os.makedirs(results_dir, exist_ok=True)
+def build_hardware_info(mode: str, topology: dict) -> dict:
+    """Hardware metadata for metrics.json: core counts, CPU/NUMA topology, GPU name/VRAM."""
+    hw_info = {"cpu_logical_cores": os.cpu_count()}
+    if mode != "cloud":
+        hw_info["cpu_topology"] = topology_for_metrics(topology)
+    if mode == "gpu":
+        hw_info.update(GPUMonitor.get_gpu_info())
+    return hw_info
 
-    output_path = os.path.join(results_dir, "output.md")
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(output_text)
 
-    metrics_path = os.path.join(results_dir, "metrics.json")
-    with open(metrics_path, "w", encoding="utf-8") as f:
-        json.dump(metrics, f, indent=2)
+def start_launcher(args) -> dict | None:
+    """Start/attach the --launcher (if any) and return its pinning description for metrics.json.
 
-    print(f"  Saved results to {results_dir}")
+    The launcher is stopped (affinity restored / spawned server terminated) at interpreter exit.
+    """
+    if args.launcher is None:
+        if args.cpu_affinity or args.numa_node is not None:
+            print("Error: --cpu-affinity/--numa-node need a --launcher (attach, taskset or numactl)")
+            sys.exit(1)
+        return None
 
+    topology = discover_topology()
+    cpus = parse_cpulist(args.cpu_affinity) if args.cpu_affinity else None
+    try:
+        launcher = make_launcher(args.launcher, topology, cpus=cpus, numa_node=args.numa_node)
+        launcher.start()
+    except (LauncherError, ValueError) as e:
+        print(f"\nError: {e}")
+        sys.exit(1)
+    atexit.register(launcher.stop)
+    return launcher.describe()
 
-def extract_code_from_markdown(text: str) -> str | None:
-    """Extract Python code from markdown code blocks.
 
-    Tries ```python first, then ``` without language specifier.
-    Returns the longest code block found, or None.
-    """
-    import re
+def print_timing_breakdown(breakdown: dict | None):
+    """Print the wall-clock vs server-time split computed by compute_timing_breakdown."""
+    if not breakdown:
+        return
+    print(f"  Client/network overhead: {breakdown['client_overhead_s']}s of {breakdown['wall_s']}s wall "
+          f"({breakdown['shares_pct']['client_overhead']}%)")
+    if breakdown["server_timings"]:
+        print(f"  Server split: load {breakdown['load_s']}s, prefill {breakdown['prefill_s']}s, "
+              f"decode {breakdown['decode_s']}s, unexplained {breakdown['unexplained_s']}s")
+    elif breakdown["effective_tps_source"] != "none":
+        print(f"  Effective generation speed: {breakdown['effective_eval_tokens_per_sec']} tok/s "
+              f"(from {breakdown['effective_tps_source']} timing; server reported no eval_duration)")
+
+
+def print_energy(energy: dict | None):
+    """Print the per-token energy summary computed by PowerMonitor.summarize."""
+    if not energy:
+        return
+    per_token = []
+    if "joules_per_prefill_token" in energy:
+        per_token.append(f"{energy['joules_per_prefill_token']} J/prefill tok")
+    if "joules_per_generated_token" in energy:
+        per_token.append(f"{energy['joules_per_generated_token']} J/generated tok")
+    print(f"  Energy: {energy['model_j']} J at {energy['avg_model_power_w']} W avg "
+          f"({', '.join(energy['readers'])})" + (f" -- {', '.join(per_token)}" if per_token else ""))
 
-    # Try with python specifier first
-    pattern = r'```python\n(.*?)```'
-    matches = re.findall(pattern, text, re.DOTALL)
 
-    # Fallback to any code block
-    if not matches:
-        pattern = r'```\n(.*?)```'
-        matches = re.findall(pattern, text, re.DOTALL)
+def save_results(model: str, task: str, output_text: str, metrics: dict, mode: str, ctx_size: int = None):
+    """Save output and metrics to mode-specific directory."""
+    results_dir = get_model_results_dir(model, task, mode=mode, ctx_size=ctx_size)
+    os.makedirs(results_dir, exist_ok=True)
+
+    write_text(results_dir, "output.md", output_text)
 
-    if not matches:
-        return None
+    write_metrics(results_dir, metrics)
+
+    print(f"  Saved results to {results_dir}")
 
-    # Return the longest block (most likely to be the complete implementation)
-    return max(matches, key=len).strip()
 
+def write_metrics(results_dir: str, metrics: dict):
+    """Write metrics.json into a results directory."""
+    metrics_path = os.path.join(results_dir, "metrics.json")
+    with open(metrics_path, "w", encoding="utf-8") as f:
+        json.dump(metrics, f, indent=2)
 
-def post_process_engine_task(model: str, task: str, mode: str, ctx_size: int | None, results_dir: str):
-    """Post-process engine task: extract code, copy historical.csv, execute."""
+
+def post_process_engine_task(model: str, task: str, mode: str, ctx_size: int | None, results_dir: str,
+                             engine_executor: EngineExecutor | None = None):
+    """Post-process engine task: extract code, copy historical.csv, execute in the sandbox."""
     print("  Post-processing engine task...")
 
     # Read output.md
-    output_path = os.path.join(results_dir, "output.md")
-    if not os.path.exists(output_path):
+    if not result_exists(results_dir, "output.md"):
         print("  Warning: output.md not found, skipping post-processing")
         return
 
-    with open(output_path, "r", encoding="utf-8") as f:
-        output_text = f.read()
+    output_text = read_text(results_dir, "output.md")
 
     # Extract Python code
-    code = extract_code_from_markdown(output_text)
+    code = extract_python_code(output_text)
     if not code:
         failure_path = os.path.join(results_dir, "failure.md")
         with open(failure_path, "w", encoding="utf-8") as f:
@@ -296,51 +440,17 @@ def post_process_engine_task(model: str, task: str, mode: str, ctx_size: int | N
         print(f"  Warning: {HISTORICAL_CSV_PATH} not found")
         return
 
-    # Execute trading_engine.py
-    print("  Executing trading_engine.py...")
-    try:
-        result = subprocess.run(
-            [sys.executable, "trading_engine.py"],
-            cwd=results_dir,
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-
-        if result.returncode != 0:
-            # Execution failed
-            failure_path = os.path.join(results_dir, "failure.md")
-            with open(failure_path, "w", encoding="utf-8") as f:
-                f.write("# Engine Task Execution Failure\n\n")
-                f.write(f"**Exit Code:** {result.returncode}\n\n")
-                f.write("## stderr:\n```\n")
-                f.write(result.stderr)
-                f.write("\n```\n")
-            print(f"  Execution failed with exit code {result.returncode}")
-            return
-
-        # Check if output.csv was created
-        output_csv_path = os.path.join(results_dir, "output.csv")
-        if os.path.exists(output_csv_path):
-            print("  Successfully generated output.csv")
-        else:
-            print("  Warning: output.csv was not created")
-
-    except subprocess.TimeoutExpired:
-        failure_path = os.path.join(results_dir, "failure.md")
-        with open(failure_path, "w", encoding="utf-8") as f:
-            f.write("# Engine Task Execution Failure\n\n")
-            f.write("**Reason:** Execution timed out after 30 seconds\n")
-        print("  Execution timed out")
-    except Exception as e:
-        failure_path = os.path.join(results_dir, "failure.md")
-        with open(failure_path, "w", encoding="utf-8") as f:
-            f.write("# Engine Task Execution Failure\n\n")
-            f.write(f"**Error:** {str(e)}\n")
-        print(f"  Execution error: {e}")
+    # Execute trading_engine.py in the sandbox; with an executor the benchmark doesn't wait for it
+    if engine_executor is not None:
+        engine_executor.submit(model, results_dir)
+        print(f"  Queued trading_engine.py for sandboxed execution ({engine_executor.pending()} pending)")
+    else:
+        print("  Executing trading_engine.py...")
+        run = execute_engine(model, results_dir)
+        print(f"  Engine: {describe_engine_result(run)}")
 
 
-def run_single_benchmark(model: str, task: str, mode: str, num_ctx_override: int | None = None, num_predict_override: int | None = None, timeout: int = 600, num_threads: int | None = None):
+def run_single_benchmark(model: str, task: str, mode: str, num_ctx_override: int | None = None, num_predict_override: int | None = None, timeout: int = 600, num_threads: int | None = None, profiler: str | None = None, cpu_pinning: dict | None = None, measure_power: bool = True, engine_executor: EngineExecutor | None = None):
     """Run a single model against a single task."""
     print(f"\n{'='*60}")
     print(f"Model: {model}")
@@ -348,14 +458,25 @@ def run_single_benchmark(model: str, task: str, mode: str, num_ctx_override: int
     print(f"Mode:  {mode}")
     print(f"{'='*60}")
 
+    timer = PhaseTimer()
+    run_profiler = RunProfiler(profiler)
+    run_profiler.start()
+
     # Load prompt
     print("  Loading prompt...")
-    prompt = load_prompt(task)
+    with timer.span("prompt_load"):
+        prompt = load_prompt(task)
     print(f"  Prompt length: {len(prompt)} chars")
 
     # Start GPU monitoring
-    gpu_monitor = GPUMonitor(poll_interval=GPU_POLL_INTERVAL)
-    gpu_monitor.start()
+    with timer.span("monitor_start"):
+        topology = discover_topology()
+        pinned = parse_cpulist(cpu_pinning["cpus"]) if cpu_pinning and cpu_pinning.get("cpus") else None
+        gpu_monitor = GPUMonitor(poll_interval=GPU_POLL_INTERVAL, cpu_groups=monitor_cpu_groups(topology, pinned))
+        gpu_monitor.start()
+        power_monitor = PowerMonitor(poll_interval=POWER_POLL_INTERVAL) if measure_power else None
+        if power_monitor:
+            power_monitor.start()
 
     # Run generation
     num_ctx = num_ctx_override if num_ctx_override is not None else get_num_ctx(model)
@@ -368,35 +489,44 @@ def run_single_benchmark(model: str, task: str, mode: str, num_ctx_override: int
         print(f"  CPU threads: Ollama default (physical cores)")
     print("  Generating response (this may take several minutes)...")
     start_time = time.time()
-    response = run_generation(model, prompt, num_ctx, num_predict, timeout=timeout, num_threads=num_threads)
+    with timer.span("generation"):
+        response = run_generation(model, prompt, num_ctx, num_predict, timeout=timeout, num_threads=num_threads)
     elapsed = time.time() - start_time
     print(f"  Generation completed in {elapsed:.1f}s")
 
     # Stop GPU monitoring
-    gpu_summary = gpu_monitor.stop()
+    with timer.span("monitor_stop"):
+        gpu_summary = gpu_monitor.stop()
+        if power_monitor:
+            power_monitor.stop()
 
     # Extract output text
     output_text = response.get("response", response.get("error", "No response"))
 
     # Compute metrics
-    metrics = extract_metrics(response, gpu_summary)
-    metrics["task"] = task
-    metrics["wall_clock_s"] = round(elapsed, 2)
-    metrics["num_ctx"] = num_ctx
-    metrics["num_predict"] = num_predict
-    if num_threads is not None:
-        metrics["num_threads"] = num_threads
+    with timer.span("metrics"):
+        metrics = extract_metrics(response, gpu_summary)
+        metrics["task"] = task
+        metrics["wall_clock_s"] = round(elapsed, 2)
+        breakdown = compute_timing_breakdown(metrics)
+        if breakdown:
+            metrics["timing_breakdown"] = breakdown
+        energy = power_monitor.summarize(timer, metrics) if power_monitor else None
+        if energy:
+            metrics["energy"] = energy
+        metrics["num_ctx"] = num_ctx
+        metrics["num_predict"] = num_predict
+        if num_threads is not None:
+            metrics["num_threads"] = num_threads
 
-    # Add execution metadata
-    metrics["execution_mode"] = mode
-    metrics["run_timestamp"] = datetime.now().isoformat()
+        # Add execution metadata
+        metrics["execution_mode"] = mode
+        metrics["run_timestamp"] = datetime.now().isoformat()
 
-    # Add hardware metadata
-    import platform
-    hw_info = {"cpu_logical_cores": os.cpu_count()}
-    if mode == "gpu":
-        hw_info.update(GPUMonitor.get_gpu_info())
-    metrics["hardware"] = hw_info
+        # Add hardware metadata
+        metrics["hardware"] = build_hardware_info(mode, topology)
+        if cpu_pinning:
+            metrics["cpu_pinning"] = cpu_pinning
 
     # Print summary
     if "error" not in metrics:
@@ -410,6 +540,8 @@ def run_single_benchmark(model: str, task: str, mode: str, num_ctx_override: int
         print(f"  Tokens generated: {gen_tokens}")
         print(f"  Context usage: {total_tokens}/{num_ctx} ({100 * total_tokens / num_ctx:.0f}%)")
         print(f"  Generation speed: {tokens['eval_tokens_per_sec']} tok/s")
+        print_timing_breakdown(metrics.get("timing_breakdown"))
+        print_energy(metrics.get("energy"))
         print(f"  Peak VRAM: {gpu['peak_vram_mb']} MB")
         print(f"  Avg GPU Util: {gpu['avg_gpu_utilization_pct']}%")
         print(f"  Peak CPU: {gpu['peak_cpu_pct']}%")
@@ -434,20 +566,42 @@ def run_single_benchmark(model: str, task: str, mode: str, num_ctx_override: int
 
     # Save results
     ctx_size = num_ctx if mode == "gpu" else None
-    save_results(model, task, output_text, metrics, mode=mode, ctx_size=ctx_size)
+    results_dir = get_model_results_dir(model, task, mode=mode, ctx_size=ctx_size)
+    with timer.span("save"):
+        save_results(model, task, output_text, metrics, mode=mode, ctx_size=ctx_size)
 
     # Task-specific post-processing
     if task == "engine":
-        results_dir = get_model_results_dir(model, task, mode=mode, ctx_size=ctx_size)
-        post_process_engine_task(model, task, mode, ctx_size, results_dir)
+        with timer.span("engine_postprocess"):
+            post_process_engine_task(model, task, mode, ctx_size, results_dir, engine_executor)
 
     # Unload model to free VRAM
     print("  Unloading model...")
-    unload_model(model)
-    time.sleep(2)  # Brief pause to let VRAM clear
+    with timer.span("unload"):
+        unload_model(model)
+    with timer.span("vram_settle"):
+        time.sleep(2)  # Brief pause to let VRAM clear
+
+    finish_harness_metrics(metrics, timer, run_profiler, results_dir)
 
 
-def run_single_chat_benchmark(model: str, task: str, mode: str, num_ctx_override: int | None = None, num_predict_override: int | None = None, timeout: int = 600, num_threads: int | None = None, context_management: str = "none", temperature: float | None = None):
+def finish_harness_metrics(metrics: dict, timer: PhaseTimer, run_profiler: RunProfiler, results_dir: str):
+    """Attach the harness phase breakdown (and profile dump) and rewrite metrics.json.
+
+    metrics.json is first written before post-processing and unload, so it is
+    rewritten once those phases have been measured.
+    """
+    profile_path = run_profiler.stop(results_dir)
+    harness = timer.to_dict()
+    if profile_path:
+        harness["profile"] = os.path.basename(profile_path)
+    metrics["harness"] = harness
+    write_metrics(results_dir, metrics)
+    print(f"  Harness overhead: {harness['overhead_s']}s of {harness['harness_total_s']}s "
+          f"({harness['overhead_pct']}%)")
+
+
+def run_single_chat_benchmark(model: str, task: str, mode: str, num_ctx_override: int | None = None, num_predict_override: int | None = None, timeout: int = 600, num_threads: int | None = None, context_management: str = "none", temperature: float | None = None, profiler: str | None = None, cpu_pinning: dict | None = None, measure_power: bool = True, parallel_tools: bool = False, tool_profile: str = "none", tool_seed: int = 0, tool_cache: bool = False, tool_routing: str = "none", chat_stream: bool = False, resume: bool = False):
     """Run a single model against the agentic-chat task using /api/chat with tool calling."""
     print(f"\n{'='*60}")
     print(f"Model: {model}")
@@ -456,17 +610,33 @@ def run_single_chat_benchmark(model: str, task: str, mode: str, num_ctx_override
     if context_management != "none":
         print(f"Context Management: {context_management}")
     print(f"Temperature: {temperature}")
+    if parallel_tools:
+        print("Tool execution: parallel")
+    if tool_profile != "none":
+        print(f"Tool profile: {tool_profile} (seed {tool_seed})")
+    if tool_cache:
+        print("Tool cache: repeated read-only calls served from cache")
+    if tool_routing != "none":
+        print(f"Tool routing: {tool_routing} (only tools relevant to the workflow stage are sent)")
+    if chat_stream:
+        print("Chat streaming: tool calls dispatched as they arrive")
     print(f"{'='*60}")
 
+    timer = PhaseTimer()
+    run_profiler = RunProfiler(profiler)
+    run_profiler.start()
+
     # Load and parse prompt
     print("  Loading prompt...")
-    prompt = load_prompt(task)
-    system_msg, user_msg = parse_prompt_for_chat(prompt)
+    with timer.span("prompt_load"):
+        prompt = load_prompt(task)
+        system_msg, user_msg = parse_prompt_for_chat(prompt)
     print(f"  System message: {len(system_msg)} chars")
     print(f"  User message: {len(user_msg)} chars")
 
     if not system_msg or not user_msg:
         print("  ERROR: Failed to parse system/user messages from prompt")
+        run_profiler.stop(get_model_results_dir(model, task, mode=mode))
         return
 
     # Import tool definitions
@@ -474,8 +644,14 @@ def run_single_chat_benchmark(model: str, task: str, mode: str, num_ctx_override
     from agentic_chat_tools import TOOL_DEFINITIONS
 
     # Start GPU monitoring
-    gpu_monitor = GPUMonitor(poll_interval=GPU_POLL_INTERVAL)
-    gpu_monitor.start()
+    with timer.span("monitor_start"):
+        topology = discover_topology()
+        pinned = parse_cpulist(cpu_pinning["cpus"]) if cpu_pinning and cpu_pinning.get("cpus") else None
+        gpu_monitor = GPUMonitor(poll_interval=GPU_POLL_INTERVAL, cpu_groups=monitor_cpu_groups(topology, pinned))
+        gpu_monitor.start()
+        power_monitor = PowerMonitor(poll_interval=POWER_POLL_INTERVAL) if measure_power else None
+        if power_monitor:
+            power_monitor.start()
 
     # Determine parameters
     num_ctx = num_ctx_override if num_ctx_override is not None else get_num_ctx(model)
@@ -486,9 +662,12 @@ def run_single_chat_benchmark(model: str, task: str, mode: str, num_ctx_override
         print(f"  CPU threads: {num_threads}")
     else:
         print(f"  CPU threads: Ollama default (physical cores)")
+    transcript_path = os.path.join(get_model_results_dir(model, task, mode=mode,
+                                                         ctx_size=num_ctx if mode == "gpu" else None),
+                                   TRANSCRIPT_LOG)
+    print(f"  Checkpoints: {transcript_path}{' (resuming)' if resume else ''}")
     print("  Running multi-turn chat benchmark...")
 
-    start_time = time.time()
     chat_result = run_chat_benchmark(
         model=model,
         system_msg=system_msg,
@@ -500,50 +679,72 @@ def run_single_chat_benchmark(model: str, task: str, mode: str, num_ctx_override
         num_threads=num_threads,
         context_management=context_management,
         temperature=temperature,
+        timer=timer,
+        parallel_tools=parallel_tools,
+        tool_profile=tool_profile,
+        tool_seed=tool_seed,
+        tool_cache=tool_cache,
+        tool_routing=tool_routing,
+        chat_stream=chat_stream,
+        transcript_path=transcript_path,
+        resume=resume,
     )
-    elapsed = time.time() - start_time
+    elapsed = chat_result["elapsed_s"]
     print(f"  Chat completed in {elapsed:.1f}s ({chat_result['total_turns']} turns)")
 
     # Stop GPU monitoring
-    gpu_summary = gpu_monitor.stop()
-
-    # Aggregate metrics
-    chat_metrics = aggregate_chat_metrics(
-        chat_result["turn_metrics"],
-        chat_result["tool_calls_log"],
-    )
-
-    # Build standard metrics dict
-    metrics = {
-        "model": model,
-        "task": task,
-        "wall_clock_s": round(elapsed, 2),
-        "num_ctx": num_ctx,
-        "num_predict": num_predict,
-        "temperature": temperature,
-        "execution_mode": mode,
-        "context_management": context_management,
-        "run_timestamp": datetime.now().isoformat(),
-        "timing": chat_metrics["timing"],
-        "tokens": chat_metrics["tokens"],
-        "chat": chat_metrics["chat"],
-        "gpu": gpu_summary.to_dict(),
-    }
-    if num_threads is not None:
-        metrics["num_threads"] = num_threads
-
-    # Hardware metadata
-    import platform
-    hw_info = {"cpu_logical_cores": os.cpu_count()}
-    if mode == "gpu":
-        hw_info.update(GPUMonitor.get_gpu_info())
-    metrics["hardware"] = hw_info
+    with timer.span("monitor_stop"):
+        gpu_summary = gpu_monitor.stop()
+        if power_monitor:
+            power_monitor.stop()
+
+    with timer.span("metrics"):
+        # Aggregate metrics
+        chat_metrics = aggregate_chat_metrics(
+            chat_result["turn_metrics"],
+            chat_result["tool_calls_log"],
+            parallel_tools=parallel_tools,
+            tool_profile=chat_result["tool_profile"],
+            tool_routing=tool_routing,
+            chat_stream=chat_stream,
+        )
 
-    # Classify outcome
-    classification = classify_chat_result(
-        chat_result, elapsed, chat_metrics["tokens"]["eval_count"]
-    )
-    metrics["chat"]["failure_classification"] = classification
+        # Build standard metrics dict
+        metrics = {
+            "model": model,
+            "task": task,
+            "wall_clock_s": round(elapsed, 2),
+            "num_ctx": num_ctx,
+            "num_predict": num_predict,
+            "temperature": temperature,
+            "execution_mode": mode,
+            "context_management": context_management,
+            "run_timestamp": datetime.now().isoformat(),
+            "timing": chat_metrics["timing"],
+            "tokens": chat_metrics["tokens"],
+            "chat": chat_metrics["chat"],
+            "gpu": gpu_summary.to_dict(),
+        }
+        if num_threads is not None:
+            metrics["num_threads"] = num_threads
+
+        # Hardware metadata
+        metrics["hardware"] = build_hardware_info(mode, topology)
+        if cpu_pinning:
+            metrics["cpu_pinning"] = cpu_pinning
+
+        breakdown = compute_timing_breakdown(metrics)
+        if breakdown:
+            metrics["timing_breakdown"] = breakdown
+        energy = power_monitor.summarize(timer, metrics) if power_monitor else None
+        if energy:
+            metrics["energy"] = energy
+
+        # Classify outcome
+        classification = classify_chat_result(
+            chat_result, elapsed, chat_metrics["tokens"]["eval_count"]
+        )
+        metrics["chat"]["failure_classification"] = classification
 
     # Print summary
     tokens = metrics["tokens"]
@@ -555,10 +756,38 @@ def run_single_chat_benchmark(model: str, task: str, mode: str, num_ctx_override
     print(f"  Tool calls: {chat_info['total_tool_calls']} ({chat_info['successful_tool_calls']} successful)")
     print(f"  Tool coverage: {chat_info['tool_coverage']*100:.0f}% ({len(chat_info['tools_used'])}/8)")
     print(f"  Tools used: {', '.join(chat_info['tools_used']) or 'none'}")
+    tool_exec = chat_info["tool_execution"]
+    if tool_exec["tool_turns"]:
+        print(f"  Tool batching: {tool_exec['avg_calls_per_tool_turn']} calls/turn "
+              f"({tool_exec['multi_call_turns']}/{tool_exec['tool_turns']} turns with several calls)")
+        print(f"  Turn latency: {tool_exec['turn_latency_serial_s']}s with serial tools, "
+              f"{tool_exec['turn_latency_parallel_s']}s with parallel tools ({tool_exec['mode']} run)")
+        print(f"  Time in tools: {tool_exec['tool_wall_s']}s ({tool_exec['tool_time_share']*100:.0f}% of turn latency)")
+    dup = chat_info["duplicate_calls"]
+    if dup["duplicate_calls"]:
+        print(f"  Duplicate calls: {dup['duplicate_calls']} ({dup['served_from_cache']} served from cache), "
+              f"~{dup['redundant_context_tokens']} redundant tokens in context "
+              f"(~{dup['redundant_prompt_tokens']} re-sent), {dup['wasted_wall_s']}s wasted")
+    routing = chat_info["tool_routing"]
+    if routing["mode"] != "none":
+        print(f"  Tool routing: {routing['avg_tools_per_turn']} tools/turn, {routing['schema_bytes_saved']} schema bytes "
+              f"saved ({routing['schema_bytes_saved_pct']}%, ~{routing['est_tokens_saved']} tokens), "
+              f"{routing['off_route_calls']} calls to tools not offered")
+    streaming = chat_info["streaming"]
+    if streaming["mode"] == "stream":
+        print(f"  Streaming: TTFT {streaming['avg_ttft_s']}s, first action after {streaming['avg_time_to_action_s']}s "
+              f"(full response {streaming['avg_response_s']}s) per turn, "
+              f"{streaming['tool_overlap_s']}s of tool time overlapped with generation")
+    injected = chat_info["tool_profile"]
+    if injected["name"] != "none":
+        print(f"  Tool profile {injected['name']}: {injected['simulated_latency_s']}s simulated latency, "
+              f"{injected['injected_errors']} injected errors, {injected['rate_limited']} rate-limited calls")
     print(f"  Completed: {chat_result['completed']}")
     print(f"  Total tokens: {tokens['prompt_eval_count']} prompt + {tokens['eval_count']} generated")
     if tokens['eval_tokens_per_sec'] > 0:
         print(f"  Generation speed: {tokens['eval_tokens_per_sec']} tok/s")
+    print_timing_breakdown(metrics.get("timing_breakdown"))
+    print_energy(metrics.get("energy"))
     print(f"  Peak VRAM: {gpu['peak_vram_mb']} MB")
     print(f"  Peak CPU: {gpu['peak_cpu_pct']}%")
 
@@ -568,16 +797,271 @@ def run_single_chat_benchmark(model: str, task: str, mode: str, num_ctx_override
 
     # Save results
     ctx_size = num_ctx if mode == "gpu" else None
-    save_chat_results(
-        model, task, chat_result, metrics, mode=mode, ctx_size=ctx_size,
-        num_ctx=num_ctx, num_predict=num_predict, tools=TOOL_DEFINITIONS,
-        context_management=context_management, temperature=temperature,
-    )
+    results_dir = get_model_results_dir(model, task, mode=mode, ctx_size=ctx_size)
+    with timer.span("save"):
+        save_chat_results(
+            model, task, chat_result, metrics, mode=mode, ctx_size=ctx_size,
+            num_ctx=num_ctx, num_predict=num_predict, tools=TOOL_DEFINITIONS,
+            context_management=context_management, temperature=temperature,
+        )
 
     # Unload model to free VRAM
     print("  Unloading model...")
-    unload_model(model)
-    time.sleep(2)
+    with timer.span("unload"):
+        unload_model(model)
+    with timer.span("vram_settle"):
+        time.sleep(2)
+
+    finish_harness_metrics(metrics, timer, run_profiler, results_dir)
+
+
+def run_thread_sweeps(models: list[str], args, num_threads: int | None, timeout: int, cpu_pinning: dict | None = None):
+    """--thread-sweep: sweep num_thread for each model and write per-model JSON plus a summary report."""
+    cap = num_threads if num_threads is not None else max(1, int((os.cpu_count() or 1) * 0.75))
+    if args.sweep_threads:
+        thread_counts = sorted({int(t) for t in args.sweep_threads.split(",")})
+    else:
+        thread_counts = sweep_thread_counts(cap)
+    prompt = load_prompt(args.sweep_task)
+    print(f"\nThread sweep: {thread_counts} threads, {args.sweep_repeats} run(s) each, "
+          f"{args.sweep_predict} tokens, prompt from '{args.sweep_task}'")
+
+    sweeps = []
+    for i, model in enumerate(models, 1):
+        print(f"\n[{i}/{len(models)}] {model}")
+        num_ctx = args.num_ctx if args.num_ctx is not None else get_num_ctx(model)
+        sweep = run_thread_sweep(
+            model, prompt, run_generation, thread_counts,
+            num_ctx=num_ctx,
+            num_predict=args.sweep_predict,
+            repeats=args.sweep_repeats,
+            timeout=timeout,
+        )
+        sweep["task"] = args.sweep_task
+        sweep["hardware"] = build_hardware_info(args.mode, discover_topology())
+        if cpu_pinning:
+            sweep["cpu_pinning"] = cpu_pinning
+        path = save_sweep(get_model_results_dir(model, "thread-sweep", mode=args.mode), sweep)
+        analysis = sweep["analysis"]
+        if "error" in analysis:
+            print(f"  ERROR: {analysis['error']}")
+        else:
+            print(f"  Recommended num_thread: {analysis['recommended_num_thread']} "
+                  f"({analysis['recommended_decode_tps']} tok/s decode; best {analysis['best_decode_tps']} "
+                  f"at {analysis['best_decode_threads']} threads)")
+            if analysis["decode_slows_past_best"]:
+                print("  Note: decode gets slower beyond the best thread count")
+        print(f"  Saved {path}")
+        sweeps.append(sweep)
+        unload_model(model)
+
+    report_dir = os.path.join(REPORTS_DIR, args.mode)
+    os.makedirs(report_dir, exist_ok=True)
+    report_path = os.path.join(report_dir, "thread_sweep.md")
+    with open(report_path, "w", encoding="utf-8") as f:
+        f.write(f"# CPU Thread Sweep\n\nGenerated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        f.write(format_sweep_summary(sweeps) + "\n")
+    print(f"\nThread sweep summary: {report_path}")
+
+
+def chat_run_options(model: str, args) -> tuple[int, int, float, int | None]:
+    """num_ctx, num_predict, temperature and results ctx_size of an agentic-chat run from the CLI args."""
+    num_ctx = args.num_ctx if args.num_ctx is not None else get_num_ctx(model)
+    num_predict = args.num_predict if args.num_predict is not None else get_num_predict(model)
+    temperature = args.temperature if args.temperature is not None else get_chat_temperature(model)
+    return num_ctx, num_predict, temperature, num_ctx if args.mode == "gpu" else None
+
+
+def save_evaluated_chat_run(model: str, args, chat_result: dict, run_dir: str, tools: list[dict]) -> dict:
+    """Save one sweep conversation (transcript, metrics) into run_dir and return its agentic-chat evaluation.
+
+    Used by --chat-scaling, --schema-ab and --conversations, whose runs live outside the standard
+    results directory.
+    """
+    num_ctx, num_predict, temperature, ctx_size = chat_run_options(model, args)
+    temperature = chat_result.get("temperature", temperature)
+    chat_metrics = aggregate_chat_metrics(chat_result["turn_metrics"], chat_result["tool_calls_log"],
+                                          parallel_tools=args.parallel_tools,
+                                          tool_profile=chat_result["tool_profile"],
+                                          tool_routing=chat_result["tool_routing"],
+                                          chat_stream=chat_result["chat_stream"])
+    metrics = {
+        "model": model,
+        "task": "agentic-chat",
+        "num_ctx": num_ctx,
+        "num_predict": num_predict,
+        "temperature": temperature,
+        "execution_mode": args.mode,
+        "context_management": args.context_management,
+        "run_timestamp": datetime.now().isoformat(),
+        "timing": chat_metrics["timing"],
+        "tokens": chat_metrics["tokens"],
+        "chat": chat_metrics["chat"],
+    }
+    metrics["chat"]["failure_classification"] = classify_chat_result(
+        chat_result, chat_metrics["timing"]["total_duration_s"], chat_metrics["tokens"]["eval_count"])
+    save_chat_results(model, "agentic-chat", chat_result, metrics, mode=args.mode, ctx_size=ctx_size,
+                      num_ctx=num_ctx, num_predict=num_predict, tools=tools,
+                      context_management=args.context_management, temperature=temperature,
+                      results_dir=run_dir)
+    return AgenticChatEvaluator(args.mode).evaluate_model(model_to_dirname(model), result_path=run_dir)
+
+
+def run_sweep_chat(model: str, args, num_threads: int | None, system_msg: str, user_msg: str, tools: list[dict],
+                   timeout_total: int, max_turns: int = 30, tool_routing: str | None = None, **overrides) -> dict:
+    """One agentic-chat conversation with the CLI's chat options, for --chat-scaling, --schema-ab and --conversations.
+
+    `overrides` replace run_chat_benchmark arguments (seed, temperature, ... of a batch conversation).
+    """
+    num_ctx, num_predict, temperature, _ = chat_run_options(model, args)
+    options = dict(
+        model=model, system_msg=system_msg, user_msg=user_msg, tools=tools,
+        num_ctx=num_ctx, num_predict=num_predict, timeout_total=timeout_total,
+        num_threads=num_threads, context_management=args.context_management,
+        temperature=temperature, parallel_tools=args.parallel_tools,
+        tool_profile=args.tool_profile, tool_seed=args.tool_seed, max_turns=max_turns,
+        tool_cache=args.tool_cache,
+        tool_routing=tool_routing if tool_routing is not None else args.tool_routing,
+        chat_stream=args.chat_stream,
+    )
+    options.update(overrides)
+    return run_chat_benchmark(**options)
+
+
+def run_chat_scalings(models: list[str], args, num_threads: int | None, timeout: int):
+    """--chat-scaling: run agentic-chat on growing generated scenarios per model and report where each breaks."""
+    sizes = parse_sizes(args.chat_scaling)
+    system_msg, base_user_msg = parse_prompt_for_chat(load_prompt("agentic-chat"))
+    from agentic_chat_tools import TOOL_DEFINITIONS
+    print(f"\nAgentic-chat scaling: sizes {', '.join(f'{n}x{m}' for n, m in sizes)} (seed {args.scaling_seed})")
+
+    scalings = []
+    for i, model in enumerate(models, 1):
+        print(f"\n[{i}/{len(models)}] {model}")
+        num_ctx, _, temperature, ctx_size = chat_run_options(model, args)
+
+        def run_chat(user_msg, max_turns, timeout_total):
+            return run_sweep_chat(model, args, num_threads, system_msg, user_msg, TOOL_DEFINITIONS,
+                                  timeout_total, max_turns=max_turns)
+
+        def save_run(chat_result, run_dir):
+            return save_evaluated_chat_run(model, args, chat_result, run_dir, TOOL_DEFINITIONS)["scores"].get("total")
+
+        results_dir = get_model_results_dir(model, "agentic-chat-scaling", mode=args.mode, ctx_size=ctx_size)
+        scaling = run_chat_scaling(model, base_user_msg, run_chat, sizes, results_dir, save_run,
+                                   timeout=timeout, seed=args.scaling_seed, keep_going=args.scaling_keep_going)
+        scaling.update({"num_ctx": num_ctx, "temperature": temperature, "tool_profile": args.tool_profile,
+                        "hardware": build_hardware_info(args.mode, discover_topology())})
+        path = save_scaling(results_dir, scaling)
+        analysis = scaling["analysis"]
+        if analysis.get("breaking_size"):
+            print(f"  Breaks at {analysis['breaking_size']} ({analysis['breaking_reason']}); "
+                  f"largest passing size: {analysis['largest_passing_size'] or 'none'}")
+        elif "error" not in analysis:
+            print(f"  Held up to {analysis['largest_passing_size']}")
+        print(f"  Saved {path}")
+        scalings.append(scaling)
+        unload_model(model)
+
+    report_dir = os.path.join(REPORTS_DIR, args.mode)
+    os.makedirs(report_dir, exist_ok=True)
+    report_path = os.path.join(report_dir, "agentic_chat_scaling.md")
+    with open(report_path, "w", encoding="utf-8") as f:
+        f.write(f"# Agentic-Chat Scaling\n\nGenerated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        f.write(format_scaling_summary(scalings) + "\n")
+    print(f"\nAgentic-chat scaling summary: {report_path}")
+
+
+def run_schema_abs(models: list[str], args, num_threads: int | None, timeout: int):
+    """--schema-ab: run agentic-chat once per tool-schema variant per model and compare prefill and validity."""
+    variants = list(SCHEMA_VARIANTS) if args.schema_ab == "all" else [v.strip() for v in args.schema_ab.split(",")]
+    system_msg, user_msg = parse_prompt_for_chat(load_prompt("agentic-chat"))
+    routings = ["none", "stage"] if args.tool_routing == "stage" else ["none"]
+    print(f"\nTool-schema A/B: {', '.join(variants)}{' (each also with stage tool routing)' if len(routings) > 1 else ''}")
+
+    results = []
+    for i, model in enumerate(models, 1):
+        print(f"\n[{i}/{len(models)}] {model}")
+        num_ctx, _, temperature, ctx_size = chat_run_options(model, args)
+        results_dir = get_model_results_dir(model, "agentic-chat-schema", mode=args.mode, ctx_size=ctx_size)
+        ab = run_schema_ab(
+            model, system_msg, variants, schema_variant,
+            lambda system, tools, routing: run_sweep_chat(model, args, num_threads, system, user_msg, tools, timeout,
+                                                          tool_routing=routing),
+            results_dir,
+            lambda chat_result, run_dir, tools: save_evaluated_chat_run(model, args, chat_result, run_dir, tools),
+            routings=routings,
+        )
+        ab.update({"num_ctx": num_ctx, "temperature": temperature, "tool_profile": args.tool_profile,
+                   "hardware": build_hardware_info(args.mode, discover_topology())})
+        print(f"  Saved {save_schema_ab(results_dir, ab)}")
+        results.append(ab)
+        unload_model(model)
+
+    report_dir = os.path.join(REPORTS_DIR, args.mode)
+    os.makedirs(report_dir, exist_ok=True)
+    report_path = os.path.join(report_dir, "agentic_chat_schema.md")
+    with open(report_path, "w", encoding="utf-8") as f:
+        f.write(f"# Tool-Schema A/B\n\nGenerated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        f.write(format_schema_ab_summary(results) + "\n")
+    print(f"\nTool-schema A/B summary: {report_path}")
+
+
+def run_chat_batches(models: list[str], args, num_threads: int | None, timeout: int):
+    """--conversations: run K agentic-chat conversations per model concurrently and report their spread."""
+    temperatures = [float(t) for t in args.batch_temperatures.split(",")] if args.batch_temperatures else None
+    size = parse_sizes(args.batch_scenario)[0] if args.batch_scenario else None
+    concurrency = args.batch_concurrency or args.conversations
+    system_msg, base_user_msg = parse_prompt_for_chat(load_prompt("agentic-chat"))
+    from agentic_chat_tools import TOOL_DEFINITIONS, use_tool_profile
+    from agentic_scenarios import use_scenario
+    plans, scenario = plan_conversations(args.conversations, args.batch_seed, temperatures, size)
+    print(f"\nAgentic-chat batch: {args.conversations} conversation(s) per model, {concurrency} at a time, "
+          f"scenario {scenario.name + ' each' if scenario else 'reference'}, seeds from {args.batch_seed}"
+          f"{', temperatures ' + args.batch_temperatures if temperatures else ''}")
+
+    batches = []
+    for i, model in enumerate(models, 1):
+        print(f"\n[{i}/{len(models)}] {model}")
+        num_ctx, _, temperature, ctx_size = chat_run_options(model, args)
+        # Conversations share one tool data set and one tool simulator (both are module globals)
+        simulator = use_tool_profile(args.tool_profile, args.tool_seed)
+
+        def run_chat(plan, user_msg, max_turns, timeout_total):
+            overrides = {"seed": plan["seed"], "tool_simulator": simulator, "verbose": False}
+            if plan["temperature"] is not None:
+                overrides["temperature"] = plan["temperature"]
+            return run_sweep_chat(model, args, num_threads, system_msg, user_msg, TOOL_DEFINITIONS,
+                                  timeout_total, max_turns=max_turns, **overrides)
+
+        results_dir = get_model_results_dir(model, "agentic-chat-batch", mode=args.mode, ctx_size=ctx_size)
+        use_scenario(scenario)
+        try:
+            batch = run_chat_batch(
+                model, base_user_msg, plans, run_chat,
+                lambda chat_result, run_dir: save_evaluated_chat_run(model, args, chat_result, run_dir,
+                                                                     TOOL_DEFINITIONS),
+                results_dir, concurrency, timeout=timeout,
+            )
+        finally:
+            use_scenario(None)
+        batch.update({"num_ctx": num_ctx, "temperature": temperature, "scenario": scenario.name if scenario else "reference",
+                      "tool_profile": simulator.stats(), "hardware": build_hardware_info(args.mode, discover_topology())})
+        a = batch["analysis"]
+        print(f"  Completed {a['completion_rate']:.0%} | {', '.join(f'{k} {v}' for k, v in a['classifications'].items())} "
+              f"| score mean {a['score_mean']} | conversation p50/p90 {a['conversation_s']['p50']}/"
+              f"{a['conversation_s']['p90']}s | batch {a['batch_wall_s']}s (overlap x{a['overlap']})")
+        print(f"  Saved {save_chat_batch(results_dir, batch)}")
+        batches.append(batch)
+        unload_model(model)
+
+    report_dir = os.path.join(REPORTS_DIR, args.mode)
+    os.makedirs(report_dir, exist_ok=True)
+    report_path = os.path.join(report_dir, "agentic_chat_batch.md")
+    with open(report_path, "w", encoding="utf-8") as f:
+        f.write(f"# Agentic-Chat Batch\n\nGenerated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        f.write(format_chat_batch_summary(batches) + "\n")
+    print(f"\nAgentic-chat batch summary: {report_path}")
 
 
 def main():
@@ -599,6 +1083,35 @@ def main():
         action="store_true",
         help="Skip pulling models before benchmarking",
     )
+    parser.add_argument(
+        "--pull-concurrency",
+        type=int,
+        default=PULL_CONCURRENCY,
+        help=f"Models downloaded at the same time when pulling (default: {PULL_CONCURRENCY})"
+    )
+    parser.add_argument(
+        "--sequential-pulls",
+        action="store_true",
+        help="Finish all pulls before the first benchmark instead of downloading in the background (avoids download CPU/disk load during CPU-mode runs)"
+    )
+    parser.add_argument(
+        "--engine-workers",
+        type=int,
+        default=ENGINE_WORKERS,
+        help=f"Parallel sandboxed runs of generated trading_engine.py while benchmarking continues (default: {ENGINE_WORKERS})"
+    )
+    parser.add_argument(
+        "--engine-memory-mb",
+        type=int,
+        default=ENGINE_MEMORY_LIMIT_MB,
+        help=f"Address-space limit for generated engine code in MB (default: {ENGINE_MEMORY_LIMIT_MB})"
+    )
+    parser.add_argument(
+        "--engine-timeout",
+        type=float,
+        default=ENGINE_TIMEOUT_S,
+        help=f"Wall-clock limit for generated engine code in seconds (default: {ENGINE_TIMEOUT_S})"
+    )
     parser.add_argument(
         "--num-ctx",
         type=int,
@@ -643,8 +1156,197 @@ def main():
         default=None,
         help="Sampling temperature for agentic-chat (overrides size-based default). Lower = more deterministic tool calls."
     )
+    parser.add_argument(
+        "--parallel-tools",
+        action="store_true",
+        help="agentic-chat: run the tool calls of one turn concurrently (results keep call order)"
+    )
+    parser.add_argument(
+        "--storage",
+        type=str,
+        default="plain",
+        choices=list(STORAGE_FORMATS),
+        help="Format for output.md / transcript files: plain, gzip, or zstd (needs the zstandard package). Default: plain"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="agentic-chat: continue each model's conversation from the last complete turn in its transcript.jsonl"
+    )
+    parser.add_argument(
+        "--chat-stream",
+        action="store_true",
+        help="agentic-chat: stream responses, record time to first token / tool call, and dispatch each tool call as it arrives"
+    )
+    parser.add_argument(
+        "--tool-profile",
+        type=str,
+        default="none",
+        choices=list(TOOL_PROFILES),
+        help="agentic-chat: simulated tool latency, rate limits and transient errors (default: none)"
+    )
+    parser.add_argument(
+        "--tool-cache",
+        action="store_true",
+        help="agentic-chat: answer repeated identical read-only tool calls from a per-run cache"
+    )
+    parser.add_argument(
+        "--tool-routing",
+        type=str,
+        default="none",
+        choices=list(TOOL_ROUTING_MODES),
+        help="agentic-chat: 'stage' sends only the tools relevant to the current workflow stage each turn (default: none)"
+    )
+    parser.add_argument(
+        "--tool-seed",
+        type=int,
+        default=0,
+        help="Seed for --tool-profile delays and injected failures (default: 0)"
+    )
+    parser.add_argument(
+        "--profile-harness",
+        type=str,
+        default=None,
+        choices=PROFILERS,
+        help="Profile the harness itself during each run and save profile.prof (cprofile) or profile.html (pyinstrument) next to metrics.json"
+    )
+    parser.add_argument(
+        "--no-power",
+        action="store_true",
+        help="Disable power sampling (GPU power.draw, CPU RAPL) and the per-token energy block in metrics.json"
+    )
+    parser.add_argument(
+        "--thread-sweep",
+        action="store_true",
+        help="CPU mode: instead of running tasks, sweep num_thread (1, 2, 4, ... up to --num-threads or the 75%% cap) per model and recommend the optimal thread count"
+    )
+    parser.add_argument(
+        "--sweep-threads",
+        type=str,
+        default=None,
+        help="Explicit comma-separated thread counts for --thread-sweep (default: powers of 2 plus physical-core/SMT boundaries)"
+    )
+    parser.add_argument(
+        "--sweep-repeats",
+        type=int,
+        default=2,
+        help="Measured generations per thread count in --thread-sweep (median is used, default: 2)"
+    )
+    parser.add_argument(
+        "--sweep-predict",
+        type=int,
+        default=256,
+        help="Max output tokens per --thread-sweep generation (default: 256)"
+    )
+    parser.add_argument(
+        "--sweep-task",
+        type=str,
+        default="greenfield",
+        help="Task whose prompt is used for --thread-sweep (default: greenfield)"
+    )
+    parser.add_argument(
+        "--chat-scaling",
+        type=str,
+        default=None,
+        help="Instead of running tasks, run agentic-chat on generated scenarios of growing size, "
+             "e.g. '3x4,10x4,30x5,100x5' (portfolios x holdings), and report where each model breaks"
+    )
+    parser.add_argument(
+        "--scaling-seed",
+        type=int,
+        default=42,
+        help="Seed for the --chat-scaling scenarios (default: 42)"
+    )
+    parser.add_argument(
+        "--scaling-keep-going",
+        action="store_true",
+        help="Run every --chat-scaling size even after one fails (default: stop at the first failure)"
+    )
+    parser.add_argument(
+        "--schema-ab",
+        type=str,
+        default=None,
+        help="Instead of running tasks, run agentic-chat once per tool-schema variant and compare prefill "
+             "tokens/time and tool-call validity: comma-separated from full, no-examples, minified, compact, or 'all'"
+    )
+    parser.add_argument(
+        "--conversations",
+        type=int,
+        default=None,
+        help="Instead of running tasks, run K independent agentic-chat conversations per model concurrently "
+             "and report completion rate, outcome distribution and latency percentiles"
+    )
+    parser.add_argument(
+        "--batch-concurrency",
+        type=int,
+        default=None,
+        help="Conversations in flight at once for --conversations (default: all K; match OLLAMA_NUM_PARALLEL)"
+    )
+    parser.add_argument(
+        "--batch-seed",
+        type=int,
+        default=0,
+        help="First Ollama sampling seed for --conversations (conversation i uses seed + i) and scenario seed (default: 0)"
+    )
+    parser.add_argument(
+        "--batch-temperatures",
+        type=str,
+        default=None,
+        help="Comma-separated temperatures cycled across --conversations (default: the model's chat temperature)"
+    )
+    parser.add_argument(
+        "--batch-scenario",
+        type=str,
+        default=None,
+        help="Give each --conversations conversation its own generated NxM scenario (portfolios x holdings) "
+             "instead of the reference task"
+    )
+    parser.add_argument(
+        "--launcher",
+        type=str,
+        default=None,
+        choices=sorted(LAUNCHERS),
+        help="Pin Ollama to chosen cores/NUMA node: 'attach' (pin the running server), 'taskset' or 'numactl' (start a pinned 'ollama serve')"
+    )
+    parser.add_argument(
+        "--cpu-affinity",
+        type=str,
+        default=None,
+        help="CPU list for --launcher, e.g. '0-15' or '0-7,16-23'"
+    )
+    parser.add_argument(
+        "--numa-node",
+        type=int,
+        default=None,
+        help="NUMA node for --launcher (CPUs of that node; numactl also binds memory to it)"
+    )
     args = parser.parse_args()
 
+    if args.thread_sweep and args.mode != "cpu":
+        print("Error: --thread-sweep is only supported with --mode cpu")
+        sys.exit(1)
+    if args.thread_sweep and (args.sweep_task not in TASKS or args.sweep_task == "agentic-chat"):
+        print(f"Error: --sweep-task must be one of {[t for t in TASKS if t != 'agentic-chat']}")
+        sys.exit(1)
+
+    if args.schema_ab and args.schema_ab != "all":
+        unknown = [v for v in args.schema_ab.split(",") if v.strip() not in SCHEMA_VARIANTS]
+        if unknown:
+            print(f"Error: unknown schema variant(s) {unknown}. Valid: {list(SCHEMA_VARIANTS)} or 'all'")
+            sys.exit(1)
+    if sum(bool(x) for x in (args.thread_sweep, args.chat_scaling, args.schema_ab, args.conversations)) > 1:
+        print("Error: --thread-sweep, --chat-scaling, --schema-ab and --conversations can't be combined")
+        sys.exit(1)
+    if args.conversations is not None and args.conversations < 1:
+        print("Error: --conversations must be at least 1")
+        sys.exit(1)
+
+    try:
+        set_storage(args.storage)
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
     timeout_seconds = args.timeout * 60
     num_threads = parse_num_threads(args.num_threads)
 
@@ -700,6 +1402,12 @@ def main():
     else:
         print(f"CPU threads: Ollama default ({available_threads} logical cores available)")
 
+    # Start or attach a pinned Ollama server if requested
+    cpu_pinning = start_launcher(args)
+    if cpu_pinning:
+        node = f", NUMA node {cpu_pinning['numa_node']}" if cpu_pinning["numa_node"] is not None else ""
+        print(f"CPU pinning: {cpu_pinning['launcher']} -> CPUs {cpu_pinning['cpus']}{node}")
+
     # Check Ollama is running
     if not check_ollama_running():
         print("\nError: Ollama is not running. Start it with 'ollama serve'")
@@ -760,17 +1468,50 @@ def main():
                             suggested_ctx = max(8192, 2 ** (total_tokens.bit_length()))  # Round up to power of 2
                             print(f"  {model} {task}: used {total_tokens} tokens on CPU, suggest ctx >= {suggested_ctx}")
 
-    # Pull models if needed
-    if not args.skip_pull:
-        installed = get_installed_models()
-        for model in models:
-            if model not in installed:
-                pull_model(model)
+    # Pull missing models. By default pulls overlap with benchmarking: each model's
+    # benchmarks wait only for its own pull, and a model whose pull fails is skipped.
+    pull_manager, pulls = start_pulls(models, args)
+    if pull_manager:
+        atexit.register(pull_manager.shutdown, wait=False)
+    if args.sequential_pulls:
+        for model in list(pulls):
+            wait_for_pull(model, pulls)
+
+    skipped = []
+    if args.thread_sweep:
+        # Sweeps measure CPU scaling, so never run them next to a download
+        run_thread_sweeps(wait_for_ready(models, pulls), args, num_threads, timeout_seconds, cpu_pinning)
+        return
+    if args.chat_scaling:
+        run_chat_scalings(wait_for_ready(models, pulls), args, num_threads, timeout_seconds)
+        return
+    if args.schema_ab:
+        run_schema_abs(wait_for_ready(models, pulls), args, num_threads, timeout_seconds)
+        return
+    if args.conversations:
+        run_chat_batches(wait_for_ready(models, pulls), args, num_threads, timeout_seconds)
+        return
+
+    # Power of the local machine says nothing about a cloud model's energy use
+    measure_power = not args.no_power and args.mode != "cloud"
+
+    # Generated engine code runs in a sandboxed worker pool while the next model benchmarks
+    engine_executor = None
+    if "engine" in tasks:
+        engine_executor = EngineExecutor(
+            max_workers=args.engine_workers,
+            limits=SandboxLimits(memory_mb=args.engine_memory_mb, timeout_s=args.engine_timeout),
+        )
 
     # Run benchmarks
     total = len(models) * len(tasks)
     current = 0
     for model in models:
+        if not wait_for_pull(model, pulls):
+            print(f"\n  Skipping {model}: pull failed ({len(tasks)} task(s))")
+            skipped.append(model)
+            current += len(tasks)
+            continue
         for task in tasks:
             current += 1
             print(f"\n[{current}/{total}]")
@@ -785,6 +1526,16 @@ def main():
                     num_threads=num_threads,
                     context_management=args.context_management,
                     temperature=temp,
+                    profiler=args.profile_harness,
+                    cpu_pinning=cpu_pinning,
+                    measure_power=measure_power,
+                    parallel_tools=args.parallel_tools,
+                    tool_profile=args.tool_profile,
+                    tool_seed=args.tool_seed,
+                    tool_cache=args.tool_cache,
+                    tool_routing=args.tool_routing,
+                    chat_stream=args.chat_stream,
+                    resume=args.resume,
                 )
             else:
                 run_single_benchmark(
@@ -792,11 +1543,27 @@ def main():
                     num_ctx_override=args.num_ctx,
                     num_predict_override=args.num_predict,
                     timeout=timeout_seconds,
-                    num_threads=num_threads
+                    num_threads=num_threads,
+                    profiler=args.profile_harness,
+                    cpu_pinning=cpu_pinning,
+                    measure_power=measure_power,
+                    engine_executor=engine_executor,
                 )
 
+    if pull_manager:
+        pull_manager.shutdown()
+    if engine_executor:
+        if engine_executor.pending():
+            print(f"\nWaiting for {engine_executor.pending()} engine run(s) to finish...")
+        runs = engine_executor.wait_all()
+        if runs:
+            ok = sum(1 for r in runs if r.get("status") == "ok")
+            print(f"Engine runs: {ok}/{len(runs)} succeeded (details in engine_result.json)")
+
     print(f"\n{'='*60}")
     print("All benchmarks complete!")
+    if skipped:
+        print(f"Skipped (pull failed): {', '.join(skipped)}")
     print(f"Results saved to: {MODELS_DIR}")
     print("Run 'python scripts/generate_report.py' to build comparison report.")
 
@@ -9,6 +9,7 @@ import os
 import re
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
@@ -22,13 +23,20 @@ from config import (
 
 # Import tool definitions and dispatch from requirements
 sys.path.insert(0, REQUIREMENTS_DIR)
-from agentic_chat_tools import TOOL_DEFINITIONS, dispatch_tool_call
+from agentic_chat_tools import TOOL_DEFINITIONS, dispatch_tool_call, use_tool_profile
+from chat_transcript import TRANSCRIPT_LOG, TranscriptLog, read_transcript
+from results_io import convert_file, get_storage, write_json, write_text
+from phase_timer import PhaseTimer, timed
 
 import copy
 import hashlib
+import threading
 from collections import Counter
 
 
+# Worker threads for --parallel-tools (calls beyond this in one turn queue)
+TOOL_WORKERS = 8
+
 # Spin detection parameters
 _SPIN_WINDOW = 8       # Look at last N tool calls — wider to span portfolio transitions
 _SPIN_REPEAT_THRESHOLD = 3  # Same signature this many times in window → spinning
@@ -75,6 +83,76 @@ def detect_spinning(tool_calls_log: list[dict], window: int = _SPIN_WINDOW) -> d
     return None
 
 
+# Tools whose result depends only on their arguments. send_notification and
+# log_operation have side effects, so a repeat must still reach the tool.
+CACHEABLE_TOOLS = {
+    "get_stock_prices",
+    "get_portfolio_holdings",
+    "calculate_portfolio_value",
+    "calculate_volatility_score",
+    "check_risk_threshold",
+    "generate_report",
+}
+
+
+class ToolResultCache:
+    """Per-run memo of successful tool results, keyed on _call_signature.
+
+    Used with --tool-cache: a repeat of an identical read-only call is answered from
+    here instead of reaching the tool (and any simulated latency in front of it).
+    Error results are never cached, so a failed call is retried for real.
+    """
+
+    def __init__(self):
+        self._results: dict[str, dict | str] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+
+    def get(self, tool_name: str, tool_args) -> tuple[bool, dict | str | None]:
+        if tool_name not in CACHEABLE_TOOLS:
+            return False, None
+        with self._lock:
+            key = _call_signature(tool_name, tool_args)
+            if key not in self._results:
+                return False, None
+            self.hits += 1
+            return True, copy.deepcopy(self._results[key])
+
+    def put(self, tool_name: str, tool_args, result):
+        if tool_name in CACHEABLE_TOOLS and not (isinstance(result, dict) and "error" in result):
+            with self._lock:
+                self._results[_call_signature(tool_name, tool_args)] = copy.deepcopy(result)
+
+
+# Tool routing ("stage"): a tool is offered once its inputs exist for the current portfolio,
+# i.e. its prerequisites succeeded since the last successful get_portfolio_holdings.
+# get_portfolio_holdings (next portfolio) and log_operation are always offered.
+TOOL_ROUTING_MODES = ("none", "stage")
+ROUTE_PREREQUISITES = {
+    "get_portfolio_holdings": set(),
+    "log_operation": set(),
+    "get_stock_prices": {"get_portfolio_holdings"},
+    "calculate_volatility_score": {"get_portfolio_holdings"},
+    "calculate_portfolio_value": {"get_stock_prices"},
+    "check_risk_threshold": {"calculate_portfolio_value", "calculate_volatility_score"},
+    "generate_report": {"check_risk_threshold"},
+    "send_notification": {"generate_report"},
+}
+
+
+def route_tools(tools: list[dict], tool_calls_log: list[dict]) -> list[dict]:
+    """The subset of `tools` relevant at this point of the portfolio workflow (tool order kept)."""
+    done = set()
+    for tc in tool_calls_log:
+        if not tc.get("success"):
+            continue
+        if tc["tool"] == "get_portfolio_holdings":
+            done = set()
+        done.add(tc["tool"])
+    return [t for t in tools
+            if ROUTE_PREREQUISITES.get(t.get("function", {}).get("name"), set()) <= done]
+
+
 def parse_prompt_for_chat(prompt_text: str) -> tuple[str, str]:
     """Split a prompt file into system and user messages.
 
@@ -100,6 +178,115 @@ def parse_prompt_for_chat(prompt_text: str) -> tuple[str, str]:
     return system_msg, user_msg
 
 
+def _timed_dispatch(tool_name: str, tool_args,
+                    cache: ToolResultCache | None = None) -> tuple[dict | str, float, float, bool]:
+    """(result, start offset, duration, served from cache) of one tool call; start is perf_counter-based."""
+    start = time.perf_counter()
+    if cache is not None:
+        hit, result = cache.get(tool_name, tool_args)
+        if hit:
+            return result, start, time.perf_counter() - start, True
+    result = dispatch_tool_call(tool_name, tool_args)
+    if cache is not None:
+        cache.put(tool_name, tool_args, result)
+    return result, start, time.perf_counter() - start, False
+
+
+def dispatch_tool_calls(tool_calls: list[dict], executor: ThreadPoolExecutor | None = None,
+                        timer: PhaseTimer | None = None,
+                        cache: ToolResultCache | None = None) -> tuple[list[tuple[dict | str, float, bool]], float]:
+    """Run one turn's tool calls, serially or on `executor`, answering repeats from `cache` if given.
+
+    Calls from the same assistant message are independent: the model emitted them before
+    seeing any result, so none can take another's output as input. Results come back in
+    call order either way, so the appended tool messages keep the model's order.
+
+    Returns ([(result, duration_s, cached), ...], wall-clock seconds for the whole batch).
+    """
+    calls = [(tc.get("function", {}).get("name", "unknown"), tc.get("function", {}).get("arguments", {}))
+             for tc in tool_calls]
+    batch_start = time.perf_counter()
+    if executor is None or len(calls) < 2:
+        outcomes = []
+        for name, args in calls:
+            with timed(timer, "tool_dispatch"):
+                outcomes.append(_timed_dispatch(name, args, cache))
+    else:
+        with timed(timer, "tool_dispatch"):
+            futures = [executor.submit(_timed_dispatch, name, args, cache) for name, args in calls]
+            outcomes = [f.result() for f in futures]
+    wall = time.perf_counter() - batch_start
+    return [(result, duration, cached) for result, _, duration, cached in outcomes], wall
+
+
+def stream_chat_request(payload: dict, timeout: float, on_tool_call=None) -> dict:
+    """POST a streaming /api/chat request and reassemble the non-streaming response shape.
+
+    Ollama sends each tool call complete in a chunk of its own, possibly before the model
+    has finished the message. on_tool_call(tc) is called as each one arrives so it can be
+    dispatched early. The result gets a "stream" dict of client timings from request
+    start: ttft_s (first thinking, content or tool-call chunk), time_to_content_s,
+    time_to_tool_call_s, and the number of chunks. Failures come back as {"error": ...}.
+    """
+    request_start = time.time()
+    deadline = request_start + timeout
+    first = {}
+    content, thinking, tool_calls = [], [], []
+    chunks = 0
+    final = {}
+    try:
+        with requests.post(OLLAMA_CHAT_URL, json={**payload, "stream": True}, timeout=timeout, stream=True) as resp:
+            resp.raise_for_status()
+            for line in resp.iter_lines():
+                # requests' timeout is per-read, so enforce the turn budget ourselves
+                if time.time() > deadline:
+                    return {"error": f"Chat turn exceeded timeout of {timeout:.0f}s"}
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if "error" in chunk:
+                    return {"error": chunk["error"]}
+                message = chunk.get("message") or {}
+                now = time.time() - request_start
+                if message.get("thinking"):
+                    first.setdefault("thinking", now)
+                    thinking.append(message["thinking"])
+                if message.get("content"):
+                    first.setdefault("content", now)
+                    content.append(message["content"])
+                for tc in message.get("tool_calls") or []:
+                    first.setdefault("tool_call", now)
+                    tool_calls.append(tc)
+                    if on_tool_call is not None:
+                        on_tool_call(tc)
+                if message.get("thinking") or message.get("content") or message.get("tool_calls"):
+                    chunks += 1
+                if chunk.get("done"):
+                    final = chunk
+                    break
+    except requests.RequestException as e:
+        return {"error": str(e)}
+    except json.JSONDecodeError as e:
+        return {"error": f"Malformed stream chunk: {e}"}
+
+    if not final:
+        return {"error": "Stream ended without a final (done) message"}
+
+    message = {"role": "assistant", "content": "".join(content)}
+    if thinking:
+        message["thinking"] = "".join(thinking)
+    if tool_calls:
+        message["tool_calls"] = tool_calls
+    final["message"] = message
+    final["stream"] = {
+        "ttft_s": round(min(first.values()), 3) if first else None,
+        "time_to_content_s": round(first["content"], 3) if "content" in first else None,
+        "time_to_tool_call_s": round(first["tool_call"], 3) if "tool_call" in first else None,
+        "chunks": chunks,
+    }
+    return final
+
+
 def estimate_token_count(messages: list[dict]) -> int:
     """Estimate token count for a list of chat messages.
 
@@ -223,6 +410,19 @@ def run_chat_benchmark(
     num_threads: int | None = None,
     context_management: str = "none",
     temperature: float | None = None,
+    timer: PhaseTimer | None = None,
+    parallel_tools: bool = False,
+    tool_profile: str = "none",
+    tool_seed: int = 0,
+    max_turns: int = 30,
+    tool_cache: bool = False,
+    tool_routing: str = "none",
+    chat_stream: bool = False,
+    transcript_path: str | None = None,
+    resume: bool = False,
+    seed: int | None = None,
+    tool_simulator=None,
+    verbose: bool = True,
 ) -> dict:
     """Run a multi-turn chat benchmark with tool calling.
 
@@ -237,10 +437,32 @@ def run_chat_benchmark(
         num_threads: CPU thread count (None = Ollama default).
         context_management: "none" (send full history) or "managed" (prune to fit context).
         temperature: Sampling temperature (None = Ollama default).
+        timer: Optional PhaseTimer; per-turn request, serialization, pruning
+            and tool dispatch time is recorded into it.
+        parallel_tools: Run the tool calls of one turn concurrently (see dispatch_tool_calls).
+        tool_profile: Latency/failure profile for the tools (tool_profiles.PROFILES).
+        tool_seed: Seed for the profile's delays and injected failures.
+        max_turns: Turn budget (raise it for larger scenarios, see agentic_scenarios.py).
+        tool_cache: Answer repeated identical read-only tool calls from a ToolResultCache.
+        tool_routing: "none" sends every tool each turn; "stage" sends only the tools
+            whose inputs exist at this workflow stage (see route_tools).
+        chat_stream: Stream each response (stream_chat_request), record time to first token
+            and to first tool call, and dispatch each tool call as soon as it arrives.
+        transcript_path: Append a checkpoint per completed turn to this transcript.jsonl
+            (see chat_transcript.py); the returned conversation is rebuilt from it.
+        resume: Continue the conversation in transcript_path from its last complete turn
+            (starts fresh if there is none; returns it as is if it already completed).
+        seed: Ollama sampling seed (None = Ollama default).
+        tool_simulator: A ToolSimulator the caller already installed with use_tool_profile,
+            shared by concurrent conversations (its stats then cover all of them);
+            tool_profile/tool_seed are ignored when given.
+        verbose: Print per-turn progress (off for concurrent batch conversations).
 
     Returns:
         Dict with messages, turn_metrics, tool_calls_log, total_turns,
-        completed, final_response, context_management, temperature.
+        completed, final_response, context_management, temperature, parallel_tools,
+        tool_profile (stats of what the profile injected), max_turns, tool_cache, tool_routing,
+        chat_stream, resumed_from_turn, elapsed_s (wall time, including any time before a resume).
     """
     messages = [
         {"role": "system", "content": system_msg},
@@ -249,7 +471,6 @@ def run_chat_benchmark(
 
     turn_metrics = []
     tool_calls_log = []
-    max_turns = 30
     completed = False
     final_response = ""
     empty_retries = 0
@@ -257,205 +478,326 @@ def run_chat_benchmark(
     spin_warned = False       # Has Stage A intervention been issued?
     spin_warn_turn = -1       # Turn number when warning was issued
     start_time = time.time()
+    say = print if verbose else (lambda *a, **k: None)
+    if tool_simulator is None:
+        tool_simulator = use_tool_profile(tool_profile, tool_seed)
+    cache = ToolResultCache() if tool_cache else None
+    full_schema_bytes = len(json.dumps(tools).encode("utf-8"))
+    seen_signatures = set()
+
+    checkpoint = read_transcript(transcript_path) if transcript_path and resume else None
+    if checkpoint:
+        messages = checkpoint["messages"]
+        turn_metrics = [t for t in checkpoint["turn_metrics"] if "error" not in t]
+        tool_calls_log = checkpoint["tool_calls_log"]
+        completed = checkpoint["completed"]
+        final_response = checkpoint["final_response"]
+        spin_detected = checkpoint["spin_detected"]
+        empty_retries = checkpoint["state"].get("empty_retries", 0)
+        spin_warned = checkpoint["state"].get("spin_warned", False)
+        spin_warn_turn = checkpoint["state"].get("spin_warn_turn", -1)
+        seen_signatures = {tc["signature"] for tc in tool_calls_log if "signature" in tc}
+        start_time -= checkpoint["elapsed_s"]
+        say(f"  Resuming from turn {len(turn_metrics)} ({len(messages)} messages, "
+            f"{checkpoint['elapsed_s']:.0f}s already elapsed){' -- already completed' if completed else ''}")
+    start_turn = len(turn_metrics)
+
+    log = None
+    if transcript_path and not completed:
+        log = TranscriptLog(transcript_path, resume=checkpoint is not None)
+        if checkpoint:
+            log.resumed(start_turn)
+        else:
+            log.start(model, messages, num_ctx=num_ctx, num_predict=num_predict, temperature=temperature,
+                      context_management=context_management, max_turns=max_turns)
+    logged = [len(messages), len(turn_metrics), len(tool_calls_log)]
+
+    def save_checkpoint():
+        """Append the turn finished since the last checkpoint, if any."""
+        if log is None or len(turn_metrics) == logged[1]:
+            return
+        log.turn(turn_metrics[-1]["turn"], messages[logged[0]:], turn_metrics[-1], tool_calls_log[logged[2]:],
+                 {"empty_retries": empty_retries, "spin_warned": spin_warned, "spin_warn_turn": spin_warn_turn},
+                 time.time() - start_time)
+        logged[:] = [len(messages), len(turn_metrics), len(tool_calls_log)]
 
     options = {"num_ctx": num_ctx, "num_predict": num_predict}
     if num_threads is not None:
         options["num_thread"] = num_threads
     if temperature is not None:
         options["temperature"] = temperature
+    if seed is not None:
+        options["seed"] = seed
+
+    executor = ThreadPoolExecutor(max_workers=TOOL_WORKERS, thread_name_prefix="tool") if parallel_tools else None
+    # Streaming dispatches calls as they arrive; without --parallel-tools one worker keeps them serial
+    stream_executor = (executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix="tool")) if chat_stream else None
+    try:
+        # A completed checkpoint has nothing left to run
+        for turn in range(start_turn, start_turn if completed else max_turns):
+            save_checkpoint()
+            elapsed = time.time() - start_time
+            if elapsed >= timeout_total:
+                say(f"  Chat timeout after {elapsed:.0f}s ({turn} turns)")
+                break
 
-    for turn in range(max_turns):
-        elapsed = time.time() - start_time
-        if elapsed >= timeout_total:
-            print(f"  Chat timeout after {elapsed:.0f}s ({turn} turns)")
-            break
-
-        remaining = timeout_total - elapsed
-        turn_start = time.time()
-
-        # Snapshot message size before the API call (proxy for prompt size)
-        messages_json_bytes = len(json.dumps(messages, default=str).encode("utf-8"))
-
-        # Apply context management if enabled
-        if context_management == "managed":
-            api_messages = prune_messages_for_context(messages, num_ctx)
-            pruned = api_messages is not messages
-            if pruned:
-                est_before = estimate_token_count(messages)
-                est_after = estimate_token_count(api_messages)
-                print(f"  Turn {turn}: context management pruned {len(messages)} -> {len(api_messages)} messages "
-                      f"(~{est_before} -> ~{est_after} est. tokens)")
-        else:
-            api_messages = messages
-
-        try:
-            resp = requests.post(
-                OLLAMA_CHAT_URL,
-                json={
-                    "model": model,
-                    "messages": api_messages,
-                    "tools": tools,
-                    "stream": False,
-                    "options": options,
-                },
-                timeout=min(remaining, 300),  # Per-turn cap of 5 min
-            )
-            resp.raise_for_status()
-            data = resp.json()
-        except requests.RequestException as e:
-            turn_metrics.append({
-                "turn": turn,
-                "error": str(e),
-                "duration_s": round(time.time() - turn_start, 2),
-            })
-            break
-
-        turn_duration = time.time() - turn_start
-        message = data.get("message", {})
-
-        # Collect per-turn metrics from Ollama response
-        prompt_eval_count = data.get("prompt_eval_count", 0)
-        eval_count = data.get("eval_count", 0)
-        prompt_eval_ns = data.get("prompt_eval_duration", 0)
-        eval_ns = data.get("eval_duration", 0)
-
-        prompt_eval_s = prompt_eval_ns / 1e9
-        eval_s = eval_ns / 1e9
-        prompt_tps = round(prompt_eval_count / prompt_eval_s, 1) if prompt_eval_s > 0 else 0
-        eval_tps = round(eval_count / eval_s, 1) if eval_s > 0 else 0
-        context_pressure = round(prompt_eval_count / num_ctx * 100, 1) if num_ctx > 0 else 0
-
-        tm = {
-            "turn": turn,
-            "duration_s": round(turn_duration, 2),
-            "prompt_eval_count": prompt_eval_count,
-            "eval_count": eval_count,
-            "prompt_eval_duration_ns": prompt_eval_ns,
-            "eval_duration_ns": eval_ns,
-            "prompt_eval_tps": prompt_tps,
-            "eval_tps": eval_tps,
-            "num_ctx": num_ctx,
-            "context_pressure_pct": context_pressure,
-            "messages_json_bytes": messages_json_bytes,
-            "had_tool_schema": True,
-        }
+            remaining = timeout_total - elapsed
+            turn_start = time.time()
+
+            # Snapshot message size before the API call (proxy for prompt size)
+            with timed(timer, "message_serialization"):
+                messages_json_bytes = len(json.dumps(messages, default=str).encode("utf-8"))
+
+            # Apply context management if enabled
+            if context_management == "managed":
+                with timed(timer, "context_management"):
+                    api_messages = prune_messages_for_context(messages, num_ctx)
+                pruned = api_messages is not messages
+                if pruned:
+                    est_before = estimate_token_count(messages)
+                    est_after = estimate_token_count(api_messages)
+                    say(f"  Turn {turn}: context management pruned {len(messages)} -> {len(api_messages)} messages "
+                        f"(~{est_before} -> ~{est_after} est. tokens)")
+            else:
+                api_messages = messages
+
+            turn_tools = route_tools(tools, tool_calls_log) if tool_routing == "stage" else tools
+            offered = {t.get("function", {}).get("name") for t in turn_tools}
+            schema_bytes = len(json.dumps(turn_tools).encode("utf-8")) if turn_tools is not tools else full_schema_bytes
+
+            payload = {
+                "model": model,
+                "messages": api_messages,
+                "tools": turn_tools,
+                "stream": False,
+                "options": options,
+            }
+            early_dispatch = []  # futures of tool calls dispatched while the response streams
 
-        # Add context management metrics if pruning occurred
-        if context_management == "managed":
-            was_pruned = api_messages is not messages
-            tm["context_management_active"] = True
-            tm["messages_before_pruning"] = len(messages)
-            tm["messages_after_pruning"] = len(api_messages)
-            if was_pruned:
-                tm["est_tokens_before"] = estimate_token_count(messages)
-                tm["est_tokens_after"] = estimate_token_count(api_messages)
+            def dispatch_early(tc):
+                fn = tc.get("function", {})
+                early_dispatch.append(stream_executor.submit(_timed_dispatch, fn.get("name", "unknown"),
+                                                             fn.get("arguments", {}), cache))
+
+            try:
+                with timed(timer, "chat_request"):
+                    if chat_stream:
+                        data = stream_chat_request(payload, min(remaining, 300), dispatch_early)
+                    else:
+                        resp = requests.post(
+                            OLLAMA_CHAT_URL,
+                            json=payload,
+                            timeout=min(remaining, 300),  # Per-turn cap of 5 min
+                        )
+                        resp.raise_for_status()
+                        data = resp.json()
+            except requests.RequestException as e:
+                data = {"error": str(e)}
+            response_done = time.perf_counter()
+            if "error" in data:
+                turn_metrics.append({
+                    "turn": turn,
+                    "error": data["error"],
+                    "duration_s": round(time.time() - turn_start, 2),
+                })
+                break
 
-        tool_calls = message.get("tool_calls", [])
+            turn_duration = time.time() - turn_start
+            message = data.get("message", {})
 
-        if tool_calls:
-            # Model wants to call tools
-            tm["tool_calls"] = len(tool_calls)
-            turn_metrics.append(tm)
+            # Collect per-turn metrics from Ollama response
+            prompt_eval_count = data.get("prompt_eval_count", 0)
+            eval_count = data.get("eval_count", 0)
+            prompt_eval_ns = data.get("prompt_eval_duration", 0)
+            eval_ns = data.get("eval_duration", 0)
+            total_ns = data.get("total_duration", 0)
+            load_ns = data.get("load_duration", 0)
 
-            # Append the assistant message (with tool_calls) to history
-            messages.append(message)
+            prompt_eval_s = prompt_eval_ns / 1e9
+            eval_s = eval_ns / 1e9
+            prompt_tps = round(prompt_eval_count / prompt_eval_s, 1) if prompt_eval_s > 0 else 0
+            eval_tps = round(eval_count / eval_s, 1) if eval_s > 0 else 0
+            context_pressure = round(prompt_eval_count / num_ctx * 100, 1) if num_ctx > 0 else 0
 
-            # Execute each tool call and append results
-            for tc in tool_calls:
-                fn = tc.get("function", {})
-                tool_name = fn.get("name", "unknown")
-                tool_args = fn.get("arguments", {})
+            tm = {
+                "turn": turn,
+                "duration_s": round(turn_duration, 2),
+                "prompt_eval_count": prompt_eval_count,
+                "eval_count": eval_count,
+                "prompt_eval_duration_ns": prompt_eval_ns,
+                "eval_duration_ns": eval_ns,
+                "total_duration_ns": total_ns,
+                "load_duration_ns": load_ns,
+                "prompt_eval_tps": prompt_tps,
+                "eval_tps": eval_tps,
+                "num_ctx": num_ctx,
+                "context_pressure_pct": context_pressure,
+                "messages_json_bytes": messages_json_bytes,
+                "had_tool_schema": True,
+                "tools_sent": len(turn_tools),
+                "schema_bytes": schema_bytes,
+                "schema_bytes_saved": full_schema_bytes - schema_bytes,
+            }
+            if chat_stream:
+                tm.update(data["stream"])
+                first_action = data["stream"]["time_to_tool_call_s"] or data["stream"]["time_to_content_s"]
+                tm["time_to_action_s"] = first_action if first_action is not None else tm["duration_s"]
+            else:
+                tm["time_to_action_s"] = tm["duration_s"]  # nothing is usable before the whole message
+
+            # Add context management metrics if pruning occurred
+            if context_management == "managed":
+                was_pruned = api_messages is not messages
+                tm["context_management_active"] = True
+                tm["messages_before_pruning"] = len(messages)
+                tm["messages_after_pruning"] = len(api_messages)
+                if was_pruned:
+                    tm["est_tokens_before"] = estimate_token_count(messages)
+                    tm["est_tokens_after"] = estimate_token_count(api_messages)
 
-                call_start = time.time()
-                result = dispatch_tool_call(tool_name, tool_args)
-                call_duration = time.time() - call_start
+            tool_calls = message.get("tool_calls", [])
 
-                # Serialize result for the chat message
-                if isinstance(result, str):
-                    result_str = result
+            if tool_calls:
+                # Model wants to call tools
+                tm["tool_calls"] = len(tool_calls)
+                turn_metrics.append(tm)
+
+                # Append the assistant message (with tool_calls) to history
+                messages.append(message)
+
+                # Execute the tool calls (concurrently with an executor) and append results in call order
+                if early_dispatch:
+                    # Already running since their chunks arrived; wait for the rest
+                    wait_start = time.perf_counter()
+                    with timed(timer, "tool_dispatch"):
+                        raw = [f.result() for f in early_dispatch]
+                    tool_wall = time.perf_counter() - wait_start
+                    outcomes = [(result, duration, cached) for result, _, duration, cached in raw]
+                    tm["tool_overlap_s"] = round(sum(max(0.0, min(start + duration, response_done) - start)
+                                                     for _, start, duration, _ in raw), 4)
                 else:
-                    result_str = json.dumps(result, default=str)
+                    outcomes, tool_wall = dispatch_tool_calls(tool_calls, executor, timer, cache)
+                durations = [d for _, d, _ in outcomes]
+                tm["tool_wall_s"] = round(tool_wall, 4)
+                tm["tool_serial_s"] = round(sum(durations), 4)
+                tm["tool_critical_path_s"] = round(max(durations), 4)
+                for tc, (result, call_duration, cached) in zip(tool_calls, outcomes):
+                    fn = tc.get("function", {})
+                    tool_name = fn.get("name", "unknown")
+                    tool_args = fn.get("arguments", {})
+                    signature = _call_signature(tool_name, tool_args)
+                    duplicate = signature in seen_signatures
+                    seen_signatures.add(signature)
+
+                    # Serialize result for the chat message
+                    if isinstance(result, str):
+                        result_str = result
+                    else:
+                        result_str = json.dumps(result, default=str)
+
+                    tool_calls_log.append({
+                        "turn": turn,
+                        "tool": tool_name,
+                        "arguments": tool_args if isinstance(tool_args, dict) else str(tool_args),
+                        "result_preview": result_str[:500],
+                        "success": "error" not in (result if isinstance(result, dict) else {}),
+                        "duration_s": round(call_duration, 4),
+                        "signature": signature,
+                        "duplicate": duplicate,
+                        "cached": cached,
+                        "offered": tool_name in offered,
+                        "context_tokens_est": estimate_token_count([{"role": "tool", "content": result_str,
+                                                                     "tool_calls": [tc]}]),
+                    })
 
-                tool_calls_log.append({
-                    "turn": turn,
-                    "tool": tool_name,
-                    "arguments": tool_args if isinstance(tool_args, dict) else str(tool_args),
-                    "result_preview": result_str[:500],
-                    "success": "error" not in (result if isinstance(result, dict) else {}),
-                    "duration_s": round(call_duration, 4),
-                })
+                    # Add tool response to messages
+                    messages.append({
+                        "role": "tool",
+                        "content": result_str,
+                    })
 
-                # Add tool response to messages
-                messages.append({
-                    "role": "tool",
-                    "content": result_str,
-                })
+                pressure_warn = " \u26a0 NEAR LIMIT" if context_pressure > 90 else ""
+                tool_note = f" + tools {tool_wall:.2f}s" if tool_wall >= 0.005 else ""
+                say(f"  Turn {turn}: {len(tool_calls)} tool call(s) in {turn_duration:.1f}s{tool_note} "
+                    f"[prompt: {prompt_eval_count}/{num_ctx} tokens ({context_pressure:.1f}%){pressure_warn}, "
+                    f"eval: {eval_count} tokens]")
+                empty_retries = 0  # reset on successful tool-call turn
+
+                # Spin detection: 2-stage escalation (warn → stop)
+                spin = detect_spinning(tool_calls_log)
+                if spin:
+                    if not spin_warned:
+                        # Stage A: soft intervention — nudge the model
+                        spin_warned = True
+                        spin_warn_turn = turn
+                        messages.append({
+                            "role": "user",
+                            "content": (
+                                "You appear to be repeating the same tool calls. "
+                                "If you've already fetched data for this portfolio, "
+                                "proceed to the next step (risk check, report, or "
+                                "next portfolio). Do not call the same tool with "
+                                "the same arguments again."
+                            ),
+                        })
+                        say(f"  SPIN WARNING: {spin['tool']}() repeated {spin['repeat_count']}x "
+                            f"in last {spin['window']} calls — injecting correction")
+                    elif turn >= spin_warn_turn + 2:
+                        # Stage B: hard stop — still spinning after intervention
+                        spin["intervention_attempted"] = True
+                        spin_detected = spin
+                        say(f"  SPIN CONFIRMED: {spin['tool']}() still repeating after "
+                            f"intervention — stopping")
+                        break
 
-            pressure_warn = " \u26a0 NEAR LIMIT" if context_pressure > 90 else ""
-            print(f"  Turn {turn}: {len(tool_calls)} tool call(s) in {turn_duration:.1f}s "
-                  f"[prompt: {prompt_eval_count}/{num_ctx} tokens ({context_pressure:.1f}%){pressure_warn}, "
-                  f"eval: {eval_count} tokens]")
-            empty_retries = 0  # reset on successful tool-call turn
-
-            # Spin detection: 2-stage escalation (warn → stop)
-            spin = detect_spinning(tool_calls_log)
-            if spin:
-                if not spin_warned:
-                    # Stage A: soft intervention — nudge the model
-                    spin_warned = True
-                    spin_warn_turn = turn
+            else:
+                # No tool calls -- model is done (or stuck)
+                tm["tool_calls"] = 0
+                turn_metrics.append(tm)
+
+                content = message.get("content", "")
+                thinking = message.get("thinking", "")
+
+                if content:
+                    messages.append({"role": "assistant", "content": content})
+                    final_response = content
+                    completed = True
+                    empty_retries = 0  # reset on success
+                    pressure_warn = " \u26a0 NEAR LIMIT" if context_pressure > 90 else ""
+                    say(f"  Turn {turn}: final response ({len(content)} chars) in {turn_duration:.1f}s "
+                        f"[prompt: {prompt_eval_count}/{num_ctx} tokens ({context_pressure:.1f}%){pressure_warn}]")
+                    break
+                elif thinking and empty_retries < 1:
+                    # Model is reasoning but didn't emit content or tool calls -- nudge it
+                    empty_retries += 1
+                    tm["thinking_only_retry"] = True
+                    messages.append(message)  # preserve the thinking-only message in history
                     messages.append({
                         "role": "user",
-                        "content": (
-                            "You appear to be repeating the same tool calls. "
-                            "If you've already fetched data for this portfolio, "
-                            "proceed to the next step (risk check, report, or "
-                            "next portfolio). Do not call the same tool with "
-                            "the same arguments again."
-                        ),
+                        "content": "Continue. You were thinking but didn't make a tool call or provide a response. Please proceed with the next step.",
                     })
-                    print(f"  SPIN WARNING: {spin['tool']}() repeated {spin['repeat_count']}x "
-                          f"in last {spin['window']} calls — injecting correction")
-                elif turn >= spin_warn_turn + 2:
-                    # Stage B: hard stop — still spinning after intervention
-                    spin["intervention_attempted"] = True
-                    spin_detected = spin
-                    print(f"  SPIN CONFIRMED: {spin['tool']}() still repeating after "
-                          f"intervention — stopping")
+                    say(f"  Turn {turn}: thinking-only response, retrying with nudge")
+                    continue  # don't break -- try again
+                else:
+                    # Empty response with no tool calls -- model is stuck
+                    say(f"  Turn {turn}: empty response, ending")
                     break
-
-        else:
-            # No tool calls -- model is done (or stuck)
-            tm["tool_calls"] = 0
-            turn_metrics.append(tm)
-
-            content = message.get("content", "")
-            thinking = message.get("thinking", "")
-
-            if content:
-                messages.append({"role": "assistant", "content": content})
-                final_response = content
-                completed = True
-                empty_retries = 0  # reset on success
-                pressure_warn = " \u26a0 NEAR LIMIT" if context_pressure > 90 else ""
-                print(f"  Turn {turn}: final response ({len(content)} chars) in {turn_duration:.1f}s "
-                      f"[prompt: {prompt_eval_count}/{num_ctx} tokens ({context_pressure:.1f}%){pressure_warn}]")
-                break
-            elif thinking and empty_retries < 1:
-                # Model is reasoning but didn't emit content or tool calls -- nudge it
-                empty_retries += 1
-                tm["thinking_only_retry"] = True
-                messages.append(message)  # preserve the thinking-only message in history
-                messages.append({
-                    "role": "user",
-                    "content": "Continue. You were thinking but didn't make a tool call or provide a response. Please proceed with the next step.",
-                })
-                print(f"  Turn {turn}: thinking-only response, retrying with nudge")
-                continue  # don't break -- try again
-            else:
-                # Empty response with no tool calls -- model is stuck
-                print(f"  Turn {turn}: empty response, ending")
-                break
+    finally:
+        # Also on an exception, so no tool worker threads are left behind
+        if executor is not None:
+            executor.shutdown(wait=True)
+        if stream_executor is not None and stream_executor is not executor:
+            stream_executor.shutdown(wait=True)
+
+    if log is not None:
+        save_checkpoint()
+        log.end(completed, final_response, spin_detected)
+        log.close()
+    if transcript_path and (log is not None or checkpoint):
+        # The saved files come from the checkpoints, so they match what a resume would see
+        rebuilt = read_transcript(transcript_path)
+        messages, turn_metrics, tool_calls_log = (rebuilt["messages"], rebuilt["turn_metrics"],
+                                                  rebuilt["tool_calls_log"])
 
     return {
         "messages": messages,
@@ -467,20 +809,136 @@ def run_chat_benchmark(
         "context_management": context_management,
         "temperature": temperature,
         "spin_detected": spin_detected,
+        "parallel_tools": parallel_tools,
+        "tool_profile": tool_simulator.stats(),
+        "max_turns": max_turns,
+        "tool_cache": tool_cache,
+        "tool_routing": tool_routing,
+        "chat_stream": chat_stream,
+        "resumed_from_turn": start_turn if checkpoint else None,
+        "elapsed_s": round(time.time() - start_time, 2),  # includes the time before a resume
+        "seed": seed,
+    }
+
+
+def summarize_tool_execution(turn_metrics: list[dict], parallel_tools: bool = False) -> dict:
+    """Turn latency with serial vs parallel tool execution.
+
+    Whichever mode ran, both are derived from the measured per-call durations: serial
+    is their sum per turn, parallel the slowest call per turn (the critical path).
+    Adding model request time gives end-to-end turn latency. Models that batch
+    independent calls into one turn gain the most from parallel execution.
+    tool_time_share is the part of the run's latency spent waiting on tools.
+    """
+    tool_turns = [t for t in turn_metrics if t.get("tool_calls")]
+    model_s = sum(t.get("duration_s", 0) for t in turn_metrics)
+    serial_s = sum(t.get("tool_serial_s", 0) for t in tool_turns)
+    parallel_s = sum(t.get("tool_critical_path_s", 0) for t in tool_turns)
+    latency_serial = model_s + serial_s
+    latency_parallel = model_s + parallel_s
+    tool_wall_s = sum(t.get("tool_wall_s", 0) for t in tool_turns)
+    return {
+        "mode": "parallel" if parallel_tools else "serial",
+        "tool_wall_s": round(tool_wall_s, 3),
+        "tool_serial_s": round(serial_s, 3),
+        "tool_parallel_s": round(parallel_s, 3),
+        "tool_turns": len(tool_turns),
+        "multi_call_turns": sum(1 for t in tool_turns if t["tool_calls"] > 1),
+        "avg_calls_per_tool_turn": round(sum(t["tool_calls"] for t in tool_turns) / len(tool_turns), 2) if tool_turns else 0,
+        "turn_latency_serial_s": round(latency_serial, 2),
+        "turn_latency_parallel_s": round(latency_parallel, 2),
+        "parallel_speedup": round(latency_serial / latency_parallel, 3) if latency_parallel > 0 else None,
+        "tool_time_share": round(tool_wall_s / (model_s + tool_wall_s), 3) if model_s + tool_wall_s > 0 else 0,
+    }
+
+
+def summarize_duplicate_calls(turn_metrics: list[dict], tool_calls_log: list[dict]) -> dict:
+    """What repeats of an identical earlier tool call (same _call_signature) cost the run.
+
+    - redundant_context_tokens: estimated tokens the repeated calls and their results
+      added to the conversation
+    - redundant_prompt_tokens: those tokens times the requests sent after them, i.e.
+      the prefill they caused (an upper bound when context management pruned history)
+    - wasted_tool_s: time spent executing the repeats (near 0 when served from cache)
+    - wasted_model_s: model time of turns that asked for nothing but repeats
+    """
+    duplicates = [tc for tc in tool_calls_log if tc.get("duplicate")]
+    turns = [t["turn"] for t in turn_metrics if "turn" in t]
+    calls_by_turn: dict[int, list[dict]] = {}
+    for tc in tool_calls_log:
+        calls_by_turn.setdefault(tc["turn"], []).append(tc)
+    wasted_model_s = sum(t.get("duration_s", 0) for t in turn_metrics
+                         if calls_by_turn.get(t.get("turn")) and all(tc.get("duplicate") for tc in calls_by_turn[t["turn"]]))
+    wasted_tool_s = sum(tc.get("duration_s", 0) for tc in duplicates)
+    return {
+        "duplicate_calls": len(duplicates),
+        "duplicate_rate": round(len(duplicates) / len(tool_calls_log), 3) if tool_calls_log else 0,
+        "by_tool": dict(Counter(tc["tool"] for tc in duplicates).most_common()),
+        "served_from_cache": sum(1 for tc in tool_calls_log if tc.get("cached")),
+        "redundant_context_tokens": sum(tc.get("context_tokens_est", 0) for tc in duplicates),
+        "redundant_prompt_tokens": sum(tc.get("context_tokens_est", 0) * sum(1 for t in turns if t > tc["turn"])
+                                       for tc in duplicates),
+        "wasted_tool_s": round(wasted_tool_s, 3),
+        "wasted_model_s": round(wasted_model_s, 2),
+        "wasted_wall_s": round(wasted_tool_s + wasted_model_s, 2),
+    }
+
+
+def summarize_tool_routing(turn_metrics: list[dict], tool_calls_log: list[dict], tool_routing: str = "none") -> dict:
+    """Schema bytes sent vs the full schema every turn, and calls to tools that weren't offered."""
+    turns = [t for t in turn_metrics if "schema_bytes" in t]
+    sent = sum(t["schema_bytes"] for t in turns)
+    saved = sum(t["schema_bytes_saved"] for t in turns)
+    return {
+        "mode": tool_routing,
+        "avg_tools_per_turn": round(sum(t["tools_sent"] for t in turns) / len(turns), 2) if turns else 0,
+        "schema_bytes_sent": sent,
+        "schema_bytes_saved": saved,
+        "schema_bytes_saved_pct": round(saved / (sent + saved) * 100, 1) if sent + saved else 0,
+        "est_tokens_saved": saved // 4,
+        "off_route_calls": sum(1 for tc in tool_calls_log if tc.get("offered") is False),
+    }
+
+
+def summarize_streaming(turn_metrics: list[dict], chat_stream: bool = False) -> dict:
+    """Time to first token and to first action (tool call or answer text) per turn.
+
+    Without streaming nothing is usable before the whole message has arrived, so time to
+    action is the full request time. tool_overlap_s is tool time that ran while the
+    response was still streaming, hidden from turn latency by early dispatch.
+    """
+    turns = [t for t in turn_metrics if "time_to_action_s" in t]
+    actions = [t["time_to_action_s"] for t in turns]
+    ttfts = [t["ttft_s"] for t in turns if t.get("ttft_s") is not None]
+    to_tool = [t["time_to_tool_call_s"] for t in turns if t.get("time_to_tool_call_s") is not None]
+    responses = [t["duration_s"] for t in turns]
+    return {
+        "mode": "stream" if chat_stream else "blocking",
+        "avg_ttft_s": round(sum(ttfts) / len(ttfts), 3) if ttfts else None,
+        "avg_time_to_tool_call_s": round(sum(to_tool) / len(to_tool), 3) if to_tool else None,
+        "avg_time_to_action_s": round(sum(actions) / len(actions), 3) if actions else 0,
+        "max_time_to_action_s": round(max(actions), 3) if actions else 0,
+        "avg_response_s": round(sum(responses) / len(responses), 3) if responses else 0,
+        "tool_overlap_s": round(sum(t.get("tool_overlap_s", 0) for t in turns), 3),
     }
 
 
-def aggregate_chat_metrics(turn_metrics: list[dict], tool_calls_log: list[dict]) -> dict:
+def aggregate_chat_metrics(turn_metrics: list[dict], tool_calls_log: list[dict], parallel_tools: bool = False,
+                           tool_profile: dict | None = None, tool_routing: str = "none",
+                           chat_stream: bool = False) -> dict:
     """Aggregate per-turn metrics into summary statistics.
 
     Returns a dict compatible with the standard metrics.json schema,
-    plus chat-specific fields.
+    plus chat-specific fields. tool_profile (the simulator stats from
+    run_chat_benchmark) is stored as chat.tool_profile.
     """
     total_prompt_eval = sum(t.get("prompt_eval_count", 0) for t in turn_metrics)
     total_eval = sum(t.get("eval_count", 0) for t in turn_metrics)
     total_prompt_eval_ns = sum(t.get("prompt_eval_duration_ns", 0) for t in turn_metrics)
     total_eval_ns = sum(t.get("eval_duration_ns", 0) for t in turn_metrics)
     total_duration_s = sum(t.get("duration_s", 0) for t in turn_metrics)
+    server_total_s = sum(t.get("total_duration_ns", 0) for t in turn_metrics) / 1e9
+    load_s = sum(t.get("load_duration_ns", 0) for t in turn_metrics) / 1e9
 
     prompt_eval_s = total_prompt_eval_ns / 1e9
     eval_s = total_eval_ns / 1e9
@@ -497,6 +955,8 @@ def aggregate_chat_metrics(turn_metrics: list[dict], tool_calls_log: list[dict])
     return {
         "timing": {
             "total_duration_s": round(total_duration_s, 2),
+            "server_total_duration_s": round(server_total_s, 2),
+            "load_duration_s": round(load_s, 2),
             "prompt_eval_duration_s": round(prompt_eval_s, 2),
             "eval_duration_s": round(eval_s, 2),
         },
@@ -514,6 +974,11 @@ def aggregate_chat_metrics(turn_metrics: list[dict], tool_calls_log: list[dict])
             "tools_used": sorted(tools_used),
             "tools_available": sorted(all_tools),
             "tool_coverage": round(len(tools_used) / len(all_tools), 2) if all_tools else 0,
+            "tool_execution": summarize_tool_execution(turn_metrics, parallel_tools),
+            "tool_profile": tool_profile or {"name": "none"},
+            "duplicate_calls": summarize_duplicate_calls(turn_metrics, tool_calls_log),
+            "tool_routing": summarize_tool_routing(turn_metrics, tool_calls_log, tool_routing),
+            "streaming": summarize_streaming(turn_metrics, chat_stream),
         },
     }
 
@@ -629,15 +1094,16 @@ def save_chat_results(
     tools: list[dict] | None = None,
     context_management: str = "none",
     temperature: float | None = None,
+    results_dir: str | None = None,
 ):
-    """Save chat benchmark results to the standard results directory.
+    """Save chat benchmark results to the standard results directory (or results_dir).
 
-    Writes three files:
+    Writes three files (output.md and transcript.json compressed with --storage, see results_io.py):
     - output.md: human-readable transcript
     - metrics.json: standard + chat-specific metrics
     - transcript.json: enriched object with metadata, turn_diagnostics, messages
     """
-    results_dir = get_model_results_dir(model, task, mode=mode, ctx_size=ctx_size)
+    results_dir = results_dir or get_model_results_dir(model, task, mode=mode, ctx_size=ctx_size)
     os.makedirs(results_dir, exist_ok=True)
 
     # 1. output.md -- human-readable transcript
@@ -672,9 +1138,7 @@ def save_chat_results(
             preview = content[:1000] + "..." if len(content) > 1000 else content
             output_lines.append(f"## Tool Result\n\n```json\n{preview}\n```\n")
 
-    output_path = os.path.join(results_dir, "output.md")
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write("\n".join(output_lines))
+    write_text(results_dir, "output.md", "\n".join(output_lines))
 
     # 2. metrics.json
     metrics_path = os.path.join(results_dir, "metrics.json")
@@ -698,8 +1162,15 @@ def save_chat_results(
             "prompt_eval_tps": tm.get("prompt_eval_tps", 0),
             "eval_tps": tm.get("eval_tps", 0),
             "duration_s": tm.get("duration_s", 0),
+            "server_total_s": round(tm.get("total_duration_ns", 0) / 1e9, 3),
+            "load_s": round(tm.get("load_duration_ns", 0) / 1e9, 3),
             "tool_calls_made": tm.get("tool_calls", 0),
+            "tool_wall_s": tm.get("tool_wall_s", 0),
             "had_tool_schema": tm.get("had_tool_schema", True),
+            "tools_sent": tm.get("tools_sent"),
+            "ttft_s": tm.get("ttft_s"),
+            "time_to_action_s": tm.get("time_to_action_s"),
+            "schema_bytes": tm.get("schema_bytes"),
         }
         if "error" in tm:
             td["error"] = tm["error"]
@@ -730,8 +1201,8 @@ def save_chat_results(
         "messages": chat_result["messages"],
     }
 
-    transcript_path = os.path.join(results_dir, "transcript.json")
-    with open(transcript_path, "w", encoding="utf-8") as f:
-        json.dump(transcript_data, f, indent=2, default=str)
+    write_json(results_dir, "transcript.json", transcript_data)
+    # The checkpoint log (if this run kept one) follows the same storage; --resume decompresses it
+    convert_file(results_dir, TRANSCRIPT_LOG, get_storage())
 
     print(f"  Saved chat results to {results_dir}")
@@ -0,0 +1,127 @@
+"""Tool-schema A/B runs: what each schema encoding costs in prefill and in tool-call quality.
+
+The full TOOL_DEFINITIONS are sent with every /api/chat request, and at 8192 ctx they
+take a real share of the window. Each variant from agentic_chat_tools.SCHEMA_VARIANTS
+runs the agentic-chat task. Per variant this records: the schema's size, first-turn
+prompt tokens (system + user + schema, so the differences between variants are the schema
+savings), prefill tokens and prompt-eval time per turn, and tool-call validity (harness
+success rate plus the evaluator's valid-call and total scores).
+
+With routings=["none", "stage"] each variant also runs with stage tool routing
+(run_chat_benchmark.route_tools), labelled "<variant>+routed": the schema sent per turn
+shrinks to the tools relevant at that point, and the comparison shows whether the
+smaller per-turn tool list changes call validity.
+
+Every variant's system message starts with a unique tag, so the first request is
+prefilled in full and not served from the previous variant's prompt cache.
+"""
+
+import json
+import os
+import time
+import uuid
+
+
+def summarize_variant(variant: str, tools: list[dict], chat_result: dict, evaluation: dict,
+                      routing: str = "none") -> dict:
+    turns = [t for t in chat_result["turn_metrics"] if "error" not in t]
+    calls = chat_result["tool_calls_log"]
+    prompt_tokens = [t.get("prompt_eval_count", 0) for t in turns]
+    prompt_eval_s = sum(t.get("prompt_eval_duration_ns", 0) for t in turns) / 1e9
+    schema_bytes = len(json.dumps(tools).encode("utf-8"))
+    sent = [t["schema_bytes"] for t in turns if "schema_bytes" in t]
+    scores = evaluation.get("scores", {})
+    return {
+        "variant": variant,
+        "tool_routing": routing,
+        "schema_json_bytes": schema_bytes,
+        "schema_est_tokens": schema_bytes // 4,
+        "avg_schema_bytes_per_turn": round(sum(sent) / len(sent)) if sent else schema_bytes,
+        "off_route_calls": sum(1 for c in calls if c.get("offered") is False),
+        "first_turn_prompt_tokens": prompt_tokens[0] if prompt_tokens else 0,
+        "avg_prompt_tokens_per_turn": round(sum(prompt_tokens) / len(prompt_tokens), 1) if prompt_tokens else 0,
+        "avg_prompt_eval_ms_per_turn": round(prompt_eval_s * 1000 / len(turns), 1) if turns else 0,
+        "prompt_eval_s": round(prompt_eval_s, 2),
+        "turns": chat_result["total_turns"],
+        "tool_calls": len(calls),
+        "tool_call_success_rate": round(sum(1 for c in calls if c.get("success")) / len(calls), 3) if calls else 0,
+        "valid_tool_calls_score": scores.get("valid_tool_calls"),
+        "score": scores.get("total"),
+        "classification": evaluation.get("classification", {}).get("classification"),
+        "completed": chat_result["completed"],
+    }
+
+
+def run_schema_ab(model: str, system_msg: str, variants: list[str], schema_variant, run_chat,
+                  results_dir: str, save_run, routings: list[str] = ("none",)) -> dict:
+    """Run the agentic-chat task once per schema variant (and tool routing) and return the comparison.
+
+    `schema_variant(name)` builds the tool list, `run_chat(system_msg, tools, routing)` runs
+    one conversation, and `save_run(chat_result, run_dir, tools)` saves it and returns the
+    agentic-chat evaluator's result.
+    """
+    points = []
+    for variant in variants:
+        tools = schema_variant(variant)
+        for routing in routings:
+            label = variant if routing == "none" else f"{variant}+routed"
+            print(f"  schema {label}: running...")
+            chat_result = run_chat(f"[schema-ab {uuid.uuid4().hex[:8]}]\n{system_msg}", tools, routing)
+            evaluation = save_run(chat_result, os.path.join(results_dir, label), tools)
+            point = summarize_variant(label, tools, chat_result, evaluation, routing)
+            points.append(point)
+            print(f"  schema {label}: {point['avg_schema_bytes_per_turn']} bytes/turn | first turn "
+                  f"{point['first_turn_prompt_tokens']} prompt tokens | {point['avg_prompt_eval_ms_per_turn']} ms "
+                  f"prefill/turn | {point['tool_calls']} calls ({point['tool_call_success_rate']:.0%} ok) | "
+                  f"score {point['score']}")
+
+    baseline = next((p for p in points if p["variant"] == "full"), points[0] if points else None)
+    for point in points:
+        saved = baseline["first_turn_prompt_tokens"] - point["first_turn_prompt_tokens"]
+        point["first_turn_tokens_saved"] = saved
+        point["first_turn_tokens_saved_pct"] = (round(saved / baseline["first_turn_prompt_tokens"] * 100, 1)
+                                                if baseline["first_turn_prompt_tokens"] else 0)
+    return {
+        "model": model,
+        "run_timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "baseline": baseline["variant"] if baseline else None,
+        "variants": points,
+    }
+
+
+def save_schema_ab(results_dir: str, ab: dict) -> str:
+    """Write schema_ab.json into results_dir and return its path."""
+    os.makedirs(results_dir, exist_ok=True)
+    path = os.path.join(results_dir, "schema_ab.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(ab, f, indent=2)
+    return path
+
+
+def format_schema_ab_summary(results: list[dict]) -> str:
+    """Markdown table per model: one row per schema variant."""
+    lines = [
+        "*First-turn prompt = system + user + schema, so the saving against `full` is what the schema encoding saves. "
+        "Schema/turn = bytes of tool schema actually sent per turn (smaller than the full schema with `+routed`). "
+        "Valid = evaluator's valid-tool-call score (0-10).*",
+    ]
+    for ab in results:
+        lines += [
+            "",
+            f"## `{ab['model']}` (ctx {ab.get('num_ctx', '-')})",
+            "",
+            "| Variant | Schema bytes | Schema/turn | First-turn prompt | Saved | Prompt tokens/turn | Prefill ms/turn "
+            "| Turns | Tool calls | Call success | Valid | Score | Result |",
+            "|---------|--------------|-------------|-------------------|-------|--------------------|-----------------"
+            "|-------|------------|--------------|-------|-------|--------|",
+        ]
+        for p in ab["variants"]:
+            lines.append(
+                f"| {p['variant']} | {p['schema_json_bytes']} | {p.get('avg_schema_bytes_per_turn', p['schema_json_bytes'])} "
+                f"| {p['first_turn_prompt_tokens']} "
+                f"| {p['first_turn_tokens_saved']} ({p['first_turn_tokens_saved_pct']}%) "
+                f"| {p['avg_prompt_tokens_per_turn']} | {p['avg_prompt_eval_ms_per_turn']} | {p['turns']} "
+                f"| {p['tool_calls']} | {p['tool_call_success_rate']:.0%} | {p['valid_tool_calls_score']} "
+                f"| {p['score']} | {p['classification'] or '-'} |"
+            )
+    return "\n".join(lines)
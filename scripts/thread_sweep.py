@@ -0,0 +1,219 @@
+"""CPU thread-count sweep: scaling efficiency, Amdahl fits and an optimal num_thread per model.
+
+Each model is warmed up, then generates at every thread count in the sweep. Prefill and
+decode throughput come from Ollama's own prompt_eval/eval timings. Prefill is compute-bound
+and usually keeps scaling with threads. Decode is memory-bandwidth-bound, so it typically
+peaks well below the core count and then gets slower. The recommendation targets that
+decode knee.
+"""
+
+import json
+import os
+import statistics
+import time
+import uuid
+
+import psutil
+
+# A thread count counts as "as good as the best" when it reaches this share of the best decode tok/s
+KNEE_TOLERANCE = 0.97
+
+
+def physical_core_count() -> int:
+    """Physical cores (falls back to logical when psutil can't tell)."""
+    return psutil.cpu_count(logical=False) or os.cpu_count() or 1
+
+
+def sweep_thread_counts(cap: int) -> list[int]:
+    """1, 2, 4, ... up to cap, plus the core-count boundaries that fit under it.
+
+    The boundaries are half the physical cores (one socket on a dual-socket machine),
+    all physical cores, all logical (SMT) CPUs and the cap itself.
+    """
+    logical = os.cpu_count() or 1
+    physical = physical_core_count()
+    counts = set()
+    n = 1
+    while n <= cap:
+        counts.add(n)
+        n *= 2
+    for boundary in (physical, physical // 2, logical, cap):
+        if 1 <= boundary <= cap:
+            counts.add(boundary)
+    return sorted(counts)
+
+
+def fit_amdahl(points: list[tuple[int, float]]) -> dict | None:
+    """Fit Amdahl's law to (threads, tokens/sec) points.
+
+    Time per token is modelled as a + b/n (serial part + parallel part). Least squares on
+    (1/n, 1/tps) gives a and b. The parallel fraction is p = b / (a + b), and the
+    asymptotic speedup over one thread is 1 / (1 - p). The fit doesn't need a
+    1-thread measurement.
+    """
+    pts = [(n, tps) for n, tps in points if tps > 0]
+    if len(pts) < 2:
+        return None
+    xs = [1 / n for n, _ in pts]
+    ys = [1 / tps for _, tps in pts]
+    mean_x, mean_y = statistics.fmean(xs), statistics.fmean(ys)
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    if sxx == 0:
+        return None
+    b = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / sxx
+    a = mean_y - b * mean_x
+    ss_tot = sum((y - mean_y) ** 2 for y in ys)
+    ss_res = sum((y - (a + b * x)) ** 2 for x, y in zip(xs, ys))
+    r2 = 1 - ss_res / ss_tot if ss_tot > 0 else 1.0
+
+    # Negative serial time or negative parallel time means the curve isn't Amdahl-shaped
+    # (e.g. decode slowing down with more threads); clamp and let r2 show the poor fit.
+    a, b = max(a, 0.0), max(b, 0.0)
+    p = b / (a + b) if (a + b) > 0 else 0.0
+    return {
+        "parallel_fraction": round(p, 4),
+        "max_speedup": round(1 / (1 - p), 2) if p < 1 else None,
+        "r2": round(r2, 3),
+    }
+
+
+def analyze_sweep(points: list[dict]) -> dict:
+    """Speedup/efficiency per point, Amdahl fits, and the recommended thread count."""
+    valid = [p for p in points if p.get("decode_tps", 0) > 0]
+    if not valid:
+        return {"error": "No successful sweep points"}
+
+    base = min(valid, key=lambda p: p["threads"])
+    for p in valid:
+        scale = p["threads"] / base["threads"]
+        for phase in ("prefill", "decode"):
+            speedup = p[f"{phase}_tps"] / base[f"{phase}_tps"] if base[f"{phase}_tps"] > 0 else 0
+            p[f"{phase}_speedup"] = round(speedup, 2)
+            p[f"{phase}_efficiency"] = round(speedup / scale, 2)
+
+    best_decode = max(valid, key=lambda p: p["decode_tps"])
+    best_prefill = max(valid, key=lambda p: p["prefill_tps"])
+    knee = min(
+        (p for p in valid if p["decode_tps"] >= KNEE_TOLERANCE * best_decode["decode_tps"]),
+        key=lambda p: p["threads"],
+    )
+    highest = max(valid, key=lambda p: p["threads"])
+    oversubscribed = highest["decode_tps"] < KNEE_TOLERANCE * best_decode["decode_tps"]
+
+    return {
+        "baseline_threads": base["threads"],
+        "amdahl": {
+            "prefill": fit_amdahl([(p["threads"], p["prefill_tps"]) for p in valid]),
+            "decode": fit_amdahl([(p["threads"], p["decode_tps"]) for p in valid]),
+        },
+        "best_decode_threads": best_decode["threads"],
+        "best_decode_tps": best_decode["decode_tps"],
+        "best_prefill_threads": best_prefill["threads"],
+        "best_prefill_tps": best_prefill["prefill_tps"],
+        "recommended_num_thread": knee["threads"],
+        "recommended_decode_tps": knee["decode_tps"],
+        "decode_slows_past_best": oversubscribed,
+    }
+
+
+def run_thread_sweep(
+    model: str,
+    prompt: str,
+    generate,
+    thread_counts: list[int],
+    num_ctx: int,
+    num_predict: int,
+    repeats: int = 2,
+    timeout: int = 600,
+) -> dict:
+    """Run one model across thread counts and return the points plus analysis.
+
+    `generate(model, prompt, num_ctx, num_predict, timeout=..., num_threads=...)` is the
+    harness' generation call (run_benchmark.run_generation). Changing num_thread makes
+    Ollama reload the runner, so each thread count gets an unmeasured warm-up request
+    first. Every prompt is prefixed with a unique tag so the prompt cache can't skip prefill.
+    """
+    def tagged():
+        return f"[sweep {uuid.uuid4().hex[:8]}]\n{prompt}"
+
+    points = []
+    for threads in thread_counts:
+        print(f"  threads={threads:>3}: warming up...", end="", flush=True)
+        warm = generate(model, tagged(), num_ctx, 16, timeout=timeout, num_threads=threads)
+        if "error" in warm:
+            print(f" FAILED ({warm['error']})")
+            points.append({"threads": threads, "error": warm["error"]})
+            continue
+
+        prefill, decode, errors = [], [], []
+        for _ in range(repeats):
+            resp = generate(model, tagged(), num_ctx, num_predict, timeout=timeout, num_threads=threads)
+            if "error" in resp:
+                errors.append(resp["error"])
+                continue
+            pe_s = resp.get("prompt_eval_duration", 0) / 1e9
+            ev_s = resp.get("eval_duration", 0) / 1e9
+            prefill.append(resp.get("prompt_eval_count", 0) / pe_s if pe_s > 0 else 0)
+            decode.append(resp.get("eval_count", 0) / ev_s if ev_s > 0 else 0)
+
+        point = {
+            "threads": threads,
+            "load_duration_s": round(warm.get("load_duration", 0) / 1e9, 2),
+            "prefill_tps": round(statistics.median(prefill), 2) if prefill else 0,
+            "decode_tps": round(statistics.median(decode), 2) if decode else 0,
+            "samples": len(decode),
+        }
+        if errors:
+            point["errors"] = errors
+        points.append(point)
+        print(f" prefill {point['prefill_tps']:>8} tok/s | decode {point['decode_tps']:>7} tok/s")
+
+    return {
+        "model": model,
+        "run_timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "num_ctx": num_ctx,
+        "num_predict": num_predict,
+        "repeats": repeats,
+        "cpu_logical_cores": os.cpu_count(),
+        "cpu_physical_cores": physical_core_count(),
+        "points": points,
+        "analysis": analyze_sweep(points),
+    }
+
+
+def save_sweep(results_dir: str, sweep: dict) -> str:
+    """Write thread_sweep.json into results_dir and return its path."""
+    os.makedirs(results_dir, exist_ok=True)
+    path = os.path.join(results_dir, "thread_sweep.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(sweep, f, indent=2)
+    return path
+
+
+def format_sweep_summary(sweeps: list[dict]) -> str:
+    """Markdown summary table of all swept models."""
+    lines = [
+        f"*Recommended = fewest threads reaching {KNEE_TOLERANCE:.0%} of the best decode tok/s. "
+        "p = Amdahl parallel fraction (r2 = fit quality).*",
+        "",
+        "| Model | Recommended num_thread | Decode tok/s | Best decode (threads) | Best prefill (threads) "
+        "| Decode p (r2) | Prefill p (r2) | Decode slows past best |",
+        "|-------|------------------------|--------------|-----------------------|------------------------"
+        "|---------------|----------------|------------------------|",
+    ]
+    for sweep in sweeps:
+        a = sweep["analysis"]
+        if "error" in a:
+            lines.append(f"| `{sweep['model']}` | - | - | - | - | - | - | {a['error']} |")
+            continue
+
+        def fit(phase):
+            f = a["amdahl"][phase]
+            return f"{f['parallel_fraction']} ({f['r2']})" if f else "-"
+
+        lines.append(
+            f"| `{sweep['model']}` | {a['recommended_num_thread']} | {a['recommended_decode_tps']} "
+            f"| {a['best_decode_tps']} ({a['best_decode_threads']}) | {a['best_prefill_tps']} ({a['best_prefill_threads']}) "
+            f"| {fit('decode')} | {fit('prefill')} | {'yes' if a['decode_slows_past_best'] else 'no'} |"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,109 @@
+"""Reconcile client wall clock with Ollama's server-side timing fields.
+
+Ollama reports total_duration, load_duration, prompt_eval_duration and
+eval_duration; the harness measures its own wall clock around the request.
+compute_timing_breakdown() splits the wall clock into:
+
+  client_overhead  wall - total_duration (network, HTTP, queueing before the server starts the timer)
+  load             model load into memory
+  prefill          prompt evaluation
+  decode           token generation
+  unexplained      total_duration - (load + prefill + decode)
+
+Cloud models only report total_duration (eval_duration is 0), so their decode
+throughput is derived from client-side streaming timestamps instead.
+"""
+
+
+def _share(part: float | None, whole: float) -> float | None:
+    if part is None or whole <= 0:
+        return None
+    return round(100 * part / whole, 1)
+
+
+def effective_eval_tps(metrics: dict) -> tuple[float, str]:
+    """Best available decode throughput for a run, and where it came from.
+
+    Sources, in order of preference:
+      "server"  eval_count / eval_duration as reported by Ollama
+      "stream"  tokens after the first / time between first and last streamed chunk
+      "total"   eval_count / total request time (lower bound, includes prefill and network)
+    """
+    tokens = metrics.get("tokens", {})
+    eval_count = tokens.get("eval_count", 0)
+    server_tps = tokens.get("eval_tokens_per_sec", 0)
+    if server_tps:
+        return server_tps, "server"
+
+    stream = metrics.get("stream") or {}
+    window = stream.get("decode_window_s")
+    if window and eval_count > 1:
+        return round((eval_count - 1) / window, 2), "stream"
+
+    timing = metrics.get("timing", {})
+    if "chat" in metrics:
+        total = timing.get("server_total_duration_s") or timing.get("total_duration_s", 0)
+    else:
+        total = timing.get("total_duration_s") or metrics.get("wall_clock_s", 0)
+    if total and eval_count:
+        return round(eval_count / total, 2), "total"
+    return 0, "none"
+
+
+def compute_timing_breakdown(metrics: dict) -> dict | None:
+    """Decompose a run's wall clock into overhead, load, prefill, decode and unexplained time.
+
+    Works on single-shot metrics (wall_clock_s vs timing.total_duration_s) and on
+    agentic-chat metrics, where timing.total_duration_s is the summed client time of
+    the chat requests and timing.server_total_duration_s the summed server time.
+    Returns None when the metrics don't carry enough timing to reconcile.
+    """
+    if "error" in metrics or "timing" not in metrics:
+        return None
+    timing = metrics["timing"]
+
+    if "chat" in metrics:
+        wall = timing.get("total_duration_s", 0)
+        server_total = timing.get("server_total_duration_s")
+    else:
+        wall = metrics.get("wall_clock_s", 0)
+        server_total = timing.get("total_duration_s")
+    if not wall or server_total is None:
+        return None
+
+    load = timing.get("load_duration_s", 0)
+    prefill = timing.get("prompt_eval_duration_s", 0)
+    decode = timing.get("eval_duration_s", 0)
+    server_timings = decode > 0
+
+    client_overhead = max(0.0, wall - server_total)
+    if server_timings:
+        unexplained = max(0.0, server_total - load - prefill - decode)
+    else:
+        # Without a server-side split the whole server time is unattributed
+        load = prefill = decode = None
+        unexplained = None
+
+    tps, source = effective_eval_tps(metrics)
+    stream = metrics.get("stream") or {}
+
+    return {
+        "wall_s": round(wall, 2),
+        "server_total_s": round(server_total, 2),
+        "client_overhead_s": round(client_overhead, 2),
+        "load_s": load,
+        "prefill_s": prefill,
+        "decode_s": decode,
+        "unexplained_s": round(unexplained, 2) if unexplained is not None else None,
+        "shares_pct": {
+            "client_overhead": _share(client_overhead, wall),
+            "load": _share(load, wall),
+            "prefill": _share(prefill, wall),
+            "decode": _share(decode, wall),
+            "unexplained": _share(unexplained, wall),
+        },
+        "server_timings": server_timings,
+        "ttft_s": stream.get("ttft_s"),
+        "effective_eval_tokens_per_sec": tps,
+        "effective_tps_source": source,
+    }